@@ -0,0 +1,114 @@
+"""Structured provider addresses.
+
+Seed addresses are one multiline blob ("street\\nCity, ST 12345", or the
+military "Unit 1376 Box 6294\\nDPO AE 62072" form). ``parse_addresses``
+splits a whole column into street / address_city / state / postal_code in a
+single vectorized regex pass. The parts are stored as indexed columns, so
+state and postal-prefix filters are index range lookups instead of ``LIKE``
+scans over the blob. ``ensure_address_columns`` migrates a table created
+before the parts existed.
+"""
+import pandas as pd
+from sqlalchemy import text
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = pc = None
+
+ADDRESS_PATTERN = (
+    r'^\s*(?P<street>.*?)\s*\n\s*(?P<address_city>[^\n]*?),?\s+'
+    r'(?P<state>[A-Z]{2})\s+(?P<postal_code>\d{5}(?:-\d{4})?)\s*$'
+)
+# Same tail, applied to the last line only once the street has been split off
+LAST_LINE_PATTERN = r'^(?P<address_city>.*?),? +(?P<state>[A-Z]{2}) +(?P<postal_code>[0-9]{5}(?:-[0-9]{4})?)$'
+ADDRESS_COLUMNS = ('street', 'address_city', 'state', 'postal_code')
+INDEXED_COLUMNS = ('state', 'postal_code')
+
+
+def parse_addresses(addresses):
+    """DataFrame of street / address_city / state / postal_code for each address.
+
+    Addresses that do not match keep their (stripped) text as the street and
+    get nulls for the other parts.
+    """
+    addresses = pd.Series(addresses)
+    if pc is not None:
+        # Splitting off the street first keeps the capturing regex on the short last line
+        lines = pc.split_pattern(pa.array(addresses.astype('string'), type=pa.string()), "\n", max_splits=1)
+        two_lines = pc.equal(pc.list_value_length(lines), 2)
+        lines = pc.if_else(two_lines, lines, pa.scalar(['', ''], pa.list_(pa.string())))
+        street = pc.utf8_trim_whitespace(pc.list_element(lines, 0))
+        matched = pc.extract_regex(pc.utf8_trim_whitespace(pc.list_element(lines, 1)), LAST_LINE_PATTERN)
+        valid = pc.is_valid(matched)
+        columns = {'street': street, **{name: pc.struct_field(matched, name) for name in ADDRESS_COLUMNS[1:]}}
+        parts = pd.DataFrame({
+            name: pc.if_else(valid, values, pa.scalar(None, pa.string()))
+            .to_pandas(types_mapper=pd.ArrowDtype).set_axis(addresses.index).astype('string')
+            for name, values in columns.items()
+        })
+    else:
+        parts = addresses.astype('string').str.extract(ADDRESS_PATTERN).astype('string')
+    unparsed = parts['street'].isna() & addresses.notna()
+    parts.loc[unparsed, 'street'] = addresses[unparsed].astype('string').str.strip()
+    return parts
+
+
+def address_parts(df):
+    """Derived-column hook for the providers schema"""
+    if 'address' not in df.columns:
+        return {}
+    parts = parse_addresses(df['address'])
+    return {name: parts[name].to_numpy() for name in ADDRESS_COLUMNS}
+
+
+def ensure_address_columns(engine, table='providers'):
+    """Add and backfill the structured columns on a table created before they existed, then index them.
+
+    Idempotent: only rows with an address and no parsed parts are parsed.
+    Returns the number of rows backfilled.
+    """
+    with engine.begin() as conn:
+        columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info('{table}')"))}
+        if 'address' not in columns:
+            return 0
+        for column in ADDRESS_COLUMNS:
+            if column not in columns:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} TEXT"))
+        nulls = " AND ".join(f"{column} IS NULL" for column in ADDRESS_COLUMNS)
+        todo = pd.read_sql(text(f"SELECT rowid AS row_id, address FROM {table} WHERE address IS NOT NULL AND {nulls}"),
+                           conn)
+        if not todo.empty:
+            parts = parse_addresses(todo['address']).astype(object)
+            parts = parts.where(parts.notna(), None).assign(row_id=todo['row_id'].to_numpy())
+            conn.execute(
+                text(f"UPDATE {table} SET " + ", ".join(f"{c} = :{c}" for c in ADDRESS_COLUMNS) + " WHERE rowid = :row_id"),
+                parts.to_dict('records'),
+            )
+    ensure_address_indexes(engine, table)
+    return len(todo)
+
+
+def ensure_address_indexes(engine, table='providers'):
+    """Index the structured columns (idempotent; a table replace drops indexes)"""
+    with engine.begin() as conn:
+        columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info('{table}')"))}
+        for column in INDEXED_COLUMNS:
+            if column in columns:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"))
+
+
+def location_filter(state=None, postal_prefix=None, alias='p'):
+    """(SQL condition, params) for index-friendly state / postal-prefix filters"""
+    conditions, params = [], {}
+    if state:
+        conditions.append(f"{alias}.state = :state")
+        params['state'] = state.strip().upper()
+    prefix = (postal_prefix or '').strip()
+    if prefix:
+        # Prefix as a half-open range so SQLite can use the index (LIKE cannot here)
+        conditions.append(f"{alias}.postal_code >= :postal_lo AND {alias}.postal_code < :postal_hi")
+        params['postal_lo'] = prefix
+        params['postal_hi'] = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return " AND ".join(conditions), params
@@ -0,0 +1,155 @@
+"""Hot/archive partitioning for expired listings and closed claims.
+
+Rows older than the archive horizon are moved from the hot tables into
+``<table>_archive`` tables. Interactive queries keep reading the hot tables;
+historical reports call ``table_source`` with their date range and get a
+UNION ALL over hot + archive only when the range reaches archived history.
+
+Run on a schedule (e.g. nightly cron):
+
+    python archive.py --db food_wastage.db --horizon-days 180
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+# Archiving is opt-in: unset means the app never moves rows out of the hot tables
+ARCHIVE_HORIZON_DAYS = int(os.environ["FWMS_ARCHIVE_HORIZON_DAYS"]) if os.environ.get("FWMS_ARCHIVE_HORIZON_DAYS") else None
+
+ARCHIVE_STATE_TABLE = "archive_state"
+
+# table -> (primary key, SQL predicate selecting archivable rows older than :cutoff)
+ARCHIVE_RULES = {
+    'claims': (
+        'claim_id',
+        "LOWER(status) IN ('completed', 'cancelled') AND julianday(timestamp) < julianday(:cutoff)",
+    ),
+    # Listings move only once none of their claims are left in the hot table
+    'food_listings': (
+        'food_id',
+        "julianday(expiry_date) < julianday(:cutoff) "
+        "AND NOT EXISTS (SELECT 1 FROM claims c WHERE c.food_id = food_listings.food_id)",
+    ),
+}
+
+
+def archive_table_name(table):
+    return f"{table}_archive"
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(text(f"PRAGMA table_info('{table}')"))]
+
+
+def _ensure_archive_table(conn, table, pk):
+    """Create or widen the archive table so it has every hot column"""
+    archive = archive_table_name(table)
+    hot_columns = _columns(conn, table)
+    archive_columns = _columns(conn, archive)
+    if not archive_columns:
+        conn.execute(text(f"CREATE TABLE {archive} AS SELECT * FROM {table} WHERE 0"))
+    else:
+        for col in hot_columns:
+            if col not in archive_columns:
+                conn.execute(text(f'ALTER TABLE {archive} ADD COLUMN "{col}"'))
+    conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{archive}_{pk} ON {archive} ({pk})"))
+    return hot_columns
+
+
+def _ensure_state_table(conn):
+    conn.execute(text(f"""
+    CREATE TABLE IF NOT EXISTS {ARCHIVE_STATE_TABLE} (
+        table_name VARCHAR PRIMARY KEY,
+        archived_before DATETIME,
+        archived_at DATETIME
+    )
+    """))
+
+
+def archive_old_rows(engine, horizon_days=None, as_of=None):
+    """Move rows older than the horizon into the archive tables.
+
+    Returns {table: rows_moved}. Safe to re-run: archive tables are keyed by
+    primary key, so rows that reappear in the hot table are replaced, not duplicated.
+    """
+    horizon_days = ARCHIVE_HORIZON_DAYS if horizon_days is None else horizon_days
+    if horizon_days is None:
+        return {}
+    as_of = as_of or datetime.now()
+    cutoff = (as_of - timedelta(days=horizon_days)).strftime('%Y-%m-%d %H:%M:%S')
+    moved = {}
+
+    with engine.begin() as conn:
+        _ensure_state_table(conn)
+        # Claims first so the listings rule sees which claims are still hot
+        for table, (pk, predicate) in ARCHIVE_RULES.items():
+            if not _columns(conn, table):
+                continue
+            cols = ", ".join(f'"{c}"' for c in _ensure_archive_table(conn, table, pk))
+            archive = archive_table_name(table)
+            conn.execute(
+                text(f"INSERT OR REPLACE INTO {archive} ({cols}) SELECT {cols} FROM {table} WHERE {predicate}"),
+                {"cutoff": cutoff},
+            )
+            result = conn.execute(text(f"DELETE FROM {table} WHERE {predicate}"), {"cutoff": cutoff})
+            moved[table] = result.rowcount
+            conn.execute(
+                text(f"""
+                INSERT INTO {ARCHIVE_STATE_TABLE} (table_name, archived_before, archived_at)
+                VALUES (:table, :cutoff, :now)
+                ON CONFLICT(table_name) DO UPDATE SET
+                    archived_before = MAX(archived_before, excluded.archived_before),
+                    archived_at = excluded.archived_at
+                """),
+                {"table": table, "cutoff": cutoff, "now": datetime.now()},
+            )
+    return moved
+
+
+def archived_before(conn, table):
+    """Timestamp before which rows of `table` may live in the archive (None if never archived)"""
+    if not _columns(conn, ARCHIVE_STATE_TABLE):
+        return None
+    value = conn.execute(
+        text(f"SELECT archived_before FROM {ARCHIVE_STATE_TABLE} WHERE table_name = :table"),
+        {"table": table},
+    ).scalar()
+    return pd.Timestamp(value) if value else None
+
+
+def table_source(engine, table, start_date=None):
+    """FROM-clause source for `table`: the hot table, or hot UNION ALL archive
+    when start_date reaches back before the archive boundary."""
+    if start_date is None:
+        return table
+    with engine.connect() as conn:
+        boundary = archived_before(conn, table)
+        if boundary is None or pd.Timestamp(start_date) >= boundary:
+            return table
+        archive_columns = set(_columns(conn, archive_table_name(table)))
+        cols = ", ".join(f'"{c}"' for c in _columns(conn, table) if c in archive_columns)
+    return f"(SELECT {cols} FROM {table} UNION ALL SELECT {cols} FROM {archive_table_name(table)})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move expired listings and closed claims into archive tables")
+    parser.add_argument("--db", default="food_wastage.db", help="SQLite database file")
+    parser.add_argument("--horizon-days", type=int, default=ARCHIVE_HORIZON_DAYS or 180,
+                        help="Archive rows older than this many days")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}", echo=False)
+    start = time.perf_counter()
+    moved = archive_old_rows(engine, horizon_days=args.horizon_days)
+    elapsed = time.perf_counter() - start
+    for table, count in moved.items():
+        print(f"📦 {table:<15} → {count} rows archived")
+    print(f"✅ Archive finished in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
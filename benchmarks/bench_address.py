@@ -0,0 +1,81 @@
+"""Address parsing throughput and state / postal-prefix lookups: indexed columns vs LIKE scans.
+
+    python benchmarks/bench_address.py [rows]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from addresses import ADDRESS_PATTERN, ensure_address_indexes, location_filter, parse_addresses  # noqa: E402
+
+STATES = np.array(['CA', 'NY', 'TX', 'WA', 'OK', 'OR', 'MA', 'IL', 'FL', 'NC', 'AE', 'AP'])
+
+
+def make_addresses(rows):
+    rng = np.random.default_rng(29)
+    street = rng.integers(1, 99999, rows).astype(str).astype(object) + ' Main Street Suite ' + rng.integers(
+        100, 999, rows).astype(str)
+    city = np.char.add('City ', rng.integers(0, 5000, rows).astype(str)).astype(object)
+    postal = np.char.zfill(rng.integers(0, 99999, rows).astype(str), 5).astype(object)
+    return pd.Series(street + '\n' + city + ', ' + STATES[rng.integers(0, len(STATES), rows)] + ' ' + postal)
+
+
+def per_row(addresses):
+    pattern = re.compile(ADDRESS_PATTERN)
+    out = []
+    for value in addresses:
+        match = pattern.match(value)
+        out.append(match.groupdict() if match else {})
+    return pd.DataFrame(out)
+
+
+def timed(conn, query, params=None, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = len(conn.execute(text(query), params or {}).fetchall())
+    return (time.perf_counter() - start) / repeat * 1000, rows
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    addresses = make_addresses(rows)
+
+    start = time.perf_counter()
+    per_row(addresses)
+    loop_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    parts = parse_addresses(addresses)
+    vector_seconds = time.perf_counter() - start
+    print(f"{rows:,} addresses")
+    print(f"  per-row re.match      : {loop_seconds:6.2f}s")
+    print(f"  parse_addresses       : {vector_seconds:6.2f}s  ({loop_seconds / vector_seconds:,.1f}x)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        providers = pd.DataFrame({'provider_id': np.arange(1, rows + 1), 'address': addresses}).join(parts)
+        providers.to_sql('providers', engine, index=False)
+        ensure_address_indexes(engine)
+        state_sql, state_params = location_filter(state='WA')
+        postal_sql, postal_params = location_filter(postal_prefix='9401')
+        with engine.connect() as conn:
+            for label, scan, indexed, params in (
+                ("state = 'WA'", "SELECT provider_id FROM providers p WHERE p.address LIKE '%, WA %'",
+                 f"SELECT provider_id FROM providers p WHERE {state_sql}", state_params),
+                ("postal prefix 9401", "SELECT provider_id FROM providers p WHERE p.address LIKE '% 9401_'",
+                 f"SELECT provider_id FROM providers p WHERE {postal_sql}", postal_params),
+            ):
+                scan_ms, scan_rows = timed(conn, scan, repeat=5)
+                index_ms, index_rows = timed(conn, indexed, params)
+                print(f"  {label:<20}: LIKE scan {scan_ms:8.1f} ms ({scan_rows:,} rows)  "
+                      f"indexed {index_ms:7.2f} ms ({index_rows:,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Interactive query latency as total history grows, with and without archiving.
+
+    python benchmarks/bench_archive.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from archive import archive_old_rows  # noqa: E402
+
+LISTINGS_PER_DAY = 200
+HORIZON_DAYS = 30
+INTERACTIVE_QUERY = """
+SELECT f.food_type, COUNT(*) AS total_listings, SUM(f.quantity) AS total_quantity,
+       COUNT(c.claim_id) AS total_claims,
+       SUM(CASE WHEN LOWER(c.status) = 'completed' THEN f.quantity ELSE 0 END) AS quantity_saved
+FROM food_listings f
+LEFT JOIN claims c ON f.food_id = c.food_id
+GROUP BY f.food_type
+"""
+
+
+def build_database(engine, history_days, as_of):
+    rng = np.random.default_rng(7)
+    n = history_days * LISTINGS_PER_DAY
+    expiry = as_of - pd.to_timedelta(rng.integers(-7, history_days, n), unit='D')
+    listings = pd.DataFrame({
+        'food_id': np.arange(1, n + 1),
+        'food_name': rng.choice(['Bread', 'Soup', 'Fruits', 'Rice'], n),
+        'quantity': rng.integers(1, 50, n),
+        'expiry_date': expiry,
+        'provider_id': rng.integers(1, 1000, n),
+        'food_type': rng.choice(['Vegan', 'Vegetarian', 'Non-Vegetarian'], n),
+        'meal_type': rng.choice(['Breakfast', 'Lunch', 'Dinner', 'Snacks'], n),
+    })
+    timestamps = expiry - pd.to_timedelta(rng.integers(0, 72, n), unit='h')
+    status = rng.choice(['Completed', 'Cancelled', 'Pending'], n, p=[0.6, 0.3, 0.1])
+    # Claims older than two weeks have been resolved one way or the other
+    status = np.where((status == 'Pending') & (timestamps < as_of - timedelta(days=14)), 'Completed', status)
+    claims = pd.DataFrame({
+        'claim_id': np.arange(1, n + 1),
+        'food_id': listings['food_id'],
+        'receiver_id': rng.integers(1, 1000, n),
+        'status': status,
+        'timestamp': timestamps,
+    })
+    listings.to_sql('food_listings', engine, if_exists='replace', index=False, chunksize=50_000)
+    claims.to_sql('claims', engine, if_exists='replace', index=False, chunksize=50_000)
+
+
+def time_query(engine, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            conn.execute(text(INTERACTIVE_QUERY)).fetchall()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    as_of = datetime(2025, 6, 1)
+    print(f"{'history':>10} {'rows':>10} {'no archive':>12} {'archived':>12} {'hot rows':>10}")
+    for history_days in (90, 365, 3 * 365, 10 * 365):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            build_database(engine, history_days, as_of)
+            before = time_query(engine)
+            archive_old_rows(engine, horizon_days=HORIZON_DAYS, as_of=as_of)
+            after = time_query(engine)
+            with engine.connect() as conn:
+                hot = conn.execute(text("SELECT COUNT(*) FROM food_listings")).scalar()
+            engine.dispose()
+        print(f"{history_days:>9}d {history_days * LISTINGS_PER_DAY:>10,} "
+              f"{before * 1000:>10.1f}ms {after * 1000:>10.1f}ms {hot:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Per-table query and figure caches: miss vs hit latency, and what a receiver insert evicts.
+
+Loads a synthetic database, runs a few of the app's listing / receiver
+analytics through ``querycache.cached`` (and charts of them through
+``cached_figures``), inserts one receiver and checks that only the
+receiver-dependent entries are recomputed.
+
+Then 50 threads ("sessions") open the same analytics right after a write:
+without the cache each runs every query; with it each (query, arguments,
+version) is computed once and the other threads wait for that result
+(single-flight).
+
+    python benchmarks/bench_cache.py [rows] [sessions]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import plotly.express as px
+from sqlalchemy import create_engine, event, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from querycache import cache_stats, cached, cached_figures, invalidate, refresh_from_change_log  # noqa: E402
+from synthetic import DatabaseWriter, generate  # noqa: E402
+from urgency import sql_condition  # noqa: E402
+
+engine = None
+
+
+@cached('food_listings')
+def food_type_wastage(as_of=None):
+    expired = sql_condition('Expired', 'f.expiry_date', as_of)
+    return pd.read_sql(text(f"""
+    SELECT f.food_type, SUM(f.quantity) AS total_quantity,
+           SUM(CASE WHEN {expired} THEN f.quantity ELSE 0 END) AS wasted_quantity
+    FROM food_listings f GROUP BY f.food_type
+    """), engine)
+
+
+@cached('providers', 'food_listings', 'claims')
+def claims_per_food_item():
+    return pd.read_sql(text("""
+    SELECT f.food_name, COUNT(c.claim_id) AS claims, SUM(f.quantity) AS quantity
+    FROM food_listings f JOIN providers p ON f.provider_id = p.provider_id
+    LEFT JOIN claims c ON f.food_id = c.food_id
+    GROUP BY f.food_name
+    """), engine)
+
+
+@cached('receivers', 'food_listings', 'claims')
+def top_claiming_receivers():
+    return pd.read_sql(text("""
+    SELECT r.receiver_id, r.name, COUNT(c.claim_id) AS claims
+    FROM receivers r LEFT JOIN claims c ON r.receiver_id = c.receiver_id
+    GROUP BY r.receiver_id ORDER BY claims DESC LIMIT 10
+    """), engine)
+
+
+@cached_figures('providers', 'food_listings', 'claims')
+def listing_charts(as_of=None):
+    charts = {}
+    for name, df, x, y in (('wastage', food_type_wastage(as_of), 'food_type', 'total_quantity'),
+                           ('claims', claims_per_food_item(), 'food_name', 'claims')):
+        fig = px.bar(df, x=x, y=y, color=y, color_continuous_scale='Reds')
+        fig.update_layout(title={'text': name, 'x': 0.5}, plot_bgcolor='white', margin=dict(l=80, r=80, t=100, b=80))
+        fig.update_traces(textfont=dict(size=11, color='#1f2937'))
+        charts[name] = fig
+    return charts
+
+
+QUERIES = (food_type_wastage, claims_per_food_item, top_claiming_receivers)
+
+
+def timed_round():
+    start = time.perf_counter()
+    for query in QUERIES:
+        query()
+    return (time.perf_counter() - start) * 1000
+
+
+def herd(sessions, queries):
+    """(seconds, SQL statements) for `sessions` threads each running `queries` at the same moment"""
+    statements = []
+    listener = lambda *args: statements.append(1)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    barrier = threading.Barrier(sessions)
+
+    def session():
+        barrier.wait()
+        for query in queries:
+            query()
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", listener)
+    return seconds, len(statements)
+
+
+def main():
+    global engine
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = DatabaseWriter(os.path.join(tmp, 'bench.db'))
+        for table, df in generate(rows):
+            writer.write(table, df)
+        writer.close()
+        # A connection per session, so the uncached run measures queries rather than pool waits
+        engine = create_engine(writer.engine.url, pool_size=sessions)
+        refresh_from_change_log(engine)
+
+        print(f"{rows:,} listings/claims")
+        print(f"  cold round (3 queries): {timed_round():8.2f} ms")
+        print(f"  warm round (3 queries): {timed_round():8.3f} ms")
+        for label in ("figures, cached queries", "figures, cache hit"):
+            start = time.perf_counter()
+            listing_charts()
+            print(f"  {label:<23}: {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO receivers (receiver_id, name, type, city, contact) "
+                "VALUES (:id, 'New Shelter', 'Shelter', 'Springfield', '555-0100')"
+            ), {"id": 10 ** 9})
+        before = cache_stats().set_index('function')['misses']
+        changed = refresh_from_change_log(engine, 'receivers')
+        start = time.perf_counter()
+        timed_round()
+        listing_charts()
+        print(f"  receiver insert -> invalidated {changed}; next round {(time.perf_counter() - start) * 1000:8.2f} ms")
+        stats = cache_stats().set_index('function').loc[[query.__name__ for query in QUERIES + (listing_charts,)]]
+        recomputed = stats['misses'] - before[stats.index]
+        for name, row in stats.iterrows():
+            print(f"    {name:<24} {row['tables']:<36} hits {row['hits']}  misses {row['misses']}  "
+                  f"recomputed after insert: {recomputed[name]}"
+                  + (f"  ({row['bytes']:,.0f} bytes)" if pd.notna(row['bytes']) else ""))
+        assert recomputed['food_type_wastage'] == 0 and recomputed['claims_per_food_item'] == 0, \
+            "a receiver insert evicted listing analytics"
+        assert recomputed['listing_charts'] == 0, "a receiver insert evicted listing charts"
+        assert recomputed['top_claiming_receivers'] == 1, "receiver analytics were not invalidated"
+        print("  ok: the receiver insert kept listing analytics and charts cached")
+
+        uncached = [query.__wrapped__ for query in QUERIES]
+        seconds, statements = herd(sessions, uncached)
+        print(f"  {sessions} sessions after a write, no cache:     {seconds:6.2f}s, {statements} queries")
+        invalidate('food_listings', 'receivers')
+        before = stats
+        seconds, statements = herd(sessions, QUERIES + (listing_charts,))
+        stats = cache_stats().set_index('function').loc[stats.index]
+        misses, coalesced = stats['misses'] - before['misses'], stats['coalesced'] - before['coalesced']
+        print(f"  {sessions} sessions after a write, single-flight: {seconds:6.2f}s, {statements} queries, "
+              f"{coalesced.sum()} requests coalesced")
+        assert (misses == 1).all(), f"a result was computed more than once: {misses.to_dict()}"
+        print("  ok: each query and chart set was computed once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Expiry index: "what expires soon" read latency vs the SQL scan, update cost, and equality with SQL.
+
+Builds a synthetic database with expiries spread over the hours of the day.
+It times ``SQLQueries.get_items_expiring_next_3_days`` (uncached) against
+``ExpiryIndex.items_expiring_next_3_days``, and "expiring within 24 hours in
+one city" against the equivalent SQL. Then it writes through
+``CRUDOperations`` and with plain SQL (expiry moves, a provider changing
+city, deletes), and times how long the index takes to catch up from the
+change log. Every read is checked against SQL, before and after the writes.
+
+    python benchmarks/bench_expiry_index.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crud import CRUDOperations  # noqa: E402
+from expiry_index import expiry_index  # noqa: E402
+from sql_queries import SQLQueries  # noqa: E402
+from synthetic import DatabaseWriter, generate  # noqa: E402
+
+AS_OF = [pd.Timestamp('2025-03-01'), pd.Timestamp('2025-06-15 09:30'), pd.Timestamp('2025-12-31 23:00')]
+WITHIN_SQL = """
+SELECT f.food_id, f.food_name, f.quantity, f.expiry_date, p.provider_id, p.name AS provider_name, p.city
+FROM food_listings f
+JOIN providers p ON f.provider_id = p.provider_id
+WHERE julianday(f.expiry_date) >= julianday(:start) AND julianday(f.expiry_date) < julianday(:end)
+{city}
+"""
+
+
+def timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def ordered(df):
+    return df.sort_values(['expiry_date', 'food_id']).reset_index(drop=True)
+
+
+def sql_within(queries, hours, city, as_of):
+    params = {'start': f"{as_of:%Y-%m-%d %H:%M:%S}", 'end': f"{as_of + pd.Timedelta(hours=hours):%Y-%m-%d %H:%M:%S}"}
+    if city is not None:
+        params['city'] = city
+    return queries.execute_query(WITHIN_SQL.format(city="AND p.city = :city" if city is not None else ""), params)
+
+
+def check(index, queries, cities):
+    """Index reads equal the SQL ones for every as_of, overall and per city"""
+    for as_of in AS_OF:
+        expected = ordered(queries.get_items_expiring_next_3_days.__wrapped__(queries, as_of))
+        pd.testing.assert_frame_equal(index.items_expiring_next_3_days(as_of), expected)
+        for city in cities:
+            by_city = expected if city is None else ordered(expected[expected['city'] == city])
+            pd.testing.assert_frame_equal(index.expiring_days(0, 3, city, as_of), by_city, check_dtype=False)
+            for hours in (1, 24, 100):
+                got = index.expiring_within(hours, city, as_of).drop(columns='urgency')
+                pd.testing.assert_frame_equal(got, ordered(sql_within(queries, hours, city, as_of)), check_dtype=False)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = DatabaseWriter(os.path.join(tmp, 'bench.db'))
+        for table, df in generate(rows):
+            if table == 'food_listings':
+                df['expiry_date'] += pd.to_timedelta(rng.integers(0, 24, len(df)), unit='h')
+            writer.write(table, df)
+        writer.close()
+        engine = writer.engine
+        queries = SQLQueries(engine)
+        index = expiry_index(engine)
+
+        start = time.perf_counter()
+        index.rebuild()
+        print(f"{rows:,} listings: index built in {time.perf_counter() - start:.2f}s")
+        cities = list(pd.read_sql(text("SELECT city FROM providers GROUP BY city ORDER BY COUNT(*) DESC LIMIT 3"),
+                                  engine)['city']) + ['No Such City']
+        check(index, queries, cities)
+        print("ok: next-3-days and within-N-hours reads match SQL (3 as_of times, 4 cities)")
+
+        as_of, city = AS_OF[1], cities[0]
+        print(f"\n{'read':<36} {'SQL':>9} {'index':>9} {'rows':>7}")
+        for label, sql_read, index_read in (
+            ("expiring in the next 3 days", lambda: queries.get_items_expiring_next_3_days.__wrapped__(queries, as_of),
+             lambda: index.items_expiring_next_3_days(as_of)),
+            ("expiring within 24h", lambda: sql_within(queries, 24, None, as_of),
+             lambda: index.expiring_within(24, as_of=as_of)),
+            ("expiring within 24h, one city", lambda: sql_within(queries, 24, city, as_of),
+             lambda: index.expiring_within(24, city, as_of)),
+        ):
+            _, sql_seconds = timed(sql_read)
+            result, index_seconds = timed(index_read, repeat=10)
+            print(f"{label:<36} {sql_seconds * 1000:7.1f}ms {index_seconds * 1000:7.2f}ms {len(result):>7,}")
+            assert index_seconds < sql_seconds, f"{label}: the index was slower than SQL"
+
+        writes = CRUDOperations(engine)
+        provider_id = int(index.items_expiring_next_3_days(as_of)['provider_id'].iat[0])
+        start = time.perf_counter()
+        for i in range(100):
+            success, message = writes.add_food_listing(f"Bench {i}", 5, as_of + pd.Timedelta(hours=i), provider_id,
+                                                       'Vegan', 'Lunch')
+            assert success, message
+        per_write = (time.perf_counter() - start) / 100
+        listed = index.expiring_within(100, as_of=as_of)['food_name']
+        assert listed.str.startswith('Bench').sum() == 100, "a CRUD insert is missing from the index"
+
+        print(f"\n{'change (applied from the change log)':<44} {'refresh':>9} {'per change':>11}")
+        print(f"{'100 CRUD inserts (whole write, incl. index)':<44} {'':>9} {per_write * 1000:9.2f}ms")
+        ids = ", ".join(str(i) for i in rng.choice(np.arange(1, rows + 1), 1_000, replace=False))
+        batches = (
+            ("1,000 expiry moves", f"UPDATE food_listings SET expiry_date = datetime(expiry_date, '-36 hours') "
+                                   f"WHERE food_id IN ({ids})"),
+            ("1 provider changes city", f"UPDATE providers SET city = '{cities[1]}' WHERE provider_id = {provider_id}"),
+            ("1,000 deletes", f"DELETE FROM food_listings WHERE food_id IN ({ids})"),
+        )
+        for label, statement in batches:
+            with engine.begin() as conn:
+                changed = conn.execute(text(statement)).rowcount
+            start = time.perf_counter()
+            applied = index.refresh()
+            seconds = time.perf_counter() - start
+            assert applied == changed, f"{label}: applied {applied} changes, expected {changed}"
+            print(f"{label:<44} {seconds * 1000:7.2f}ms {seconds / changed * 1e6:9.1f}µs")
+        assert index.rebuilds == 1, "an incremental change rebuilt the index"
+        check(index, queries, cities[:2] + [None])
+        print("ok: after the writes the index still matches SQL, without a rebuild")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Headless query layer: import cost, and a process-pool batch job with no Streamlit.
+
+Times ``import sql_queries`` / ``crud`` / ``graphs`` in fresh processes,
+with and without Streamlit alongside. Then it runs the pages' queries against a
+synthetic database from ``spawn`` workers that import only the query layer.
+It checks that the workers never load Streamlit or Plotly and return the
+same frames as a serial run. It also checks that a write through
+``CRUDOperations`` and a failing query work headless.
+
+    python benchmarks/bench_headless.py [rows] [workers]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The last one is what the old modules paid, since each also imported Streamlit
+MODULES = ["sql_queries", "crud", "graphs", "streamlit, sql_queries"]
+QUERIES = [
+    'get_items_expiring_next_3_days', 'get_provider_reliability_pct', 'get_food_type_wastage_pct',
+    'get_highest_demand_locations_by_claims', 'get_providers_receivers_per_city', 'get_top_claiming_receivers',
+    'get_total_food_quantity_available', 'get_cities_by_food_listings', 'get_claims_per_food_item',
+    'get_provider_highest_successful_claims', 'get_claims_completion_percentages', 'get_total_donations_per_provider',
+    'get_food_wastage_trends_comprehensive', 'get_time_series_claims_trends', 'get_monthly_performance_trends',
+]
+IMPORT_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                  'streamlit': 'streamlit' in sys.modules, 'plotly': 'plotly' in sys.modules}}))
+"""
+
+
+def import_cost(module):
+    out = subprocess.run([sys.executable, "-c", IMPORT_CHILD.format(module=module)], cwd=ROOT, capture_output=True,
+                         text=True, check=True, env={**os.environ, 'PYTHONPATH': ROOT})
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_query(path, name):
+    """One batch task in a pool worker: only the query layer is imported"""
+    from sqlalchemy import create_engine
+    from sql_queries import SQLQueries
+
+    start = time.perf_counter()
+    result = getattr(SQLQueries(create_engine(f"sqlite:///{path}")), name)()
+    return name, result, time.perf_counter() - start, 'streamlit' in sys.modules, 'plotly' in sys.modules
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    print("import time (fresh process each):")
+    for module in MODULES:
+        result = import_cost(module)
+        loaded = [name for name in ('streamlit', 'plotly') if result[name]]
+        print(f"  {module:<22} {result['seconds']:6.3f}s  loads: {', '.join(loaded) or '-'}")
+        if "streamlit" not in module:
+            assert not loaded, f"importing {module} loaded {loaded}"
+
+    import pandas as pd
+    from sqlalchemy import text
+    from crud import CRUDOperations
+    from sql_queries import QueryError, SQLQueries
+    from synthetic import DatabaseWriter, generate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        writer = DatabaseWriter(path)
+        for table, df in generate(rows):
+            writer.write(table, df)
+        writer.close()
+        queries = SQLQueries(writer.engine)
+
+        start = time.perf_counter()
+        serial = {name: getattr(queries, name).__wrapped__(queries) for name in QUERIES}
+        serial_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as pool:
+            results = list(pool.map(run_query, [path] * len(QUERIES), QUERIES))
+        pool_seconds = time.perf_counter() - start
+
+        print(f"\n{len(QUERIES)} page queries, {rows:,} listings/claims:")
+        print(f"  serial, in this process:        {serial_seconds:7.2f}s")
+        print(f"  {workers} spawn workers (incl. start): {pool_seconds:7.2f}s")
+        for name, result, seconds, streamlit_loaded, plotly_loaded in results:
+            assert not streamlit_loaded and not plotly_loaded, f"{name}: a worker loaded Streamlit or Plotly"
+            # Columns like avg_days_since_claim move with the clock between the two runs
+            pd.testing.assert_frame_equal(result, serial[name], rtol=1e-3)
+        print("  ok: workers loaded neither streamlit nor plotly, and match the serial results")
+
+        before = pd.read_sql(text("SELECT MAX(claim_id) AS id FROM claims"), writer.engine)['id'][0]
+        success, message = CRUDOperations(writer.engine).add_claim(1, 1)
+        after = pd.read_sql(text("SELECT MAX(claim_id) AS id FROM claims"), writer.engine)['id'][0]
+        assert success and after == before + 1, message
+        try:
+            queries.execute_query("SELECT * FROM no_such_table")
+        except QueryError as e:
+            print(f"  ok: headless add_claim wrote claim {after}; a failing query raised QueryError "
+                  f"({type(e.__cause__).__name__})")
+        else:
+            raise AssertionError("a failing query did not raise QueryError")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""CSV ingestion throughput: untyped read + inferred dates vs typed chunked reader.
+
+    python benchmarks/bench_ingest.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import INGEST_CHUNKSIZE, format_report, read_csv_typed  # noqa: E402
+
+
+def write_claims_csv(path, rows, bad_every=10_000):
+    rng = np.random.default_rng(11)
+    stamps = pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, rows), unit='min')
+    timestamp = stamps.strftime('%-m/%-d/%Y %-H:%M').to_numpy(dtype=object)
+    timestamp[::bad_every] = 'not a date'
+    pd.DataFrame({
+        'Claim_ID': np.arange(1, rows + 1),
+        'Food_ID': rng.integers(1, 100_000, rows),
+        'Receiver_ID': rng.integers(1, 10_000, rows),
+        'Status': rng.choice(['Pending', 'Completed', 'Cancelled'], rows),
+        'Timestamp': timestamp,
+    }).to_csv(path, index=False)
+
+
+def baseline(path):
+    df = pd.read_csv(path)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
+    return df
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'claims.csv')
+        write_claims_csv(path, rows)
+        size_mb = os.path.getsize(path) / 1e6
+
+        start = time.perf_counter()
+        untyped = baseline(path)
+        base_seconds = time.perf_counter() - start
+
+        typed, report = read_csv_typed('claims', path=path)
+
+    print(f"claims.csv: {rows:,} rows, {size_mb:.1f} MB")
+    print(f"  untyped read_csv + inferred dates : {base_seconds:6.2f}s  {rows / base_seconds:>12,.0f} rows/s  "
+          f"{untyped.memory_usage(deep=True).sum() / 1e6:7.1f} MB, NaT={untyped['Timestamp'].isna().sum():,} (silent)")
+    print(f"  typed chunked (chunksize={INGEST_CHUNKSIZE:,}): {report['seconds']:6.2f}s  "
+          f"{report['rows_per_second']:>12,.0f} rows/s  {typed.memory_usage(deep=True).sum() / 1e6:7.1f} MB")
+    print(f"  report: {format_report(report)}")
+
+
+if __name__ == "__main__":
+    main()
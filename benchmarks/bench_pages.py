@@ -0,0 +1,102 @@
+"""Per-page rerun cost of the Streamlit app: wall time and SQL statements.
+
+Writes seed-format synthetic CSVs to a temporary directory, runs the app
+there under ``streamlit.testing`` and counts the SQL statements each render
+issues. Analytics and Time Series tabs are measured one at a time with the
+query cache invalidated first, so each count is what opening that tab
+costs cold.
+
+The "form" column counts the page's input widgets that sit inside an
+``st.form``: those send nothing to the server (no rerun, no query) until
+the form is submitted.
+
+    python benchmarks/bench_pages.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Precomputed results are computed in the page instead, so the counts are each render's own queries
+os.environ.setdefault("FWMS_PRECOMPUTE", "0")
+from querycache import invalidate  # noqa: E402
+from synthetic import CsvWriter, generate  # noqa: E402
+
+APP = os.path.join(ROOT, "app (10).py")
+PAGES = ["📊 Dashboard", "🏢 Providers", "🤝 Receivers", "🥗 Food Listings", "📦 Claims", "📈 Analytics", "⏰ Time Series"]
+TABS = {
+    "📈 Analytics": ("analytics_tab", ["🏢 Provider Analytics", "🤝 Receiver Analytics", "🍽️ Food Analytics",
+                                      "🌍 City Analytics"]),
+    "⏰ Time Series": ("time_series_tab", ["📈 Claims Trends", "🗑️ Wastage Trends", "📅 Monthly Performance"]),
+}
+ENTITY_TABLES = ('providers', 'receivers', 'food_listings', 'claims')
+
+statements = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+def measure(at):
+    """(seconds, SELECTs against the entity tables) for one run of `at`"""
+    statements.clear()
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    selects = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "WITH"))
+               and any(t in s for t in ENTITY_TABLES) and 'change_log' not in s and 'sqlite_master' not in s]
+    return seconds, len(selects)
+
+
+def form_inputs(at):
+    """(inputs inside a form, inputs outside one) in the main area"""
+    widgets = [w for kind in ('text_input', 'text_area', 'number_input', 'date_input', 'selectbox')
+               for w in getattr(at.main, kind)]
+    inside = sum(1 for w in widgets if w.form_id)
+    return inside, len(widgets) - inside
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    from streamlit.testing.v1 import AppTest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = CsvWriter(tmp)
+        for table, df in generate(rows):
+            writer.write(table, df)
+        os.chdir(tmp)
+        at = AppTest.from_file(APP, default_timeout=600)
+        seconds, queries = measure(at)
+        print(f"{rows:,} listings/claims; first run {seconds:.2f}s, {queries} queries")
+
+        print(f"  {'page':<18} {'cold':>8} {'queries':>8} {'rerun':>8} {'queries':>8}   form / other inputs")
+        for page in PAGES:
+            at.sidebar.selectbox[0].select(page)
+            invalidate(*ENTITY_TABLES)
+            cold = measure(at)
+            warm = measure(at)
+            inside, outside = form_inputs(at)
+            print(f"  {page:<18} {cold[0]:7.2f}s {cold[1]:>8} {warm[0]:7.2f}s {warm[1]:>8}   {inside:>4} / {outside}")
+
+        for page, (key, labels) in TABS.items():
+            at.sidebar.selectbox[0].select(page)
+            at.run()
+            print(f"  {page} tabs (cold, query cache invalidated):")
+            for label in labels:
+                at.session_state[key] = label
+                invalidate(*ENTITY_TABLES)
+                seconds, queries = measure(at)
+                print(f"    {label:<24} {seconds:6.2f}s {queries:>4} queries")
+
+
+if __name__ == "__main__":
+    main()
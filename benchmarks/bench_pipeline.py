@@ -0,0 +1,84 @@
+"""Multi-table ingestion wall time: serial vs process pool, with FK validation.
+
+Writes the four seed extracts at `rows` rows each (a few orphan foreign
+keys included) and ingests them both ways from scratch (no snapshots).
+
+    python benchmarks/bench_pipeline.py [rows] [workers]
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOTS = tempfile.mkdtemp()
+os.environ["FWMS_SNAPSHOT_DIR"] = SNAPSHOTS
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import format_pipeline_report, ingest_all  # noqa: E402
+
+
+def write_extracts(directory, rows):
+    rng = np.random.default_rng(23)
+    ids = np.arange(1, rows + 1)
+    cities = [f"City {i}" for i in range(300)]
+    paths = {t: os.path.join(directory, f"{t}.csv") for t in ('providers', 'receivers', 'food_listings', 'claims')}
+    for table, prefix, types in (
+        ('providers', 'Provider', ['Restaurant', 'Supermarket', 'Grocery Store']),
+        ('receivers', 'Receiver', ['NGO', 'Shelter', 'Charity']),
+    ):
+        key = 'Provider_ID' if table == 'providers' else 'Receiver_ID'
+        frame = pd.DataFrame({
+            key: ids,
+            'Name': np.char.add(f'{prefix} ', ids.astype(str)),
+            'Type': rng.choice(types, rows),
+            'City': rng.choice(cities, rows),
+            'Contact': np.char.add('+1-555-', rng.integers(1_000_000, 9_999_999, rows).astype(str)),
+        })
+        if table == 'providers':
+            frame.insert(3, 'Address', np.char.add(ids.astype(str), ' Main St\nSuite 1'))
+        frame.to_csv(paths[table], index=False)
+    expiry = pd.Timestamp('2025-03-01') + pd.to_timedelta(rng.integers(0, 60, rows), unit='D')
+    pd.DataFrame({
+        'Food_ID': ids,
+        'Food_Name': rng.choice(['Bread', 'Rice', 'Soup', 'Fruits'], rows),
+        'Quantity': rng.integers(1, 50, rows),
+        'Expiry_Date': expiry.strftime('%-m/%-d/%Y'),
+        'Provider_ID': rng.integers(1, rows + 100, rows),  # ~100/rows orphans
+        'Provider_Type': rng.choice(['Restaurant', 'Supermarket'], rows),
+        'Location': rng.choice(cities, rows),
+        'Food_Type': rng.choice(['Vegan', 'Vegetarian', 'Non-Vegetarian'], rows),
+        'Meal_Type': rng.choice(['Breakfast', 'Lunch', 'Dinner'], rows),
+    }).to_csv(paths['food_listings'], index=False)
+    stamps = pd.Timestamp('2025-03-01') + pd.to_timedelta(rng.integers(0, 60 * 24 * 60, rows), unit='min')
+    pd.DataFrame({
+        'Claim_ID': ids,
+        'Food_ID': rng.integers(1, rows + 1, rows),
+        'Receiver_ID': rng.integers(1, rows + 100, rows),
+        'Status': rng.choice(['Pending', 'Completed', 'Cancelled'], rows),
+        'Timestamp': stamps.strftime('%-m/%-d/%Y %-H:%M'),
+    }).to_csv(paths['claims'], index=False)
+    return paths
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_extracts(tmp, rows)
+            print(f"4 extracts x {rows:,} rows, {os.cpu_count()} CPU(s) available")
+            for parallel in (False, True):
+                shutil.rmtree(SNAPSHOTS, ignore_errors=True)
+                results, report = ingest_all(paths=paths, workers=workers, parallel=parallel)
+                print(f"  {format_pipeline_report(report)}")
+            for table, result in results.items():
+                fk = {r: v['rows'] for r, v in result['quality']['rules'].items() if r.startswith('fk_')}
+                print(f"    {table:<15} {result['seconds']:6.2f}s  {len(result['df']):>9,} rows  FK orphans {fk}")
+    finally:
+        shutil.rmtree(SNAPSHOTS, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Data-quality stage at 1M rows: notebook per-cell .apply cleaners vs the vectorized stage.
+
+    python benchmarks/bench_quality.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from quality import clean_and_validate, format_quality_report  # noqa: E402
+
+
+def title_case(s):
+    """The notebook's per-cell cleaner"""
+    if pd.isna(s):
+        return s
+    return str(s).strip().title()
+
+
+def providers_frame(rows):
+    rng = np.random.default_rng(17)
+    ids = np.arange(1, rows + 1)
+    ids[::50_000] = 1  # a few duplicate keys
+    names = np.char.add(rng.choice([' acme ', 'Fresh Foods', 'GREEN grocer'], rows), ids.astype(str))
+    contact = np.char.add('+1-555-', rng.integers(1_000_000, 9_999_999, rows).astype(str)).astype(object)
+    contact[::100_000] = None
+    return pd.DataFrame({
+        'provider_id': pd.array(ids, dtype='Int64'),
+        'name': pd.array(names, dtype='string'),
+        'type': pd.Categorical(rng.choice(['restaurant', ' Grocery Store', 'SUPERMARKET'], rows)),
+        'address': pd.array(np.char.add(ids.astype(str), ' Main St '), dtype='string'),
+        'city': pd.Categorical(rng.choice([f' city {i}' for i in range(500)], rows)),
+        'contact': pd.array(contact, dtype='string'),
+    })
+
+
+def claims_frame(rows):
+    rng = np.random.default_rng(19)
+    return pd.DataFrame({
+        'claim_id': pd.array(np.arange(1, rows + 1), dtype='Int64'),
+        'food_id': pd.array(rng.integers(1, 100_000, rows), dtype='Int64'),
+        'receiver_id': pd.array(rng.integers(1, 10_000, rows), dtype='Int64'),
+        'status': pd.Categorical(rng.choice(['pending', 'Completed ', 'cancelled', 'unknown'], rows, p=[.3, .4, .29999, .00001])),
+        'timestamp': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365 * 86400, rows), unit='s'),
+    })
+
+
+def baseline(df, columns):
+    out = df.copy()
+    for col in columns:
+        out[col] = out[col].astype(object).apply(title_case)
+    out.isnull().sum()
+    out.duplicated().sum()
+    return out
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for entity, frame, columns in (
+        ('providers', providers_frame(rows), ['name', 'type', 'city']),
+        ('claims', claims_frame(rows), ['status']),
+    ):
+        start = time.perf_counter()
+        baseline(frame, columns)
+        base_seconds = time.perf_counter() - start
+
+        _, _, report = clean_and_validate(frame, entity)
+        print(f"{entity}: {rows:,} rows")
+        print(f"  notebook .apply cleaners + checks : {base_seconds:6.2f}s")
+        print(f"  vectorized stage                  : {report['seconds']:6.2f}s  {format_quality_report(report)}")
+        for col, seconds in report['cleaned'].items():
+            print(f"    clean {col:<22} {seconds * 1000:8.1f} ms")
+        for rule, result in report['rules'].items():
+            print(f"    rule  {rule:<22} {result['seconds'] * 1000:8.1f} ms  {result['rows']:>8,} rows")
+
+
+if __name__ == "__main__":
+    main()
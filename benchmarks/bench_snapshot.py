@@ -0,0 +1,66 @@
+"""Cold-start load time: typed CSV parse vs memory-mapped Feather snapshot.
+
+The providers extract is generated with multiline quoted addresses, like the
+real seed file, which is the slow case for the CSV parser.
+
+    python benchmarks/bench_snapshot.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import read_csv_typed  # noqa: E402
+from snapshot import load_table  # noqa: E402
+
+
+def write_providers_csv(path, rows):
+    rng = np.random.default_rng(5)
+    streets = rng.integers(1, 9999, rows).astype(str)
+    suites = rng.integers(100, 999, rows).astype(str)
+    cities = np.array([f"City {i}" for i in range(500)])
+    pd.DataFrame({
+        'Provider_ID': np.arange(1, rows + 1),
+        'Name': np.char.add('Provider ', np.arange(1, rows + 1).astype(str)),
+        'Type': rng.choice(['Restaurant', 'Grocery Store', 'Supermarket', 'Catering Service'], rows),
+        'Address': np.char.add(np.char.add(np.char.add(streets, ' Main Street, Suite '), suites), '\nNear "Central" Park'),
+        'City': rng.choice(cities, rows),
+        'Contact': np.char.add('+1-555-', rng.integers(1_000_000, 9_999_999, rows).astype(str)),
+    }).to_csv(path, index=False)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'providers.csv')
+        snapshots = os.path.join(tmp, 'snapshots')
+        write_providers_csv(path, rows)
+        size_mb = os.path.getsize(path) / 1e6
+
+        start = time.perf_counter()
+        parsed, _ = read_csv_typed('providers', path=path)
+        csv_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_table('providers', path=path, snapshot_dir=snapshots)
+        first_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mapped, report = load_table('providers', path=path, snapshot_dir=snapshots)
+        warm_seconds = time.perf_counter() - start
+        assert report['source'] == 'snapshot' and mapped.equals(parsed)
+        snapshot_mb = sum(os.path.getsize(os.path.join(snapshots, f)) for f in os.listdir(snapshots)) / 1e6
+
+    print(f"providers.csv: {rows:,} rows, {size_mb:.1f} MB (multiline quoted addresses)")
+    print(f"  typed CSV parse                 : {csv_seconds:6.2f}s")
+    print(f"  first start (parse + snapshot)  : {first_seconds:6.2f}s")
+    print(f"  later starts (hash + mmap read) : {warm_seconds:6.2f}s  ({csv_seconds / warm_seconds:,.1f}x, "
+          f"snapshot {snapshot_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Cold-start cost: module import times and time to first paint per landing page.
+
+Every measurement runs in a fresh Python process. Imports are timed one
+module at a time. First paint runs the app under ``streamlit.testing`` on
+seed-format synthetic CSVs, opening each page directly through ``?page=``,
+and reports the phases recorded by ``startup.py``. "first start" has no
+database or snapshots yet. "restart" is a fresh process with both already
+on disk, which is what a redeploy or a worker restart sees.
+
+    python benchmarks/bench_startup.py [rows]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from startup import STARTUP_BUDGET  # noqa: E402
+from views import PAGES  # noqa: E402
+
+APP = os.path.join(ROOT, "app (10).py")
+MODULES = ["streamlit", "pandas", "sqlalchemy", "plotly.express", "statsmodels.api", "sql_queries", "querycache", "lookup", "watcher"]
+PHASES = ["imports", "styles", "csv load", "database sync", "page render"]
+
+
+def import_child(module):
+    import time
+    start = time.perf_counter()
+    try:
+        __import__(module)
+    except ImportError:
+        print(json.dumps(None))
+        return
+    seconds = time.perf_counter() - start
+    print(json.dumps({'seconds': seconds, 'plotly.express': 'plotly.express' in sys.modules}))
+
+
+def page_child(slug):
+    from streamlit.testing.v1 import AppTest
+    import startup
+
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.query_params['page'] = slug
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    report = startup.startup_report()
+    report['plotly.express'] = 'plotly.express' in sys.modules
+    print(json.dumps(report))
+
+
+def child(*args, cwd=ROOT):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), *args], cwd=cwd, capture_output=True,
+                         text=True, check=True, env={**os.environ, 'PYTHONPATH': ROOT})
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    from synthetic import CsvWriter, generate
+
+    print("import time (fresh process each):")
+    for module in MODULES:
+        result = child('--import', module)
+        if result is None:
+            print(f"  {module:<16} not installed")
+        else:
+            print(f"  {module:<16} {result['seconds']:6.3f}s"
+                  + ("  (loads plotly.express)" if result['plotly.express'] else ""))
+
+    print(f"\ntime to first paint, {rows:,} listings/claims (budget {STARTUP_BUDGET:g}s):")
+    print(f"  {'page':<16} {'start':<12}" + "".join(f"{phase:>14}" for phase in PHASES)
+          + f"{'first paint':>13}  plotly.express")
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = CsvWriter(tmp)
+        for table, df in generate(rows):
+            writer.write(table, df)
+        for page, slug in PAGES.items():
+            for start in ("first start", "restart"):
+                if start == "first start":
+                    for path in ("food_wastage.db", ".snapshots"):
+                        subprocess.run(["rm", "-rf", os.path.join(tmp, path)], check=True)
+                report = child('--page', slug, cwd=tmp)
+                verdict = "" if report['first_paint'] <= STARTUP_BUDGET else "  OVER BUDGET"
+                print(f"  {slug:<16} {start:<12}" + "".join(f"{report.get(p, 0):13.2f}s" for p in PHASES)
+                      + f"{report['first_paint']:12.2f}s  {'yes' if report['plotly.express'] else 'no':<3}{verdict}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--import']:
+        import_child(sys.argv[2])
+    elif sys.argv[1:2] == ['--page']:
+        page_child(sys.argv[2])
+    else:
+        main()
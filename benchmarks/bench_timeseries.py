@@ -0,0 +1,93 @@
+"""Time-series chart payload and build time: every daily point with markers vs LTTB + WebGL.
+
+Builds the Time Series page's claims chart (two daily series) and a chart
+with many series over 1, 5 and 10 years of daily data. It compares the
+original ``go.Scatter(mode='lines+markers')`` traces with
+``downsample.scatter``, which keeps at most ``FWMS_CHART_POINTS`` points
+per series (LTTB) and switches to ``Scattergl`` above ``FWMS_WEBGL_POINTS``.
+Also checks the LTTB selection against a plain-Python reference.
+
+    python benchmarks/bench_timeseries.py [series] [max_points]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from downsample import CHART_POINTS, lttb_indices, scatter  # noqa: E402
+
+
+def reference_lttb(x, y, n_out):
+    """Textbook LTTB, one point at a time"""
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        next_lo, next_hi = hi, min(int((i + 2) * every) + 1, n)
+        if i == n_out - 3:
+            next_lo, next_hi = n - 1, n
+        avg_x = sum(x[next_lo:next_hi]) / (next_hi - next_lo)
+        avg_y = sum(y[next_lo:next_hi]) / (next_hi - next_lo)
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [n - 1]
+
+
+def daily_series(days, count, rng):
+    dates = pd.date_range('2016-01-01', periods=days, freq='D')
+    season = 1 + 0.4 * np.sin(2 * np.pi * np.arange(days) / 365.25)
+    return dates, [rng.poisson(20 * season * (1 + k / 10)).astype(float) for k in range(count)]
+
+
+def build(dates, series, new, max_points=CHART_POINTS):
+    start = time.perf_counter()
+    fig = go.Figure()
+    for k, y in enumerate(series):
+        style = dict(mode='lines+markers', name=f'Series {k}', line=dict(width=3), marker=dict(size=6),
+                     hovertemplate='<b>Date:</b> %{x}<br><b>Claims:</b> %{y}<extra></extra>')
+        fig.add_trace(scatter(dates, y, max_points, **style) if new else go.Scatter(x=dates, y=y, **style))
+    fig.update_layout(title={'text': 'Claims', 'x': 0.5}, plot_bgcolor='white', hovermode='x unified')
+    payload = fig.to_json()
+    # Points the browser draws as SVG elements (WebGL traces draw on one canvas)
+    svg_points = sum(len(trace.y) for trace in fig.data if trace.type == 'scatter')
+    return time.perf_counter() - start, len(payload), svg_points, fig.data[0].type, len(fig.data[0].y)
+
+
+def main():
+    many = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    max_points = int(sys.argv[2]) if len(sys.argv) > 2 else CHART_POINTS
+    rng = np.random.default_rng(47)
+
+    x = rng.random(5_000).cumsum()
+    y = rng.normal(size=5_000).cumsum()
+    assert list(lttb_indices(x, y, 500)) == reference_lttb(list(x), list(y), 500), "LTTB differs from the reference"
+    dates, (spiky,) = daily_series(3_653, 1, rng)
+    spiky[1234] = 1_000.0
+    assert 1234 in lttb_indices(dates, spiky, 200), "LTTB dropped a spike"
+    print("ok: LTTB matches the reference selection and keeps spikes")
+
+    build(*daily_series(30, 2, rng), new=False)  # plotly's validators load on first use
+    print(f"{'chart':<18} {'years':>5} {'points':>7}   {'before: build':>13} {'JSON':>7} {'SVG pts':>7}   "
+          f"{'after: build':>12} {'JSON':>7} {'SVG pts':>7}  trace")
+    for count, label in ((2, "claims (2 series)"), (many, f"{many} series")):
+        for years in (1, 5, 10):
+            dates, series = daily_series(int(365.25 * years), count, rng)
+            old_seconds, old_bytes, old_svg, _, _ = build(dates, series, new=False)
+            new_seconds, new_bytes, new_svg, trace, kept = build(dates, series, True, max_points)
+            print(f"{label:<18} {years:>5} {len(dates) * count:>7,}   {old_seconds * 1000:11.1f}ms "
+                  f"{old_bytes / 1024:5.0f}KB {old_svg:>7,}   {new_seconds * 1000:10.1f}ms {new_bytes / 1024:5.0f}KB "
+                  f"{new_svg:>7,}  {trace}, {kept:,} pts/series")
+
+
+if __name__ == "__main__":
+    main()
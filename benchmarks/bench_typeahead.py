@@ -0,0 +1,68 @@
+"""Provider picker latency vs table size: full option list vs indexed typeahead.
+
+    python benchmarks/bench_typeahead.py [max_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lookup import TYPEAHEAD_LIMIT, ensure_lookup_indexes, typeahead  # noqa: E402
+from querycache import invalidate  # noqa: E402
+
+PREFIXES = ['jo', 'sm', 'wil', 'ma', 'b']
+
+
+def full_options(engine):
+    """What the form did before: every provider, then an iterrows() dict"""
+    providers_df = pd.read_sql(text("SELECT provider_id, name FROM providers ORDER BY name"), engine)
+    return {f"{row['name']} (ID: {row['provider_id']})": row['provider_id'] for _, row in providers_df.iterrows()}
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(37)
+    surnames = np.array(['Johnson', 'Smith', 'Williams', 'Martinez', 'Brown', 'Jones', 'Garcia', 'Miller',
+                         'Davis', 'Wilson', 'Moore', 'Taylor', 'Anderson', 'Thomas', 'Jackson', 'White'])
+    suffixes = np.array([' Ltd', ' Group', ' Inc', ' and Sons', ' Foods', ' Market', ' Bakery', ' Kitchen'])
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'providers':>10} {'full list':>12} {'options':>9} {'typeahead cold':>15} {'warm':>9}")
+        for rows in sorted({10_000, 100_000, max_rows}):
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, f'bench_{rows}.db')}")
+            names = (surnames[rng.integers(0, len(surnames), rows)].astype(object) + '-'
+                     + surnames[rng.integers(0, len(surnames), rows)] + suffixes[rng.integers(0, len(suffixes), rows)])
+            pd.DataFrame({'provider_id': np.arange(1, rows + 1), 'name': names}).to_sql(
+                'providers', engine, index=False, chunksize=100_000)
+            ensure_lookup_indexes(engine)
+
+            full_ms, options = timed(lambda: full_options(engine), 1 if rows > 100_000 else 3)
+            cold = []
+            for prefix in PREFIXES:
+                invalidate('providers')
+                ms, _ = timed(lambda: typeahead(engine, 'providers', prefix), 1)
+                cold.append(ms)
+            warm_ms, _ = timed(lambda: [typeahead(engine, 'providers', p) for p in PREFIXES], 200)
+            # Same rows the full list would show first: names starting "wil" in NOCASE order, ties by ID
+            expected = sorted((label.rsplit(' (ID: ', 1)[0].lower(), key) for label, key in options.items()
+                              if label.lower().startswith('wil'))
+            assert list(typeahead(engine, 'providers', 'WIL').values()) \
+                == [key for _, key in expected[:TYPEAHEAD_LIMIT]], "typeahead disagrees with the full list"
+            print(f"{rows:>10,} {full_ms:>10.1f}ms {len(options):>9,} {np.mean(cold):>13.2f}ms "
+                  f"{warm_ms / len(PREFIXES) * 1000:>7.1f}us")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Urgency bucketing: per-row lambda .apply vs the vectorized classifier.
+
+    python benchmarks/bench_urgency.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from urgency import classify_days, days_until_expiry  # noqa: E402
+
+
+def baseline(expiry, as_of):
+    """The load-time computation the app used to cache"""
+    days = (expiry - as_of).dt.days
+    return days.apply(
+        lambda x: 'Critical' if x <= 1 else 'Urgent' if x <= 3 else 'Soon' if x <= 7 else 'Normal'
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = np.random.default_rng(3)
+    as_of = pd.Timestamp('2025-03-10')
+    expiry = pd.Series(as_of + pd.to_timedelta(rng.integers(-30 * 86400, 60 * 86400, rows), unit='s'))
+
+    start = time.perf_counter()
+    old = baseline(expiry, as_of)
+    base_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = classify_days(days_until_expiry(expiry, as_of))
+    new_seconds = time.perf_counter() - start
+
+    print(f"{rows:,} expiry dates")
+    print(f"  lambda .apply  : {base_seconds:7.2f}s  {old.memory_usage(deep=True) / 1e6:8.1f} MB")
+    print(f"  classify_days(): {new_seconds:7.2f}s  {new.memory_usage(deep=True) / 1e6:8.1f} MB  "
+          f"({base_seconds / new_seconds:,.0f}x)")
+    print("  buckets:", new.value_counts(sort=False).to_dict())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Watch-folder ingestion throughput and lag: 1 vs 2 workers.
+
+Drops `files` claim and listing extracts of `rows` rows each into a fresh
+inbox and drains it, reporting rows/s and drop-to-finish lag.
+
+    python benchmarks/bench_watcher.py [files] [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from watcher import FolderWatcher, format_metrics, watch_metrics  # noqa: E402
+
+
+def drop_files(inbox, files, rows):
+    rng = np.random.default_rng(31)
+    for n in range(files):
+        ids = np.arange(n * rows + 1, (n + 1) * rows + 1)
+        if n % 2:
+            expiry = pd.Timestamp('2025-03-01') + pd.to_timedelta(rng.integers(0, 60, rows), unit='D')
+            pd.DataFrame({
+                'Food_ID': ids,
+                'Food_Name': rng.choice(['Bread', 'Rice', 'Soup', 'Fruits'], rows),
+                'Quantity': rng.integers(1, 50, rows),
+                'Expiry_Date': expiry.strftime('%-m/%-d/%Y'),
+                'Provider_ID': rng.integers(1, 1000, rows),
+                'Provider_Type': rng.choice(['Restaurant', 'Supermarket'], rows),
+                'Location': rng.choice([f"City {i}" for i in range(300)], rows),
+                'Food_Type': rng.choice(['Vegan', 'Vegetarian', 'Non-Vegetarian'], rows),
+                'Meal_Type': rng.choice(['Breakfast', 'Lunch', 'Dinner'], rows),
+            }).to_csv(os.path.join(inbox, f"listings_{n:03d}.csv"), index=False)
+        else:
+            stamps = pd.Timestamp('2025-03-01') + pd.to_timedelta(rng.integers(0, 60 * 24 * 60, rows), unit='min')
+            pd.DataFrame({
+                'Claim_ID': ids,
+                'Food_ID': rng.integers(1, files * rows, rows),
+                'Receiver_ID': rng.integers(1, 1000, rows),
+                'Status': rng.choice(['Pending', 'Completed', 'Cancelled'], rows),
+                'Timestamp': stamps.strftime('%-m/%-d/%Y %-H:%M'),
+            }).to_csv(os.path.join(inbox, f"claims_{n:03d}.csv"), index=False)
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    print(f"{files} files x {rows:,} rows, {os.cpu_count()} CPU(s) available")
+    for workers in (1, 2):
+        with tempfile.TemporaryDirectory() as tmp:
+            inbox = os.path.join(tmp, 'inbox')
+            os.makedirs(inbox)
+            drop_files(inbox, files, rows)
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            start = time.perf_counter()
+            FolderWatcher(engine, inbox, workers=workers).drain()
+            wall = time.perf_counter() - start
+            print(f"  {workers} worker(s): {wall:6.2f}s wall, {files * rows / wall:,.0f} rows/s  "
+                  f"[{format_metrics(watch_metrics(engine, inbox))}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Change-data-capture log for the four entity tables.
+
+SQLite triggers append one row per insert/update/delete to ``change_log``
+(table_name, pk, op, version, changed_at). A wholesale table rebuild is
+recorded as a single ``reload`` entry with no pk, telling consumers to
+rescan that table.
+
+Consumers keep a persistent watermark and read only what changed since
+their last run:
+
+    consumer = ChangeConsumer(engine, 'donation_chain')
+    changes = consumer.poll()
+    ...
+    consumer.commit(changes)
+"""
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+CHANGE_LOG_TABLE = "change_log"
+WATERMARK_TABLE = "change_watermarks"
+
+TRACKED_TABLES = {
+    'providers': 'provider_id',
+    'receivers': 'receiver_id',
+    'food_listings': 'food_id',
+    'claims': 'claim_id',
+}
+
+
+def _table_exists(conn, table):
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": table},
+    ).first() is not None
+
+
+def ensure_change_log(conn):
+    """Create the change log and watermark tables if missing"""
+    conn.execute(text(f"""
+    CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name VARCHAR NOT NULL,
+        pk INTEGER,
+        op VARCHAR NOT NULL,
+        version INTEGER NOT NULL,
+        changed_at DATETIME NOT NULL
+    )
+    """))
+    conn.execute(text(f"""
+    CREATE INDEX IF NOT EXISTS ix_{CHANGE_LOG_TABLE}_table_pk
+    ON {CHANGE_LOG_TABLE} (table_name, pk)
+    """))
+    # Latest seq per table is a single index probe (table_versions runs on every app rerun)
+    conn.execute(text(f"""
+    CREATE INDEX IF NOT EXISTS ix_{CHANGE_LOG_TABLE}_table_seq
+    ON {CHANGE_LOG_TABLE} (table_name, seq)
+    """))
+    conn.execute(text(f"""
+    CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (
+        consumer VARCHAR PRIMARY KEY,
+        last_seq INTEGER NOT NULL,
+        updated_at DATETIME NOT NULL
+    )
+    """))
+
+
+def _trigger_sql(table, pk, op):
+    event = op.upper()
+    row = "OLD" if op == 'delete' else "NEW"
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_{op}_log
+    AFTER {event} ON {table}
+    BEGIN
+        INSERT INTO {CHANGE_LOG_TABLE} (table_name, pk, op, version, changed_at)
+        VALUES (
+            '{table}', {row}.{pk}, '{op}',
+            COALESCE((SELECT MAX(version) FROM {CHANGE_LOG_TABLE}
+                      WHERE table_name = '{table}' AND pk = {row}.{pk}), 0) + 1,
+            strftime('%Y-%m-%d %H:%M:%f', 'now')
+        );
+    END
+    """
+
+
+def install_change_triggers(engine):
+    """Install insert/update/delete triggers on every tracked table that exists.
+
+    Idempotent; call again after a table is dropped and recreated.
+    """
+    with engine.begin() as conn:
+        ensure_change_log(conn)
+        for table, pk in TRACKED_TABLES.items():
+            if not _table_exists(conn, table):
+                continue
+            for op in ('insert', 'update', 'delete'):
+                conn.execute(text(_trigger_sql(table, pk, op)))
+
+
+def log_table_reload(conn, table):
+    """Record that `table` was rebuilt wholesale (consumers must rescan it)"""
+    ensure_change_log(conn)
+    version = conn.execute(
+        text(f"SELECT COALESCE(MAX(version), 0) + 1 FROM {CHANGE_LOG_TABLE} WHERE table_name = :table AND pk IS NULL"),
+        {"table": table},
+    ).scalar()
+    conn.execute(
+        text(f"""
+        INSERT INTO {CHANGE_LOG_TABLE} (table_name, pk, op, version, changed_at)
+        VALUES (:table, NULL, 'reload', :version, :changed_at)
+        """),
+        {"table": table, "version": version, "changed_at": datetime.now()},
+    )
+
+
+def table_versions(engine):
+    """Latest change sequence number per tracked table (0 when unchanged)"""
+    versions = dict.fromkeys(TRACKED_TABLES, 0)
+    with engine.connect() as conn:
+        if not _table_exists(conn, CHANGE_LOG_TABLE):
+            return versions
+        for table in TRACKED_TABLES:
+            seq = conn.execute(
+                text(f"SELECT MAX(seq) FROM {CHANGE_LOG_TABLE} WHERE table_name = :table"), {"table": table}
+            ).scalar()
+            versions[table] = seq or 0
+    return versions
+
+
+class ChangeConsumer:
+    """Reads the change log from a persistent per-consumer watermark"""
+
+    def __init__(self, engine, name):
+        self.engine = engine
+        self.name = name
+        with engine.begin() as conn:
+            ensure_change_log(conn)
+
+    def watermark(self):
+        """Last change sequence number this consumer has committed"""
+        with self.engine.connect() as conn:
+            value = conn.execute(
+                text(f"SELECT last_seq FROM {WATERMARK_TABLE} WHERE consumer = :name"),
+                {"name": self.name},
+            ).scalar()
+        return value or 0
+
+    def poll(self, tables=None, limit=None):
+        """Changes after the watermark, oldest first"""
+        query = f"SELECT * FROM {CHANGE_LOG_TABLE} WHERE seq > :after"
+        params = {"after": self.watermark()}
+        if tables:
+            names = ", ".join(f"'{t}'" for t in tables)
+            query += f" AND table_name IN ({names})"
+        query += " ORDER BY seq"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self.engine.connect() as conn:
+            return pd.read_sql(text(query), conn, params=params)
+
+    def commit(self, changes_or_seq):
+        """Advance the watermark past a polled batch (or to an explicit seq)"""
+        if isinstance(changes_or_seq, pd.DataFrame):
+            if changes_or_seq.empty:
+                return
+            seq = int(changes_or_seq['seq'].max())
+        else:
+            seq = int(changes_or_seq)
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"""
+                INSERT INTO {WATERMARK_TABLE} (consumer, last_seq, updated_at)
+                VALUES (:name, :seq, :now)
+                ON CONFLICT(consumer) DO UPDATE SET
+                    last_seq = MAX(last_seq, excluded.last_seq),
+                    updated_at = excluded.updated_at
+                """),
+                {"name": self.name, "seq": seq, "now": datetime.now()},
+            )
+
+
+def changed_keys(changes):
+    """Collapse a change batch to {table: set of pks}; a reload maps to None (rescan all)"""
+    keys = {}
+    for table, group in changes.groupby('table_name'):
+        if (group['op'] == 'reload').any():
+            keys[table] = None
+        else:
+            keys[table] = set(group['pk'].dropna().astype(int))
+    return keys
@@ -0,0 +1,156 @@
+"""Writes made through the app's forms.
+
+``CRUDOperations`` takes the engine it writes to and imports no Streamlit,
+so scripts can add rows the same way the forms do. Each method returns
+``(success, message)`` instead of rendering it, and invalidates the query
+cache for the table it wrote (and brings the expiry index up to date).
+"""
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from addresses import ensure_address_columns, parse_addresses
+from archive import archive_table_name
+from expiry_index import refresh_expiry_index
+from idempotency import run_once
+from querycache import refresh_from_change_log
+
+
+def next_id(connectable, table, column):
+    """One past the largest `column` in `table` and its archive (1 when both are empty)"""
+    if hasattr(connectable, 'connect'):
+        with connectable.connect() as conn:
+            return next_id(conn, table, column)
+    archive = archive_table_name(table)
+    sources = [table]
+    # Archived rows keep their ids: a new row must not take one of them
+    if connectable.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                           {"name": archive}).first():
+        sources.append(archive)
+    largest = " UNION ALL ".join(f"SELECT MAX({column}) AS id FROM {source}" for source in sources)
+    return int(connectable.execute(text(f"SELECT COALESCE(MAX(id), 0) + 1 FROM ({largest})")).scalar())
+
+
+class CRUDOperations:
+    """CRUD operations for all entities"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def add_provider(self, name, provider_type, city, contact, address=""):
+        """Add new provider"""
+        try:
+            ensure_address_columns(self.engine)
+            # The id is read and used in one transaction, so concurrent adds cannot take the same one
+            with self.engine.begin() as conn:
+                new_id = next_id(conn, 'providers', 'provider_id')
+                new_provider = pd.DataFrame({
+                    'provider_id': [new_id],
+                    'name': [name],
+                    'type': [provider_type],
+                    'city': [city],
+                    'contact': [contact],
+                    'address': [address]
+                })
+                new_provider = new_provider.join(parse_addresses(new_provider['address']))
+                new_provider.to_sql('providers', conn, if_exists='append', index=False)
+            refresh_from_change_log(self.engine, 'providers')
+            refresh_expiry_index(self.engine)
+            return True, "Provider added successfully!"
+        except Exception as e:
+            return False, f"Error adding provider: {e}"
+
+    def add_receiver(self, name, receiver_type, city, contact):
+        """Add new receiver"""
+        try:
+            with self.engine.begin() as conn:
+                new_id = next_id(conn, 'receivers', 'receiver_id')
+                new_receiver = pd.DataFrame({
+                    'receiver_id': [new_id],
+                    'name': [name],
+                    'type': [receiver_type],
+                    'city': [city],
+                    'contact': [contact]
+                })
+                new_receiver.to_sql('receivers', conn, if_exists='append', index=False)
+            refresh_from_change_log(self.engine, 'receivers')
+            return True, "Receiver added successfully!"
+        except Exception as e:
+            return False, f"Error adding receiver: {e}"
+
+    def add_food_listing(self, food_name, quantity, expiry_date, provider_id, food_type, meal_type, idempotency_key=None):
+        """Add new food listing (replays of the same idempotency key return the original result)"""
+        try:
+            def write(conn):
+                new_id = next_id(conn, 'food_listings', 'food_id')
+                new_food = pd.DataFrame({
+                    'food_id': [new_id],
+                    'food_name': [food_name],
+                    'quantity': [quantity],
+                    'expiry_date': [expiry_date],
+                    'provider_id': [provider_id],
+                    'food_type': [food_type],
+                    'meal_type': [meal_type]
+                })
+                new_food.to_sql('food_listings', conn, if_exists='append', index=False)
+                return True, "Food listing added successfully!"
+
+            success, message, replayed = run_once(self.engine, idempotency_key, 'add_food_listing', write)
+            if not replayed:
+                refresh_from_change_log(self.engine, 'food_listings')
+                refresh_expiry_index(self.engine)
+            return success, message
+        except Exception as e:
+            return False, f"Error adding food listing: {e}"
+
+    def add_claim(self, food_id, receiver_id, status="Pending", idempotency_key=None):
+        """Add new claim (replays of the same idempotency key return the original result)"""
+        try:
+            def write(conn):
+                new_id = next_id(conn, 'claims', 'claim_id')
+                new_claim = pd.DataFrame({
+                    'claim_id': [new_id],
+                    'food_id': [food_id],
+                    'receiver_id': [receiver_id],
+                    'status': [status],
+                    'timestamp': [datetime.now()]
+                })
+                new_claim.to_sql('claims', conn, if_exists='append', index=False)
+                return True, "Claim added successfully!"
+
+            success, message, replayed = run_once(self.engine, idempotency_key, 'add_claim', write)
+            if not replayed:
+                refresh_from_change_log(self.engine, 'claims')
+            return success, message
+        except Exception as e:
+            return False, f"Error adding claim: {e}"
+
+    def add_proposed_claims(self, proposals, idempotency_key=None):
+        """Add a Pending claim per proposed match (matching.propose_claims), skipping listings claimed since"""
+        try:
+            def write(conn):
+                active = pd.read_sql(text(
+                    "SELECT DISTINCT food_id FROM claims WHERE status IN ('Pending', 'Completed')"
+                ), conn)['food_id']
+                open_proposals = proposals[~proposals['food_id'].isin(active)]
+                if open_proposals.empty:
+                    return True, "No proposed claims left to add (all listings were claimed meanwhile)."
+                first_id = next_id(conn, 'claims', 'claim_id')
+                pd.DataFrame({
+                    'claim_id': range(first_id, first_id + len(open_proposals)),
+                    'food_id': open_proposals['food_id'].to_numpy(),
+                    'receiver_id': open_proposals['receiver_id'].to_numpy(),
+                    'status': 'Pending',
+                    'timestamp': datetime.now(),
+                }).to_sql('claims', conn, if_exists='append', index=False, chunksize=100_000)
+                skipped = len(proposals) - len(open_proposals)
+                return True, (f"Added {len(open_proposals):,} pending claims"
+                              + (f" ({skipped:,} listings were claimed meanwhile)." if skipped else "."))
+
+            success, message, replayed = run_once(self.engine, idempotency_key, 'add_proposed_claims', write)
+            if not replayed:
+                refresh_from_change_log(self.engine, 'claims')
+            return success, message
+        except Exception as e:
+            return False, f"Error adding proposed claims: {e}"
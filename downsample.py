@@ -0,0 +1,92 @@
+"""Downsampling for long time-series charts.
+
+``lttb_indices`` picks the points to keep with Largest-Triangle-Three-Buckets:
+the series is split into equal buckets, and from each bucket it keeps the
+point forming the largest triangle with the previously kept point and the
+average of the next bucket. Peaks and troughs survive, and flat stretches
+collapse. ``scatter`` builds a Plotly trace from a full series. It keeps
+at most ``FWMS_CHART_POINTS`` points (default 1000, about one per pixel of
+chart width) for the chart's date range. Above ``FWMS_WEBGL_POINTS`` points
+(default 500) it switches to
+``Scattergl``, which draws in WebGL instead of one SVG element per point.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+CHART_POINTS = int(os.environ.get("FWMS_CHART_POINTS", "1000"))
+WEBGL_POINTS = int(os.environ.get("FWMS_WEBGL_POINTS", "500"))
+
+
+def _numeric(values):
+    """Float positions for x values (dates become days; anything else its index)"""
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors='coerce')
+    if values.notna().all():
+        return values.to_numpy(dtype='datetime64[s]').astype(np.int64) / 86400.0
+    return np.arange(len(values), dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """Sorted positions of the `n_out` points LTTB keeps (all of them when the series is shorter)"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _numeric(x)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    # n_out - 2 buckets over the points between the (always kept) first and last
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average of the bucket after each point's bucket (the last bucket looks at the last point)
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, np.append(edges, n - 1)[:-1])[1:] / counts[1:]
+    avg_y = np.add.reduceat(y, np.append(edges, n - 1)[:-1])[1:] / counts[1:]
+    avg_x, avg_y = np.append(avg_x, x[-1]), np.append(avg_y, y[-1])
+    bucket = np.repeat(np.arange(n_out - 2), np.diff(edges))
+    next_x, next_y = avg_x[bucket], avg_y[bucket]
+    candidates_x, candidates_y = x[1:n - 1], y[1:n - 1]
+    # Twice the triangle (a, candidate, next average) area is |x_a * P + y_a * Q + R|
+    p = candidates_y - next_y
+    q = next_x - candidates_x
+    r = candidates_x * next_y - next_x * candidates_y
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    if n < 32 * n_out:
+        # Small buckets: plain floats beat a handful of numpy calls per bucket
+        xs, ys, p, q, r, bounds = x.tolist(), y.tolist(), p.tolist(), q.tolist(), r.tolist(), edges.tolist()
+        for i in range(n_out - 2):
+            xa, ya = xs[a], ys[a]
+            best = -1.0
+            for j in range(bounds[i] - 1, bounds[i + 1] - 1):
+                area = abs(xa * p[j] + ya * q[j] + r[j])
+                if area > best:
+                    best, a = area, j + 1
+            selected[i + 1] = a
+        return selected
+    for i in range(n_out - 2):
+        lo, hi = edges[i] - 1, edges[i + 1] - 1
+        area = np.abs(x[a] * p[lo:hi] + y[a] * q[lo:hi] + r[lo:hi])
+        a = lo + 1 + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(x, y, max_points=CHART_POINTS):
+    """(x, y) reduced to at most `max_points` points with LTTB"""
+    x, y = pd.Series(x).reset_index(drop=True), pd.Series(y).reset_index(drop=True)
+    if len(y) <= max_points:
+        return x, y
+    keep = lttb_indices(x, y, max_points)
+    return x.iloc[keep], y.iloc[keep]
+
+
+def scatter(x, y, max_points=CHART_POINTS, webgl_points=WEBGL_POINTS, **kwargs):
+    """go.Scatter of the downsampled series, or go.Scattergl when it still has more than `webgl_points`"""
+    import plotly.graph_objects as go
+    x, y = downsample(x, y, max_points)
+    trace = go.Scattergl if len(y) > webgl_points else go.Scatter
+    return trace(x=x, y=y, **kwargs)
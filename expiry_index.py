@@ -0,0 +1,273 @@
+"""In-memory index of listings by expiry hour, for "what expires soon" reads.
+
+``SQLQueries.get_items_expiring_next_3_days`` has to evaluate
+``DATE(expiry_date)`` on every listing. ``ExpiryIndex`` keeps the listings
+in a calendar queue instead: one bucket per expiry hour
+(``{hour: {food_id, ...}}``), and the same buckets per provider city. A read
+walks only the hours it asks for, so it costs O(hours + k) for k results no
+matter how many listings there are. An insert, update or delete moves one id
+between buckets in O(1).
+
+The index follows the change log. Each read first applies the
+``food_listings`` / ``providers`` entries logged since the last one it
+applied, re-reading only those rows (a ``reload`` entry rebuilds it). Writes
+from any process show up on the next read, and ``CRUDOperations`` applies
+its own writes at once. There is one index per engine, shared by every
+session in the process:
+
+    index = expiry_index(engine)
+    index.expiring_within(24, city='Springfield')
+    index.items_expiring_next_3_days()   # same rows as SQLQueries.get_items_expiring_next_3_days
+"""
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from changelog import CHANGE_LOG_TABLE, ensure_change_log
+from urgency import URGENCY_BUCKETS, as_of_date, classify_days
+
+COLUMNS = ['food_id', 'food_name', 'quantity', 'expiry_date', 'urgency', 'provider_id', 'provider_name', 'city']
+HOUR_NS = 3_600_000_000_000
+DAY_NS = 24 * HOUR_NS
+
+# Whole days ahead covered by "expiring in the next 3 days": Critical and Urgent
+_LAST_DAY = dict(URGENCY_BUCKETS)
+NEXT_3_DAYS = (_LAST_DAY['Expired'] + 1, _LAST_DAY['Urgent'])
+
+# A change batch touching more than this share of the listings is applied as a rebuild
+REBUILD_FRACTION = 0.25
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def _id_list(ids):
+    return ", ".join(str(int(i)) for i in ids) or "NULL"
+
+
+def _stamps(values):
+    """Nanoseconds since the epoch of each stored expiry value (None where it does not parse)"""
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce', format='ISO8601')
+    nanos = parsed.to_numpy(dtype='datetime64[ns]').view('int64').tolist()
+    return [None if missing else ns for ns, missing in zip(nanos, parsed.isna().tolist())]
+
+
+def _group(keys, ids):
+    """{key: {id, ...}} for parallel integer arrays (one sort instead of a set lookup per row)"""
+    order = np.argsort(keys, kind='stable')
+    keys, ids = keys[order], ids[order].tolist()
+    starts = np.flatnonzero(np.diff(keys, prepend=keys[:1] - 1)).tolist()
+    ends = starts[1:] + [len(ids)]
+    return {key: set(ids[a:b]) for key, a, b in zip(keys[starts].tolist(), starts, ends)}
+
+
+class ExpiryIndex:
+    """Listings bucketed by expiry hour, overall and per provider city"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.seq = None
+        self._lock = threading.RLock()
+        self._listings = {}            # food_id -> (expiry ns, provider_id, food_name, quantity, expiry_date)
+        self._hours = {}               # expiry hour -> {food_id}
+        self._city_hours = {}          # city -> expiry hour -> {food_id}
+        self._providers = {}           # provider_id -> (name, city)
+        self._provider_listings = {}   # provider_id -> {food_id}
+        self.rebuilds = self.changes_applied = 0
+
+    def __len__(self):
+        return len(self._listings)
+
+    # ---------- maintenance ----------
+    def _add(self, food_id, row):
+        stamp, provider_id = row[0], row[1]
+        self._listings[food_id] = row
+        self._provider_listings.setdefault(provider_id, set()).add(food_id)
+        if stamp is None:
+            return
+        hour = stamp // HOUR_NS
+        self._hours.setdefault(hour, set()).add(food_id)
+        provider = self._providers.get(provider_id)
+        if provider is not None and provider[1] is not None:
+            self._city_hours.setdefault(provider[1], {}).setdefault(hour, set()).add(food_id)
+
+    def _discard(self, buckets, hour, food_id):
+        bucket = buckets.get(hour)
+        if bucket is not None:
+            bucket.discard(food_id)
+            if not bucket:
+                del buckets[hour]
+
+    def _remove(self, food_id):
+        row = self._listings.pop(food_id, None)
+        if row is None:
+            return
+        stamp, provider_id = row[0], row[1]
+        listings = self._provider_listings.get(provider_id)
+        if listings is not None:
+            listings.discard(food_id)
+            if not listings:
+                del self._provider_listings[provider_id]
+        if stamp is None:
+            return
+        self._discard(self._hours, stamp // HOUR_NS, food_id)
+        provider = self._providers.get(provider_id)
+        if provider is not None and provider[1] in self._city_hours:
+            self._discard(self._city_hours[provider[1]], stamp // HOUR_NS, food_id)
+
+    def _read_listings(self, conn, where=""):
+        rows = conn.execute(text(
+            f"SELECT food_id, expiry_date, provider_id, food_name, quantity FROM food_listings {where}"
+        )).fetchall()
+        stamps = _stamps([row[1] for row in rows])
+        return {row[0]: (stamp, row[2], row[3], row[4], row[1]) for row, stamp in zip(rows, stamps)}
+
+    def _read_providers(self, conn, where=""):
+        rows = conn.execute(text(f"SELECT provider_id, name, city FROM providers {where}")).fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def rebuild(self):
+        """Reload every listing and provider"""
+        with self._lock:
+            with self.engine.begin() as conn:
+                ensure_change_log(conn)
+            with self.engine.connect() as conn:
+                # Read the seq first: a change landing during the load is applied again next time
+                seq = conn.execute(text(f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGE_LOG_TABLE}")).scalar()
+                providers = self._read_providers(conn)
+                listings = self._read_listings(conn)
+            self._listings, self._providers = listings, providers
+            ids = np.fromiter(listings, dtype=np.int64, count=len(listings))
+            rows = listings.values()
+            dated = np.array([row[0] is not None for row in rows], dtype=bool)
+            hours = np.array([row[0] // HOUR_NS if row[0] is not None else 0 for row in rows], dtype=np.int64)
+            self._hours = _group(hours[dated], ids[dated])
+            # Per city: group on (city code, hour) packed into one integer
+            cities = pd.Series([providers.get(row[1], (None, None))[1] for row in rows], dtype=object)
+            codes, names = pd.factorize(cities)
+            placed = dated & (codes >= 0)
+            first = int(hours[placed].min()) if placed.any() else 0
+            span = int(hours[placed].max()) - first + 1 if placed.any() else 1
+            self._city_hours = {}
+            for key, food_ids in _group(codes[placed] * span + hours[placed] - first, ids[placed]).items():
+                self._city_hours.setdefault(names[key // span], {})[key % span + first] = food_ids
+            owners = pd.Series([row[1] for row in rows], dtype=object)
+            known = owners.notna().to_numpy()
+            self._provider_listings = _group(owners[known].to_numpy(dtype=np.int64), ids[known])
+            self.seq = seq
+            self.rebuilds += 1
+
+    def refresh(self):
+        """Apply listing and provider changes logged since the last refresh; returns how many"""
+        with self._lock:
+            if self.seq is None:
+                self.rebuild()
+                return 0
+            with self.engine.connect() as conn:
+                changes = conn.execute(text(f"""
+                SELECT seq, table_name, pk, op FROM {CHANGE_LOG_TABLE}
+                WHERE seq > :after AND table_name IN ('food_listings', 'providers')
+                ORDER BY seq
+                """), {"after": self.seq}).fetchall()
+                if not changes:
+                    return 0
+                seq = changes[-1][0]
+                keys = {'food_listings': set(), 'providers': set()}
+                for _, table, pk, op in changes:
+                    if op == 'reload' or pk is None:
+                        keys = None
+                        break
+                    keys[table].add(pk)
+                if keys is None or len(keys['food_listings']) > REBUILD_FRACTION * max(len(self._listings), 1000):
+                    self.rebuild()
+                    return len(changes)
+                if keys['providers']:
+                    providers = self._read_providers(conn, f"WHERE provider_id IN ({_id_list(keys['providers'])})")
+                    # Re-bucket their listings under the (possibly new) city
+                    moved = set().union(*(self._provider_listings.get(pid, ()) for pid in keys['providers']))
+                    rows = {food_id: self._listings[food_id] for food_id in moved}
+                    for food_id in moved:
+                        self._remove(food_id)
+                    for pid in keys['providers']:
+                        if pid in providers:
+                            self._providers[pid] = providers[pid]
+                        else:
+                            self._providers.pop(pid, None)
+                    for food_id, row in rows.items():
+                        self._add(food_id, row)
+                if keys['food_listings']:
+                    listings = self._read_listings(conn, f"WHERE food_id IN ({_id_list(keys['food_listings'])})")
+                    for food_id in keys['food_listings']:
+                        self._remove(food_id)
+                        if food_id in listings:
+                            self._add(food_id, listings[food_id])
+            self.seq = seq
+            self.changes_applied += len(changes)
+            return len(changes)
+
+    # ---------- reads ----------
+    def _between(self, start, end, city, as_of):
+        """Rows expiring in [start, end), optionally in one provider city, ordered by expiry date"""
+        start_ns, end_ns = pd.Timestamp(start).value, pd.Timestamp(end).value
+        with self._lock:
+            self.refresh()
+            buckets = self._hours if city is None else self._city_hours.get(city, {})
+            first, last = start_ns // HOUR_NS, -(-end_ns // HOUR_NS)
+            if last - first <= len(buckets):
+                hours = [hour for hour in range(first, last) if hour in buckets]
+            else:
+                hours = sorted(hour for hour in buckets if first <= hour < last)
+            rows = []
+            for hour in hours:
+                bucket = [self._listings[food_id] + (food_id,) for food_id in buckets[hour]]
+                bucket.sort(key=lambda row: (row[4], row[5]))
+                for stamp, provider_id, food_name, quantity, expiry, food_id in bucket:
+                    provider = self._providers.get(provider_id)
+                    # Listings without a provider drop out, like the SQL inner join
+                    if provider is not None and start_ns <= stamp < end_ns:
+                        rows.append((food_id, food_name, quantity, expiry, stamp // DAY_NS,
+                                     provider_id, provider[0], provider[1]))
+        result = pd.DataFrame(rows, columns=COLUMNS)
+        today = as_of_date(as_of).value // DAY_NS
+        result['urgency'] = classify_days(result['urgency'] - today).astype(object).to_numpy()
+        return result
+
+    def expiring_within(self, hours, city=None, as_of=None):
+        """Listings expiring in the next `hours` hours from `as_of` (default now), optionally in one city"""
+        start = pd.Timestamp(as_of if as_of is not None else datetime.now())
+        return self._between(start, start + pd.Timedelta(hours=hours), city, start)
+
+    def expiring_days(self, first, last, city=None, as_of=None):
+        """Listings expiring `first` to `last` whole days after the as_of date (0 = today)"""
+        day = as_of_date(as_of)
+        return self._between(day + pd.Timedelta(days=first), day + pd.Timedelta(days=last + 1), city, day)
+
+    def items_expiring_next_3_days(self, as_of=None):
+        """Same rows as ``SQLQueries.get_items_expiring_next_3_days``"""
+        return self.expiring_days(*NEXT_3_DAYS, as_of=as_of)
+
+
+def expiry_index(engine):
+    """The process-wide index for `engine` (loaded on its first read)"""
+    with _lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = _indexes[engine] = ExpiryIndex(engine)
+        return index
+
+
+def start_background_load(engine):
+    """Build `engine`'s index on a daemon thread (a read meanwhile waits for it); returns the index"""
+    index = expiry_index(engine)
+    threading.Thread(target=index.refresh, name="expiry-index", daemon=True).start()
+    return index
+
+
+def refresh_expiry_index(engine):
+    """Apply pending changes to `engine`'s index, if one has been built (called after CRUD writes)"""
+    index = _indexes.get(engine)
+    if index is not None and index.seq is not None:
+        index.refresh()
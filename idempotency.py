@@ -0,0 +1,82 @@
+"""Idempotency keys for CRUD submissions.
+
+A submission carries a key that is stored in a unique-indexed table in the
+same transaction as the write. Replaying the key returns the stored result
+instead of writing again.
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+IDEMPOTENCY_TABLE = "idempotency_keys"
+
+
+def ensure_idempotency_table(engine):
+    """Create the idempotency table and its unique index if missing"""
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {IDEMPOTENCY_TABLE} (
+            idempotency_key VARCHAR NOT NULL,
+            operation VARCHAR NOT NULL,
+            success INTEGER,
+            message VARCHAR,
+            created_at DATETIME
+        )
+        """))
+        conn.execute(text(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_{IDEMPOTENCY_TABLE}_key
+        ON {IDEMPOTENCY_TABLE} (idempotency_key)
+        """))
+
+
+def _stored_result(conn, key):
+    row = conn.execute(
+        text(f"SELECT success, message FROM {IDEMPOTENCY_TABLE} WHERE idempotency_key = :key"),
+        {"key": key},
+    ).first()
+    if row is None or row.success is None:
+        return None
+    return bool(row.success), row.message
+
+
+def run_once(engine, key, operation, write_fn):
+    """Run write_fn(conn) at most once per key.
+
+    Returns (success, message, replayed). When key is None the write always
+    runs. If write_fn raises, the transaction (and the key) is rolled back so
+    the submission can be retried.
+    """
+    if key is None:
+        with engine.begin() as conn:
+            success, message = write_fn(conn)
+        return success, message, False
+
+    try:
+        with engine.begin() as conn:
+            stored = _stored_result(conn, key)
+            if stored is not None:
+                return stored[0], stored[1], True
+            conn.execute(
+                text(f"""
+                INSERT INTO {IDEMPOTENCY_TABLE} (idempotency_key, operation, created_at)
+                VALUES (:key, :operation, :created_at)
+                """),
+                {"key": key, "operation": operation, "created_at": datetime.now()},
+            )
+            success, message = write_fn(conn)
+            conn.execute(
+                text(f"""
+                UPDATE {IDEMPOTENCY_TABLE} SET success = :success, message = :message
+                WHERE idempotency_key = :key
+                """),
+                {"key": key, "success": int(bool(success)), "message": message},
+            )
+        return success, message, False
+    except IntegrityError:
+        # A concurrent submission with the same key committed first
+        with engine.connect() as conn:
+            stored = _stored_result(conn, key)
+        if stored is None:
+            raise
+        return stored[0], stored[1], True
@@ -0,0 +1,218 @@
+"""Typed, chunked CSV ingestion for the four seed extracts.
+
+Every column has an explicit dtype (categories for low-cardinality type, city
+and status columns) and every date column an explicit format, so nothing is
+inferred per row. Files are streamed with ``chunksize`` to keep memory
+bounded. Values that do not parse are counted per column; rows whose primary
+key or date does not parse are rejected and counted.
+"""
+import time
+
+import pandas as pd
+
+from schema import ENTITY_SCHEMAS, source_headers
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = pc = None
+
+INGEST_CHUNKSIZE = 100_000
+
+# table -> spec. Numeric and date columns are read as text and converted with
+# errors='coerce', so a bad token is counted instead of failing the whole file.
+CSV_SPECS = {
+    'providers': {
+        'path': 'providers_data.csv',
+        'key': 'Provider_ID',
+        'dtype': {
+            'Provider_ID': 'Int64',
+            'Name': 'string',
+            'Type': 'category',
+            'Address': 'string',
+            'City': 'category',
+            'Contact': 'string',
+        },
+        'dates': {},
+    },
+    'receivers': {
+        'path': 'receivers_data.csv',
+        'key': 'Receiver_ID',
+        'dtype': {
+            'Receiver_ID': 'Int64',
+            'Name': 'string',
+            'Type': 'category',
+            'City': 'category',
+            'Contact': 'string',
+        },
+        'dates': {},
+    },
+    'food_listings': {
+        'path': 'food_listings_data.csv',
+        'key': 'Food_ID',
+        'dtype': {
+            'Food_ID': 'Int64',
+            'Food_Name': 'category',
+            'Quantity': 'Int64',
+            'Provider_ID': 'Int64',
+            'Provider_Type': 'category',
+            'Location': 'category',
+            'Food_Type': 'category',
+            'Meal_Type': 'category',
+        },
+        'dates': {'Expiry_Date': '%m/%d/%Y'},
+    },
+    'claims': {
+        'path': 'claims_data.csv',
+        'key': 'Claim_ID',
+        'dtype': {
+            'Claim_ID': 'Int64',
+            'Food_ID': 'Int64',
+            'Receiver_ID': 'Int64',
+            'Status': 'category',
+        },
+        'dates': {'Timestamp': '%m/%d/%Y %H:%M'},
+    },
+}
+
+NUMERIC_DTYPES = ('Int64', 'Float64')
+INT_PATTERN = r'^\s*[+-]?\d+\s*$'
+FLOAT_PATTERN = r'^\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*$'
+
+# Arrow-backed text lets numbers and dates be parsed with vectorized Arrow kernels
+RAW_TEXT_DTYPE = 'string[pyarrow]' if pa is not None else 'object'
+
+
+def _read_dtypes(spec):
+    """dtypes handed to the C parser: numeric and date columns arrive as raw text"""
+    dtypes = {col: (RAW_TEXT_DTYPE if dtype in NUMERIC_DTYPES else dtype) for col, dtype in spec['dtype'].items()}
+    dtypes.update({col: RAW_TEXT_DTYPE for col in spec['dates']})
+    return dtypes
+
+
+def _parse_numbers(raw, dtype):
+    """Text -> nullable numbers; anything malformed becomes <NA>"""
+    if pa is None:
+        converted = pd.to_numeric(raw, errors='coerce')
+        if dtype == 'Int64':
+            converted = converted.where(converted % 1 == 0)
+        return converted.astype(dtype)
+    text = pc.utf8_trim_whitespace(pa.array(raw))
+    pattern = INT_PATTERN if dtype == 'Int64' else FLOAT_PATTERN
+    valid = pc.match_substring_regex(text, pattern)
+    target = pa.int64() if dtype == 'Int64' else pa.float64()
+    parsed = pc.cast(pc.if_else(valid, text, None), target)
+    return parsed.to_pandas(types_mapper=pd.ArrowDtype).set_axis(raw.index).astype(dtype)
+
+
+def _parse_dates(raw, fmt):
+    """Text -> datetime64 with an explicit format; anything malformed becomes NaT"""
+    if pa is None:
+        return pd.to_datetime(raw, format=fmt, errors='coerce')
+    parsed = pc.strptime(pa.array(raw), format=fmt, unit='s', error_is_null=True)
+    return parsed.to_pandas().set_axis(raw.index).astype('datetime64[ns]')
+
+
+def _convert_chunk(chunk, spec, invalid_by_column):
+    """Apply numeric dtypes and date formats; returns the mask of rows to keep"""
+    keep = pd.Series(True, index=chunk.index)
+    for col, dtype in spec['dtype'].items():
+        if col not in chunk.columns or dtype not in NUMERIC_DTYPES:
+            continue
+        raw = chunk[col]
+        converted = _parse_numbers(raw, dtype)
+        bad = converted.isna() & raw.notna()
+        chunk[col] = converted
+        invalid_by_column[col] = invalid_by_column.get(col, 0) + int(bad.sum())
+        if col == spec['key']:
+            keep &= converted.notna()
+    for col, fmt in spec['dates'].items():
+        if col not in chunk.columns:
+            continue
+        raw = chunk[col]
+        converted = _parse_dates(raw, fmt)
+        bad = converted.isna() & raw.notna()
+        chunk[col] = converted
+        invalid_by_column[col] = invalid_by_column.get(col, 0) + int(bad.sum())
+        keep &= ~bad
+    return keep
+
+
+def file_spec(path, table):
+    """CSV_SPECS[table] keyed by the headers `path` actually has.
+
+    A source may name a column by any alias in the entity schema (``ID``,
+    ``Phone``, ``Expiration``, ...). The spec's dtype or date format moves to
+    the header ``schema.apply_schema`` will map, so aliased columns are read
+    and typed instead of dropped.
+    """
+    spec = CSV_SPECS[table]
+    found = source_headers(pd.read_csv(path, nrows=0).columns, table)
+    canonical_of = {}
+    for canonical, column in ENTITY_SCHEMAS[table]['columns'].items():
+        for source in (canonical, *column['aliases']):
+            canonical_of.setdefault(source, canonical)
+
+    def header(name):
+        return found.get(canonical_of.get(name), name)
+
+    return dict(
+        spec,
+        key=header(spec['key']),
+        dtype={header(col): dtype for col, dtype in spec['dtype'].items()},
+        dates={header(col): fmt for col, fmt in spec['dates'].items()},
+    )
+
+
+def iter_csv_typed(path, spec, chunksize=INGEST_CHUNKSIZE, report=None):
+    """Yield typed chunks of `path`; fills `report` with row and reject counts"""
+    report = report if report is not None else {}
+    report.setdefault('rows', 0)
+    report.setdefault('rejected', 0)
+    report.setdefault('invalid_by_column', {})
+    wanted = set(spec['dtype']) | set(spec['dates'])
+    reader = pd.read_csv(
+        path,
+        usecols=lambda col: col in wanted,
+        dtype=_read_dtypes(spec),
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        keep = _convert_chunk(chunk, spec, report['invalid_by_column'])
+        report['rows'] += int(keep.sum())
+        report['rejected'] += int((~keep).sum())
+        yield chunk[keep]
+
+
+def read_csv_typed(table, path=None, chunksize=INGEST_CHUNKSIZE):
+    """Read one seed extract fully; returns (DataFrame, report)"""
+    path = path or CSV_SPECS[table]['path']
+    spec = file_spec(path, table)
+    report = {'table': table, 'path': path}
+    start = time.perf_counter()
+    chunks = list(iter_csv_typed(path, spec, chunksize=chunksize, report=report))
+    if chunks:
+        df = pd.concat(chunks, ignore_index=True)
+    else:
+        df = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in spec['dtype'].items()})
+    # Categories from different chunks may not line up; re-apply the declared dtype
+    for col, dtype in spec['dtype'].items():
+        if dtype == 'category' and col in df.columns:
+            df[col] = df[col].astype('category')
+    report['seconds'] = time.perf_counter() - start
+    report['rows_per_second'] = report['rows'] / report['seconds'] if report['seconds'] else 0.0
+    return df, report
+
+
+def format_report(report):
+    """One-line load status for the UI"""
+    message = f"{report['rows']:,} rows in {report['seconds']:.2f}s"
+    if report.get('source'):
+        message += f" from {report['source']}"
+    invalid = {col: n for col, n in report['invalid_by_column'].items() if n}
+    if report['rejected']:
+        message += f", {report['rejected']:,} rejected"
+    if invalid:
+        message += " (invalid values: " + ", ".join(f"{col} {n}" for col, n in invalid.items()) + ")"
+    return message
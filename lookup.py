@@ -0,0 +1,75 @@
+"""Search-as-you-type lookups for the provider, receiver and food pickers.
+
+Instead of loading every row into a selectbox, a picker asks for the top
+``TYPEAHEAD_LIMIT`` rows whose label starts with the typed text (case-
+insensitive) or whose ID equals it. Prefixes are a half-open range over a
+``NOCASE`` index on the label, so a lookup costs the same at 1k or 1M rows,
+and results are cached per prefix in the query cache until the table is
+written.
+"""
+import os
+
+from sqlalchemy import text
+
+from querycache import cached
+
+TYPEAHEAD_LIMIT = int(os.environ.get("FWMS_TYPEAHEAD_LIMIT", "20"))
+
+# table -> (id column, label column)
+PICKERS = {
+    'providers': ('provider_id', 'name'),
+    'receivers': ('receiver_id', 'name'),
+    'food_listings': ('food_id', 'food_name'),
+}
+
+
+def ensure_lookup_indexes(engine):
+    """Index each picker's label (NOCASE) and id (idempotent; a table replace drops indexes)"""
+    with engine.begin() as conn:
+        for table, (key, label) in PICKERS.items():
+            columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info('{table}')"))}
+            if {key, label} <= columns:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_{label}_nocase ON {table} ({label} COLLATE NOCASE, {key})"
+                ))
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{key} ON {table} ({key})"))
+
+
+def _search(engine, table, prefix, limit):
+    key, label = PICKERS[table]
+    with engine.connect() as conn:
+        rows = []
+        if prefix.isdigit():
+            # An exact ID goes first
+            rows = conn.execute(
+                text(f"SELECT {key}, {label} FROM {table} WHERE {key} = :id LIMIT 1"), {"id": int(prefix)}
+            ).fetchall()
+        if prefix:
+            # Half-open range so SQLite walks the NOCASE index (LIKE would scan)
+            where = f"{label} >= :lo COLLATE NOCASE AND {label} < :hi COLLATE NOCASE"
+            params = {"lo": prefix, "hi": prefix[:-1] + chr(ord(prefix[-1]) + 1)}
+        else:
+            where, params = "1 = 1", {}
+        rows += conn.execute(text(f"""
+        SELECT {key}, {label} FROM {table}
+        WHERE {where}
+        ORDER BY {label} COLLATE NOCASE, {key}
+        LIMIT :limit
+        """), {**params, "limit": limit}).fetchall()
+    return list(dict(rows).items())[:limit]
+
+
+def _cached_search(table):
+    def search(engine, prefix, limit):
+        return _search(engine, table, prefix, limit)
+    search.__qualname__ = f"typeahead.{table}"
+    return cached(table, maxsize=1024)(search)
+
+
+SEARCHES = {table: _cached_search(table) for table in PICKERS}
+
+
+def typeahead(engine, table, query, limit=TYPEAHEAD_LIMIT):
+    """{"Label (ID: n)": id} for the top matches of `query` (all rows' first `limit` when blank)"""
+    prefix = (query or '').strip().lower()
+    return {f"{name} (ID: {key})": key for key, name in SEARCHES[table](engine, prefix, limit)}
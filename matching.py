@@ -0,0 +1,258 @@
+"""Expiry-aware matching of open food listings to receivers.
+
+An open listing is unexpired, has no Pending or Completed claim, and
+expires within ``FWMS_MATCH_HORIZON_DAYS`` (default 3, the Critical and
+Urgent buckets). Later listings wait for a later run. Each receiver can
+pick up ``FWMS_MATCH_DAILY_CAPACITY`` listings per day (default 2), less
+the Pending claims it already holds on listings that have not expired. A
+pickup has to happen on or before the listing's expiry date.
+
+The value of giving listing l to receiver r is the quantity expected to be
+saved: ``quantity * p(r, l)``. ``p`` is r's completion rate on claims of l's
+food type and of its meal type. Sparse histories are smoothed toward the
+receiver's overall rate, and that rate toward its receiver type's rate.
+Candidates are the ``FWMS_MATCH_CANDIDATES`` best receivers in the
+listing's city (default 20; its provider's city when the listing has no
+location, as for listings added in the app), or more in a city with more
+listings than that many receivers could take.
+
+``match`` is a lazy heap greedy. It pops the highest-value (listing,
+candidate) pair and books the latest free day on or before expiry, which
+keeps earlier days for listings that expire sooner. If the candidate has no
+such day, the listing moves on to its next candidate. ``propose_claims``
+runs it on the database; ``CRUDOperations.add_proposed_claims`` writes the
+proposals as Pending claims.
+"""
+import heapq
+import os
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from querycache import cached
+from urgency import as_of_date, days_until_expiry, sql_days_until
+
+MATCH_HORIZON_DAYS = int(os.environ.get("FWMS_MATCH_HORIZON_DAYS", "3"))
+MATCH_DAILY_CAPACITY = int(os.environ.get("FWMS_MATCH_DAILY_CAPACITY", "2"))
+MATCH_CANDIDATES = int(os.environ.get("FWMS_MATCH_CANDIDATES", "20"))
+
+# Closed claims a rate needs before it outweighs the rate it is smoothed toward
+PRIOR_CLAIMS = 5
+# Claims holding a listing (a Cancelled claim frees it again)
+ACTIVE_STATUSES = ('Pending', 'Completed')
+
+
+def _smoothed(completed, closed, prior):
+    return (completed + PRIOR_CLAIMS * prior) / (closed + PRIOR_CLAIMS)
+
+
+def receiver_profiles(receivers, history, daily_capacity=MATCH_DAILY_CAPACITY, horizon_days=MATCH_HORIZON_DAYS):
+    """Per-receiver completion rates and pickup slots from claim history.
+
+    `receivers` has receiver_id, type and city; `history` has receiver_id,
+    status, food_type and meal_type, one row per claim, and optionally
+    unexpired (only those Pending claims use up capacity). Returns (profiles,
+    rates): profiles indexed by receiver_id with city, rate, pending and
+    capacity; rates maps 'food_type' / 'meal_type' to smoothed rates indexed
+    by (receiver_id, value).
+    """
+    receivers = receivers[['receiver_id', 'type', 'city']].drop_duplicates('receiver_id').set_index('receiver_id')
+    history = history[history['receiver_id'].isin(receivers.index)]
+    closed = history[history['status'].isin(('Completed', 'Cancelled'))].assign(
+        completed=lambda d: (d['status'] == 'Completed').astype(float), closed=1.0)
+    overall = closed['completed'].mean() if len(closed) else 0.5
+
+    by_type = closed.groupby(closed['receiver_id'].map(receivers['type']), observed=True)[['completed', 'closed']].sum()
+    type_rate = _smoothed(by_type['completed'], by_type['closed'], overall)
+    prior = receivers['type'].map(type_rate).astype(float).fillna(overall)
+    own = closed.groupby('receiver_id')[['completed', 'closed']].sum().reindex(receivers.index, fill_value=0.0)
+    profiles = receivers[['city']].assign(rate=_smoothed(own['completed'], own['closed'], prior))
+
+    rates = {}
+    for column in ('food_type', 'meal_type'):
+        sums = closed.groupby(['receiver_id', column], observed=True)[['completed', 'closed']].sum()
+        base = profiles['rate'].reindex(sums.index.get_level_values('receiver_id')).to_numpy()
+        rates[column] = _smoothed(sums['completed'], sums['closed'], base).rename('specific')
+
+    held = history['status'] == 'Pending'
+    if 'unexpired' in history:
+        # A Pending claim on an expired listing will never be picked up
+        held &= history['unexpired'].astype(bool)
+    pending = history[held].groupby('receiver_id').size()
+    profiles['pending'] = pending.reindex(profiles.index, fill_value=0).astype(int)
+    slots = daily_capacity * (horizon_days + 1)
+    profiles['capacity'] = (slots - profiles['pending']).clip(lower=0)
+    return profiles, rates
+
+
+def candidate_table(listings, profiles, rates, candidates=MATCH_CANDIDATES):
+    """Best receivers per (city, food_type, meal_type) group of open listings.
+
+    A group gets its top `candidates` receivers in the city, or more when the
+    city has more listings than that many receivers could take.
+
+    Returns (groups, table): groups numbers each listing's group, and table
+    has one row per (group, receiver) with its completion probability p,
+    best first within each group.
+    """
+    keys = listings[['city', 'food_type', 'meal_type']].astype(str)
+    group_keys = keys.drop_duplicates().reset_index(drop=True)
+    groups = keys.merge(group_keys.reset_index(names='group'), how='left')['group'].to_numpy()
+
+    able = profiles[profiles['capacity'] > 0].reset_index()
+    pairs = group_keys.reset_index(names='group').merge(able[['receiver_id', 'city', 'rate']], on='city')
+    p = []
+    for column in ('food_type', 'meal_type'):
+        specific = rates[column].reset_index().astype({column: str})
+        specific = pairs[['receiver_id', column]].merge(specific, how='left')['specific']
+        p.append(specific.fillna(pairs['rate']).to_numpy())
+    pairs['p'] = (p[0] + p[1]) / 2
+    pairs = pairs.sort_values(['group', 'p', 'receiver_id'], ascending=[True, False, True])
+    # Groups in a busy city compete for the same receivers: take enough to hold all of
+    # the city's listings twice over
+    slots = max(1, int(profiles['capacity'].max()))
+    city_listings = keys['city'].value_counts()
+    wanted = np.maximum(candidates, 2 * -(-group_keys['city'].map(city_listings).to_numpy() // slots))
+    pairs = pairs[pairs.groupby('group', sort=False).cumcount().to_numpy() < wanted[pairs['group'].to_numpy()]]
+    return groups, pairs[['group', 'receiver_id', 'p']].reset_index(drop=True)
+
+
+def match(listings, profiles, rates, as_of=None, horizon_days=MATCH_HORIZON_DAYS,
+          daily_capacity=MATCH_DAILY_CAPACITY, candidates=MATCH_CANDIDATES):
+    """Assign open `listings` to receivers, maximizing the quantity expected to be saved before expiry.
+
+    `listings` has food_id, quantity, expiry_date, city, food_type and
+    meal_type. Listings already expired or expiring after the horizon are
+    skipped. Returns one row per proposed claim: food_id, receiver_id,
+    pickup_date, expected quantity and the listing's details.
+    """
+    days = days_until_expiry(listings['expiry_date'], as_of).to_numpy()
+    open_mask = (days >= 0) & (days <= horizon_days)
+    listings = listings[open_mask].reset_index(drop=True)
+    deadlines = days[open_mask].astype(int)
+    if listings.empty or profiles.empty:
+        return _proposals(listings, [], [], [], [], as_of)
+
+    groups, table = candidate_table(listings, profiles, rates, candidates)
+    # Each group's candidates as parallel lists (receiver index, probability), best first
+    bounds = np.searchsorted(table['group'].to_numpy(), np.arange(groups.max() + 2))
+    cand_receivers = profiles.index.get_indexer(table['receiver_id']).tolist()
+    cand_p = table['p'].tolist()
+
+    # Free pickup slots per (receiver, day); Pending claims already use the earliest days
+    span = horizon_days + 1
+    free = np.full((len(profiles), span), daily_capacity, dtype=np.int64)
+    used = profiles['pending'].to_numpy()
+    for day in range(span):
+        taken = np.minimum(free[:, day], used)
+        free[:, day] -= taken
+        used = used - taken
+    first_free = np.where(free.sum(axis=1) > 0, np.argmax(free > 0, axis=1), span).tolist()
+    remaining = int(free.sum())
+    free = free.tolist()
+
+    # Listings sharing a group and an expiry day share their best feasible candidate, so the
+    # heap holds one entry per such batch: its largest remaining listing at that candidate
+    batch = groups * span + deadlines
+    order = np.lexsort((listings['food_id'].to_numpy(), -listings['quantity'].to_numpy(), batch))
+    batches, first = np.unique(batch[order], return_index=True)
+    last = np.append(first[1:], len(order))
+    quantity = listings['quantity'].astype(float).to_numpy()[order].tolist()
+    candidate = bounds[batches // span].tolist()
+    end = bounds[batches // span + 1].tolist()
+    deadline_of = (batches % span).tolist()
+    cursor, last = first.tolist(), last.tolist()
+    heap = [(-quantity[cursor[b]] * cand_p[candidate[b]], b) for b in range(len(batches)) if candidate[b] < end[b]]
+    heapq.heapify(heap)
+    matched, chosen, pickup = [], [], []
+    while heap and remaining:
+        # The top batch is updated in place (heapreplace) instead of popped and pushed back
+        b = heap[0][1]
+        deadline, c = deadline_of[b], candidate[b]
+        r = cand_receivers[c]
+        if first_free[r] > deadline:
+            # Booked up to this expiry day (for good: slots only fill): move on to the next candidate
+            c += 1
+            while c < end[b] and first_free[cand_receivers[c]] > deadline:
+                c += 1
+            candidate[b] = c
+            if c < end[b]:
+                heapq.heapreplace(heap, (-quantity[cursor[b]] * cand_p[c], b))
+            else:
+                heapq.heappop(heap)
+            continue
+        # The batch keeps its receiver while its next listing still beats every other batch
+        p, i, stop, slots = cand_p[c], cursor[b], last[b], free[r]
+        best_other = -min(heap[1:3])[0] if len(heap) > 1 else -1.0
+        while True:
+            # Latest free day on or before expiry, leaving earlier days to sooner expiries
+            day = deadline
+            while not slots[day]:
+                day -= 1
+            slots[day] -= 1
+            remaining -= 1
+            if day == first_free[r]:
+                while first_free[r] < span and not slots[first_free[r]]:
+                    first_free[r] += 1
+            matched.append(i)
+            chosen.append(c)
+            pickup.append(day)
+            i += 1
+            if i == stop or not remaining or first_free[r] > deadline or quantity[i] * p <= best_other:
+                break
+        cursor[b] = i
+        if i < stop:
+            heapq.heapreplace(heap, (-quantity[i] * p, b))
+        else:
+            heapq.heappop(heap)
+    matched = order[np.asarray(matched, dtype=np.int64)]
+    chosen = np.asarray(chosen, dtype=np.int64)
+    expected = listings['quantity'].to_numpy(dtype=float)[matched] * np.asarray(cand_p)[chosen]
+    receiver_ids = profiles.index.to_numpy()[np.asarray(cand_receivers)[chosen]]
+    return _proposals(listings, matched, receiver_ids, pickup, expected, as_of)
+
+
+def _proposals(listings, matched, receiver_ids, pickup_days, expected, as_of):
+    rows = listings.iloc[matched]
+    proposals = pd.DataFrame({
+        'food_id': rows['food_id'].to_numpy(),
+        'receiver_id': np.asarray(receiver_ids, dtype=np.int64),
+        'pickup_date': as_of_date(as_of) + pd.to_timedelta(np.asarray(pickup_days, dtype=np.int64), unit='D'),
+        'expected_quantity': np.asarray(expected, dtype=float),
+        'quantity': rows['quantity'].to_numpy(),
+        'expiry_date': rows['expiry_date'].to_numpy(),
+        'city': rows['city'].to_numpy(),
+        'food_type': rows['food_type'].to_numpy(),
+        'meal_type': rows['meal_type'].to_numpy(),
+    })
+    return proposals.sort_values(['pickup_date', 'expiry_date', 'food_id'], ignore_index=True)
+
+
+def load_matching_inputs(engine, as_of=None, horizon_days=MATCH_HORIZON_DAYS):
+    """(open listings, receivers, claim history) from the database"""
+    days = sql_days_until('f.expiry_date', as_of)
+    active = ", ".join(f"'{status}'" for status in ACTIVE_STATUSES)
+    with engine.connect() as conn:
+        listings = pd.read_sql(text(f"""
+        SELECT f.food_id, f.quantity, f.expiry_date, COALESCE(f.location, p.city) AS city, f.food_type, f.meal_type
+        FROM food_listings f
+        LEFT JOIN providers p ON f.provider_id = p.provider_id
+        WHERE {days} BETWEEN 0 AND :horizon
+          AND NOT EXISTS (SELECT 1 FROM claims c WHERE c.food_id = f.food_id AND c.status IN ({active}))
+        """), conn, params={'horizon': horizon_days}, parse_dates=['expiry_date'])
+        receivers = pd.read_sql(text("SELECT receiver_id, type, city FROM receivers"), conn)
+        history = pd.read_sql(text(f"""
+        SELECT c.receiver_id, c.status, f.food_type, f.meal_type, COALESCE({days} >= 0, 1) AS unexpired
+        FROM claims c JOIN food_listings f ON c.food_id = f.food_id
+        """), conn)
+    return listings, receivers, history
+
+
+@cached('receivers', 'food_listings', 'claims')
+def propose_claims(engine, as_of=None, horizon_days=MATCH_HORIZON_DAYS, daily_capacity=MATCH_DAILY_CAPACITY,
+                   candidates=MATCH_CANDIDATES):
+    """Proposed Pending claims for the open listings in the database (see match)"""
+    listings, receivers, history = load_matching_inputs(engine, as_of, horizon_days)
+    profiles, rates = receiver_profiles(receivers, history, daily_capacity, horizon_days)
+    return match(listings, profiles, rates, as_of, horizon_days, daily_capacity, candidates)
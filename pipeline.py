@@ -0,0 +1,167 @@
+"""Multi-table ingestion: parallel parsing, FK validation, dependency-ordered results.
+
+Each seed table is parsed, mapped through its schema and cleaned
+independently, so those steps run in a process pool. Foreign keys
+(listings → providers, claims → listings/receivers) are then checked with a
+vectorized ``isin`` against each parent's key index, in dependency order, and
+violating rows join the table's quarantined rows.
+
+    python pipeline.py            # compare parallel vs serial wall time
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ingest import CSV_SPECS
+from quality import clean_and_validate
+from schema import apply_schema
+from snapshot import load_table
+
+# child table -> [(column, parent table, parent key)]
+FOREIGN_KEYS = {
+    'food_listings': [('provider_id', 'providers', 'provider_id')],
+    'claims': [
+        ('food_id', 'food_listings', 'food_id'),
+        ('receiver_id', 'receivers', 'receiver_id'),
+    ],
+}
+
+INGEST_WORKERS = int(os.environ.get("FWMS_INGEST_WORKERS") or min(4, os.cpu_count() or 1))
+# Below this much source data a process pool costs more than it saves
+PARALLEL_MIN_BYTES = 8_000_000
+
+
+def load_order(tables):
+    """`tables` sorted so every parent comes before its children"""
+    ordered, pending = [], list(tables)
+    while pending:
+        ready = [t for t in pending
+                 if all(parent in ordered or parent not in pending for _, parent, _ in FOREIGN_KEYS.get(t, ()))]
+        if not ready:
+            raise ValueError(f"Foreign-key cycle between {pending}")
+        ordered.extend(ready)
+        pending = [t for t in pending if t not in ready]
+    return ordered
+
+
+def parse_table(table, path=None):
+    """Worker: load, map and clean one table; never raises (errors are returned)"""
+    start = time.perf_counter()
+    try:
+        df, load_report = load_table(table, path=path)
+        df, _ = apply_schema(df, table)
+        df, rejected, quality = clean_and_validate(df, table)
+        error = None
+    except Exception as e:
+        df = rejected = pd.DataFrame()
+        load_report = quality = None
+        error = str(e)
+    return {
+        'table': table, 'df': df, 'rejected': rejected, 'load_report': load_report,
+        'quality': quality, 'error': error, 'seconds': time.perf_counter() - start,
+    }
+
+
+def check_foreign_keys(df, table, parents):
+    """Rows whose non-null FK values are missing from an available parent.
+
+    Returns (failing mask, {rule: rows}, {rule: mask}); parents that were not
+    loaded are not checked.
+    """
+    failing = np.zeros(len(df), dtype=bool)
+    counts = {}
+    masks = {}
+    for column, parent, parent_key in FOREIGN_KEYS.get(table, ()):
+        parent_df = parents.get(parent)
+        if parent_df is None or parent_df.empty or column not in df.columns:
+            continue
+        keys = pd.Index(parent_df[parent_key].dropna().unique())
+        values = df[column]
+        mask = (values.notna() & ~values.isin(keys)).to_numpy(dtype=bool)
+        rule = f"fk_{column}"
+        counts[rule] = int(mask.sum())
+        masks[rule] = mask
+        failing |= mask
+    return failing, counts, masks
+
+
+def _apply_foreign_keys(result, parents):
+    start = time.perf_counter()
+    df = result['df']
+    failing, counts, masks = check_foreign_keys(df, result['table'], parents)
+    if failing.any():
+        orphans = df[failing].copy()
+        orphans['reasons'] = [
+            "; ".join(rule for rule, mask in masks.items() if mask[i])
+            for i in failing.nonzero()[0]
+        ]
+        result['rejected'] = pd.concat([result['rejected'], orphans], ignore_index=True)
+        result['df'] = df[~failing]
+    if result['quality'] is not None:
+        seconds = (time.perf_counter() - start) / max(len(counts), 1)
+        for rule, rows in counts.items():
+            result['quality']['rules'][rule] = {'rows': rows, 'seconds': seconds}
+        result['quality']['quarantined'] = len(result['rejected'])
+    return result
+
+
+def ingest_all(tables=None, paths=None, workers=None, parallel=None):
+    """Parse `tables` (default: all seed tables), validate FKs, return results in load order.
+
+    Returns (results, report): results maps table -> parse_table() dict in
+    dependency order; report has 'mode', 'workers', 'wall_seconds' and
+    'serial_seconds' (sum of per-table parse times).
+    """
+    paths = paths or {}
+    tables = load_order(tables or list(CSV_SPECS))
+    workers = workers or INGEST_WORKERS
+    if parallel is None:
+        size = sum(os.path.getsize(p) for p in (paths.get(t, CSV_SPECS[t]['path']) for t in tables)
+                   if os.path.exists(p))
+        parallel = workers > 1 and len(tables) > 1 and size >= PARALLEL_MIN_BYTES
+
+    start = time.perf_counter()
+    if parallel:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tables))) as pool:
+            futures = {t: pool.submit(parse_table, t, paths.get(t)) for t in tables}
+            parsed = {t: futures[t].result() for t in tables}
+    else:
+        parsed = {t: parse_table(t, paths.get(t)) for t in tables}
+
+    results = {}
+    for table in tables:
+        results[table] = _apply_foreign_keys(parsed[table], {t: r['df'] for t, r in results.items()})
+    report = {
+        'mode': 'parallel' if parallel else 'serial',
+        'workers': min(workers, len(tables)) if parallel else 1,
+        'wall_seconds': time.perf_counter() - start,
+        'serial_seconds': sum(r['seconds'] for r in results.values()),
+    }
+    return results, report
+
+
+def format_pipeline_report(report):
+    return (f"{report['mode']} ingest ({report['workers']} worker(s)): {report['wall_seconds']:.2f}s wall "
+            f"vs {report['serial_seconds']:.2f}s of per-table work")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest all seed tables and compare parallel vs serial wall time")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS, help="Process pool size")
+    args = parser.parse_args()
+
+    tables = [t for t in CSV_SPECS if os.path.exists(CSV_SPECS[t]['path'])]
+    for parallel in (False, True):
+        results, report = ingest_all(tables, workers=args.workers, parallel=parallel)
+        print(format_pipeline_report(report))
+    for table, result in results.items():
+        status = result['error'] or f"{len(result['df']):,} rows, {len(result['rejected']):,} quarantined"
+        print(f"  {table:<15} {result['seconds']:.2f}s  {status}")
+
+
+if __name__ == "__main__":
+    main()
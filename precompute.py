@@ -0,0 +1,211 @@
+"""Background precompute of heavy dashboard and analytics results.
+
+Registered jobs (dashboard KPIs and charts, time-series rollups, city and
+provider leaderboards) run on a scheduler thread, not inside a page render.
+A job reruns when one of its tables changes in the change log, or every
+``FWMS_PRECOMPUTE_INTERVAL`` seconds (default 300) for results that depend
+on today's date. Each run publishes an immutable ``Snapshot``. Pages read
+the latest one instantly, even while a newer one is being computed, and
+show its age. A job with no snapshot yet (cold start) runs in the caller.
+
+    scheduler = Scheduler(engine)
+    scheduler.register('dashboard_kpis', SQLQueries(engine).get_total_food_quantity_available)
+    start_background_scheduler(scheduler)
+    snapshot = scheduler.read('dashboard_kpis')   # .value, .computed_at, .age(), ...
+
+Jobs are ``querycache.cached`` / ``cached_figures`` functions; their tables
+come from the cache, and a refresh reads through it. ``job_metrics`` reports
+runs, failures and runtimes per job. Set ``FWMS_PRECOMPUTE=0`` to skip the
+thread (results are then computed on first read and after each change).
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from changelog import table_versions
+from querycache import refresh_from_change_log
+
+PRECOMPUTE_ENABLED = os.environ.get("FWMS_PRECOMPUTE", "1") != "0"
+PRECOMPUTE_INTERVAL = float(os.environ.get("FWMS_PRECOMPUTE_INTERVAL", "300"))
+PRECOMPUTE_POLL = float(os.environ.get("FWMS_PRECOMPUTE_POLL", "2"))
+
+
+class Snapshot(namedtuple('Snapshot', 'name payload computed_at versions seconds')):
+    """One published result; `value` hands out a copy, so readers cannot change it"""
+
+    @property
+    def value(self):
+        if isinstance(self.payload, pd.DataFrame):
+            return self.payload.copy()
+        if isinstance(self.payload, dict):
+            # Charts are kept as Plotly JSON (see _freeze)
+            import plotly.graph_objects as go
+            return {name: go.Figure(json.loads(spec), _validate=False) if isinstance(spec, str) else spec
+                    for name, spec in self.payload.items()}
+        return self.payload
+
+    def age(self):
+        return time.time() - self.computed_at
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return {name: fig.to_json() if hasattr(fig, 'to_json') else fig for name, fig in value.items()}
+    return value.copy() if isinstance(value, pd.DataFrame) else value
+
+
+class Job:
+    """A registered result: how to compute it, what it reads, and its run statistics"""
+
+    def __init__(self, name, func, tables, interval):
+        self.name = name
+        self.func = func
+        self.tables = tables
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.runs = self.failures = 0
+        self.total_seconds = self.max_seconds = 0.0
+        self.last_error = None
+
+
+class Scheduler:
+    """Keeps one Snapshot per registered job up to date"""
+
+    def __init__(self, engine, interval=PRECOMPUTE_INTERVAL, poll=PRECOMPUTE_POLL):
+        self.engine = engine
+        self.interval = interval
+        self.poll = poll
+        self.jobs = {}
+        self.versions = {}
+        self.background = False
+        self.stopped = threading.Event()
+
+    def register(self, name, func, tables=None, interval=None):
+        """Add a job; `tables` defaults to the tables of a querycache-decorated `func`"""
+        tables = tuple(tables if tables is not None else func.cache.tables)
+        self.jobs[name] = Job(name, func, tables, interval or self.interval)
+
+    def job_versions(self, job):
+        return tuple(self.versions.get(t) for t in job.tables)
+
+    def is_stale(self, job):
+        """The snapshot predates a change to one of the job's tables"""
+        return job.snapshot is not None and job.snapshot.versions != self.job_versions(job)
+
+    def is_due(self, job):
+        return (job.snapshot is None or self.is_stale(job)
+                or job.snapshot.age() >= job.interval)
+
+    def refresh_versions(self):
+        self.versions = table_versions(self.engine)
+        # Drop query-cache entries for the changed tables so jobs read fresh data
+        refresh_from_change_log(self.engine)
+
+    def run(self, job):
+        """Compute and publish `job`'s snapshot (one run at a time per job; skipped if no longer due)"""
+        with job.lock:
+            # A concurrent reader or scheduler pass may have just published it
+            if not self.is_due(job):
+                return job.snapshot
+            versions = self.job_versions(job)
+            start = time.perf_counter()
+            try:
+                value = job.func()
+            except Exception as e:
+                job.failures += 1
+                job.last_error = str(e)
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                job.runs += 1
+                job.total_seconds += seconds
+                job.max_seconds = max(job.max_seconds, seconds)
+            job.last_error = None
+            # Versions read before the run: a change during it leaves the snapshot stale
+            job.snapshot = Snapshot(job.name, _freeze(value), time.time(), versions, seconds)
+            return job.snapshot
+
+    def run_pending(self):
+        """One scheduler pass: rerun every job whose tables changed or whose interval elapsed"""
+        self.refresh_versions()
+        ran = []
+        for job in self.jobs.values():
+            if self.is_due(job):
+                try:
+                    self.run(job)
+                except Exception:
+                    continue  # Counted in the job's failures; the previous snapshot stays published
+                ran.append(job.name)
+        return ran
+
+    def read(self, name):
+        """Latest snapshot of `name`, computing it here if none has been published yet.
+
+        Without the background thread, a stale or expired snapshot is also
+        recomputed here.
+        """
+        job = self.jobs[name]
+        if not self.background:
+            self.refresh_versions()
+        # No lock: a refresh in progress must not block readers of the previous snapshot
+        snapshot = job.snapshot
+        if snapshot is None or (not self.background and self.is_due(job)):
+            if not self.versions:
+                self.refresh_versions()
+            snapshot = self.run(job)
+        return snapshot
+
+    def run_forever(self):
+        # Wait one poll first: at server start the first page paints before the thread competes
+        # for the CPU, and that page computes only the results it reads
+        while not self.stopped.wait(self.poll):
+            try:
+                self.run_pending()
+            except Exception:
+                pass  # e.g. the database is locked by a bulk load; retry on the next poll
+
+    def stop(self):
+        self.stopped.set()
+
+
+def start_background_scheduler(scheduler):
+    """Run `scheduler` on a daemon thread (no-op when FWMS_PRECOMPUTE=0)"""
+    if PRECOMPUTE_ENABLED:
+        scheduler.background = True
+        threading.Thread(target=scheduler.run_forever, name="fwms-precompute", daemon=True).start()
+    return scheduler
+
+
+def format_staleness(scheduler, name):
+    """e.g. "Updated 12s ago" or "Updated 3m ago, refreshing after a change" """
+    job = scheduler.jobs[name]
+    if job.snapshot is None:
+        return "Not computed yet"
+    age = job.snapshot.age()
+    message = f"Updated {age:.0f}s ago" if age < 120 else f"Updated {age / 60:.0f}m ago"
+    if scheduler.is_stale(job):
+        message += ", refreshing after a change"
+    return message
+
+
+def job_metrics(scheduler):
+    """Runs, failures, runtimes and snapshot age per job"""
+    rows = [{
+        'job': job.name,
+        'tables': ", ".join(job.tables),
+        'runs': job.runs,
+        'failures': job.failures,
+        'last_seconds': job.snapshot.seconds if job.snapshot else None,
+        'avg_seconds': job.total_seconds / job.runs if job.runs else None,
+        'max_seconds': job.max_seconds if job.runs else None,
+        'age_seconds': job.snapshot.age() if job.snapshot else None,
+        'stale': scheduler.is_stale(job),
+        'last_error': job.last_error,
+    } for job in scheduler.jobs.values()]
+    return pd.DataFrame(rows, columns=['job', 'tables', 'runs', 'failures', 'last_seconds', 'avg_seconds',
+                                       'max_seconds', 'age_seconds', 'stale', 'last_error'])
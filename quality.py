@@ -0,0 +1,195 @@
+"""Vectorized data-quality and cleaning stage run at ingest.
+
+Ports the notebook's ``check_nulls`` / ``check_duplicates`` /
+``check_formatting`` checks and its ``title_case`` / ``lower_case``
+cleaners. Cleaners use ``.str`` methods (on the categories only, for
+categorical columns) instead of per-cell ``.apply``; checks are boolean
+masks. Rows failing any check are split off with their reasons and stored
+in the ``quarantine`` table instead of being loaded.
+"""
+import hashlib
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from schema import ENTITY_SCHEMAS
+
+QUARANTINE_TABLE = "quarantine"
+
+CLEANERS = {
+    'strip': lambda s: s.str.strip(),
+    'title': lambda s: s.str.strip().str.title(),
+    'lower': lambda s: s.str.strip().str.lower(),
+}
+
+# entity -> {'clean': {column: cleaner}, 'not_null': columns that must be present}
+QUALITY_RULES = {
+    'providers': {
+        'clean': {'name': 'title', 'type': 'title', 'address': 'strip', 'city': 'title', 'contact': 'strip'},
+        'not_null': ('name', 'type', 'city', 'contact'),
+    },
+    'receivers': {
+        'clean': {'name': 'title', 'type': 'title', 'city': 'title', 'contact': 'strip'},
+        'not_null': ('name', 'type', 'city', 'contact'),
+    },
+    'food_listings': {
+        'clean': {
+            'food_name': 'title', 'provider_type': 'title', 'location': 'title',
+            'food_type': 'title', 'meal_type': 'title',
+        },
+        'not_null': ('food_name', 'quantity', 'expiry_date', 'provider_id'),
+    },
+    'claims': {
+        'clean': {'status': 'title'},
+        'not_null': ('food_id', 'receiver_id', 'status', 'timestamp'),
+    },
+}
+
+
+def clean_column(series, cleaner):
+    """Apply a named cleaner; categoricals are cleaned once per category"""
+    fn = CLEANERS[cleaner]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cleaned = pd.Index(fn(series.cat.categories.astype('string').to_series()))
+        categories = cleaned.unique()
+        codes = categories.get_indexer(cleaned).take(series.cat.codes.to_numpy(), mode='clip')
+        codes[series.cat.codes.to_numpy() == -1] = -1
+        return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name)
+    if pd.api.types.is_string_dtype(series.dtype):
+        return fn(series.astype('string'))
+    return series
+
+
+def duplicate_rows(df, key):
+    """df.duplicated(), evaluated only where the key repeats or is missing"""
+    if key not in df.columns:
+        return df.duplicated()
+    candidates = (df[key].duplicated(keep=False) | df[key].isna()).to_numpy()
+    mask = np.zeros(len(df), dtype=bool)
+    if candidates.any():
+        mask[candidates] = df[candidates].duplicated().to_numpy()
+    return pd.Series(mask, index=df.index)
+
+
+def _checks(df, entity):
+    """(rule, fn(df) -> failing-row mask) in evaluation order"""
+    schema = ENTITY_SCHEMAS[entity]
+    key = schema['key']
+    checks = [
+        (f"missing_{col}", lambda df, col=col: df[col].isna())
+        for col in QUALITY_RULES[entity]['not_null'] if col in df.columns
+    ]
+    checks.append(('duplicate_row', lambda df: duplicate_rows(df, key)))
+    if key in df.columns:
+        checks.append(('duplicate_key', lambda df: df[key].notna() & df.duplicated(subset=key)))
+    checks.extend(
+        (rule, lambda df, check=check: ~check(df))
+        for rule, check in schema['validators'].items()
+    )
+    return checks
+
+
+def clean_and_validate(df, entity):
+    """Clean `df` and split off failing rows.
+
+    Returns (clean_df, rejected_df, report). rejected_df carries a 'reasons'
+    column; report has per-rule {'rows', 'seconds'} under 'rules' and the
+    cleaning time per column under 'cleaned'.
+    """
+    report = {'rows': len(df), 'cleaned': {}, 'rules': {}}
+    start = time.perf_counter()
+    cleaned = {}
+    for col, cleaner in QUALITY_RULES[entity]['clean'].items():
+        if col in df.columns:
+            t0 = time.perf_counter()
+            cleaned[col] = clean_column(df[col], cleaner)
+            report['cleaned'][col] = time.perf_counter() - t0
+    if cleaned:
+        df = df.assign(**cleaned)
+
+    failures = {}
+    for rule, check in _checks(df, entity):
+        t0 = time.perf_counter()
+        try:
+            mask = check(df).to_numpy(dtype=bool, na_value=False)
+        except KeyError:
+            continue  # the column this rule checks is not in the source
+        report['rules'][rule] = {'rows': int(mask.sum()), 'seconds': time.perf_counter() - t0}
+        if mask.any():
+            failures[rule] = mask
+
+    failed = pd.Series(False, index=df.index)
+    for mask in failures.values():
+        failed |= mask
+    rejected = df[failed.to_numpy()].copy()
+    if not rejected.empty:
+        positions = failed.to_numpy().nonzero()[0]
+        reasons = [[] for _ in positions]
+        for rule, mask in failures.items():
+            for i, hit in enumerate(mask[positions]):
+                if hit:
+                    reasons[i].append(rule)
+        rejected['reasons'] = ["; ".join(r) for r in reasons]
+    report['quarantined'] = len(rejected)
+    report['seconds'] = time.perf_counter() - start
+    return df[~failed.to_numpy()], rejected, report
+
+
+def ensure_quarantine_table(conn):
+    conn.execute(text(f"""
+    CREATE TABLE IF NOT EXISTS {QUARANTINE_TABLE} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name VARCHAR NOT NULL,
+        pk VARCHAR,
+        reasons VARCHAR NOT NULL,
+        row_json VARCHAR NOT NULL,
+        row_hash VARCHAR NOT NULL,
+        quarantined_at DATETIME NOT NULL
+    )
+    """))
+    conn.execute(text(f"""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_{QUARANTINE_TABLE}_row
+    ON {QUARANTINE_TABLE} (table_name, row_hash)
+    """))
+
+
+def quarantine_rows(engine, entity, rejected):
+    """Store rejected rows with their reasons; re-ingesting the same row is a no-op"""
+    if rejected.empty:
+        return 0
+    key = ENTITY_SCHEMAS[entity]['key']
+    rows = rejected.drop(columns='reasons')
+    payloads = rows.to_json(orient='records', lines=True, date_format='iso').splitlines()
+    pks = rows[key].astype('string') if key in rows.columns else pd.Series(pd.NA, index=rows.index)
+    now = datetime.now()
+    records = [
+        {
+            "table": entity, "pk": None if pd.isna(pk) else pk, "reasons": reasons, "row_json": payload,
+            "row_hash": hashlib.blake2b(f"{reasons}|{payload}".encode(), digest_size=16).hexdigest(),
+            "now": now,
+        }
+        for pk, reasons, payload in zip(pks, rejected['reasons'], payloads)
+    ]
+    with engine.begin() as conn:
+        ensure_quarantine_table(conn)
+        conn.execute(
+            text(f"""
+            INSERT OR IGNORE INTO {QUARANTINE_TABLE}
+                (table_name, pk, reasons, row_json, row_hash, quarantined_at)
+            VALUES (:table, :pk, :reasons, :row_json, :row_hash, :now)
+            """),
+            records,
+        )
+    return len(records)
+
+
+def format_quality_report(report):
+    """One-line summary: quarantined rows by rule"""
+    failing = {rule: r['rows'] for rule, r in report['rules'].items() if r['rows']}
+    if not failing:
+        return f"quality checks passed in {report['seconds']:.2f}s"
+    return (f"{report['quarantined']:,} quarantined in {report['seconds']:.2f}s ("
+            + ", ".join(f"{rule} {n}" for rule, n in failing.items()) + ")")
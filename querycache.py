@@ -0,0 +1,276 @@
+"""Query result cache with per-table invalidation.
+
+Each cached function names the tables it reads; a write invalidates only the
+entries that depend on the written table, instead of ``st.cache_data.clear()``
+dropping every cache in the process:
+
+    @cached('food_listings', 'claims')
+    def get_claims_per_food_item(as_of=None): ...
+
+    refresh_from_change_log(engine, 'receivers')   # after an insert into receivers
+
+``cached_figures`` does the same for chart builders returning
+``{name: figure}``: the finished figures are kept as Plotly JSON (bounded by
+``FWMS_FIGURE_CACHE_MB``), so a rerun skips both the queries and the figure
+build.
+
+``refresh_from_change_log`` also picks up writes from other processes
+(sync.py, watcher.py, archive.py) by comparing the change log's latest
+sequence per table with the last one seen. ``cache_stats`` reports hits,
+misses and invalidations per function.
+
+The caches are process-wide, so every Streamlit session shares them, and a
+miss is single-flight: when many sessions ask for the same (function,
+arguments, table versions) at once, one computes it and the rest wait for
+its result (counted as ``coalesced``).
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from changelog import table_versions
+from urgency import as_of_date
+
+FIGURE_CACHE_BYTES = int(float(os.environ.get("FWMS_FIGURE_CACHE_MB", "32")) * 1024 * 1024)
+
+_lock = threading.RLock()
+_generations = {}
+_registry = {}
+_seen_versions = {}
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.stored = self.value = self.error = None
+        self.cached = self.abandoned = False
+
+
+class TableCache:
+    """LRU cache of one function's results, keyed by arguments and table generations"""
+
+    def __init__(self, func, tables, maxsize=64, ttl=None):
+        self.func = func
+        self.tables = tables
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.hits = self.misses = self.invalidated = self.coalesced = 0
+        signature = inspect.signature(func)
+        self.signature = signature if 'as_of' in signature.parameters else None
+
+    def key(self, args, kwargs):
+        if self.signature is not None:
+            bound = self.signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            # "now" queries are cached per day, like the as_of date baked into their SQL
+            if bound.arguments['as_of'] is None:
+                bound.arguments['as_of'] = as_of_date()
+            return tuple(bound.arguments.items())
+        return args, tuple(sorted(kwargs.items()))
+
+    def encode(self, value):
+        return value
+
+    def decode(self, stored):
+        return stored.copy() if isinstance(stored, pd.DataFrame) else stored
+
+    def cacheable(self, value):
+        return True
+
+    def size(self):
+        return None
+
+    def _add(self, key, entry):
+        self.entries[key] = entry
+
+    def _remove(self, key):
+        del self.entries[key]
+
+    def _trim(self):
+        while len(self.entries) > self.maxsize:
+            self._remove(next(iter(self.entries)))
+
+    def __call__(self, *args, **kwargs):
+        key = self.key(args, kwargs)
+        while True:
+            with _lock:
+                generations = tuple(_generations.get(t, 0) for t in self.tables)
+                entry = self.entries.get(key)
+                if entry is not None:
+                    stored_generations, stored_at, stored = entry
+                    if stored_generations == generations and (self.ttl is None or time.monotonic() - stored_at < self.ttl):
+                        self.hits += 1
+                        self.entries.move_to_end(key)
+                        return self.decode(stored)
+                    self._remove(key)
+                flight = self.in_flight.get((key, generations))
+                if flight is None:
+                    flight = self.in_flight[(key, generations)] = _Flight()
+                    self.misses += 1
+                    break
+                self.coalesced += 1
+            # Someone else is computing this result: wait for theirs instead of running the query again
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if not flight.abandoned:
+                return self.decode(flight.stored) if flight.cached else flight.value
+            # Their run was stopped (e.g. a Streamlit rerun), not failed: compute it here
+        try:
+            value = self.func(*args, **kwargs)
+            if self.cacheable(value):
+                flight.stored, flight.cached = self.encode(value), True
+            else:
+                flight.value = value
+        except Exception as e:
+            flight.error = e
+            raise
+        except BaseException:
+            flight.abandoned = True
+            raise
+        finally:
+            with _lock:
+                del self.in_flight[(key, generations)]
+                if flight.cached:
+                    # Generations read before the call: a write during it leaves this entry stale
+                    if key in self.entries:
+                        self._remove(key)
+                    self._add(key, (generations, time.monotonic(), flight.stored))
+                    self._trim()
+            flight.done.set()
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def drop(self):
+        with _lock:
+            self.invalidated += len(self.entries)
+            for key in list(self.entries):
+                self._remove(key)
+
+
+class FigureCache(TableCache):
+    """Caches a dict of Plotly figures as JSON, bounded by total JSON size.
+
+    A hit rebuilds each figure from its JSON without re-validating it, which
+    skips both the queries and the figure construction / styling.
+    """
+
+    def __init__(self, func, tables, max_bytes=FIGURE_CACHE_BYTES, ttl=None):
+        super().__init__(func, tables, maxsize=None, ttl=ttl)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+
+    def encode(self, figures):
+        import plotly.graph_objects as go
+        return {name: fig.to_json() if isinstance(fig, go.Figure) else fig for name, fig in figures.items()}
+
+    def decode(self, stored):
+        # Imported here so the query layer (lookup, watcher, CLIs) loads without plotly
+        import plotly.graph_objects as go
+        # The JSON came from a validated figure, so skip plotly's (slow) validation
+        return {name: go.Figure(json.loads(spec), _validate=False) if isinstance(spec, str) else spec
+                for name, spec in stored.items()}
+
+    def cacheable(self, figures):
+        return 'error' not in figures
+
+    def size(self):
+        return self.bytes
+
+    @staticmethod
+    def _entry_bytes(entry):
+        return sum(len(spec) for spec in entry[2].values() if isinstance(spec, str))
+
+    def _add(self, key, entry):
+        self.entries[key] = entry
+        self.bytes += self._entry_bytes(entry)
+
+    def _remove(self, key):
+        self.bytes -= self._entry_bytes(self.entries.pop(key))
+
+    def _trim(self):
+        # Keep the newest entry even if it alone exceeds the budget
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            self._remove(next(iter(self.entries)))
+
+
+def _decorator(cache_class, tables, **options):
+    def decorator(func):
+        # Streamlit re-executes the script on every rerun; keep the entries of the first definition
+        cache = _registry.get(func.__qualname__)
+        if cache is None or cache.tables != tables or type(cache) is not cache_class:
+            cache = _registry[func.__qualname__] = cache_class(func, tables, **options)
+        cache.func = func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache(*args, **kwargs)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cached(*tables, maxsize=64, ttl=None):
+    """Cache a function's results until one of `tables` is written"""
+    return _decorator(TableCache, tables, maxsize=maxsize, ttl=ttl)
+
+
+def cached_figures(*tables, max_bytes=FIGURE_CACHE_BYTES, ttl=None):
+    """Cache a function returning {name: figure} as JSON until one of `tables` is written"""
+    return _decorator(FigureCache, tables, max_bytes=max_bytes, ttl=ttl)
+
+
+def invalidate(*tables):
+    """Drop cached results that depend on any of `tables`"""
+    with _lock:
+        for table in tables:
+            _generations[table] = _generations.get(table, 0) + 1
+        for cache in _registry.values():
+            if set(cache.tables) & set(tables):
+                cache.drop()
+
+
+def refresh_from_change_log(engine, *written):
+    """Invalidate tables changed (by any process) since the previous call; returns them.
+
+    Tables in `written` (just written by the caller) are invalidated even when
+    the change log has no triggers on them yet.
+    """
+    versions = table_versions(engine)
+    with _lock:
+        changed = [t for t, seq in versions.items() if t in _seen_versions and _seen_versions[t] != seq]
+        changed += [t for t in written if t not in changed]
+        _seen_versions.update(versions)
+    if changed:
+        invalidate(*changed)
+    return changed
+
+
+def cache_stats():
+    """Hits, misses, hit rate, coalesced waits and invalidations per cached function"""
+    with _lock:
+        rows = [{
+            'function': name,
+            'tables': ", ".join(cache.tables),
+            'entries': len(cache.entries),
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'hit_rate': cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else None,
+            'coalesced': cache.coalesced,
+            'invalidated': cache.invalidated,
+            'bytes': cache.size(),
+        } for name, cache in _registry.items()]
+    return pd.DataFrame(
+        rows,
+        columns=['function', 'tables', 'entries', 'hits', 'misses', 'hit_rate', 'coalesced', 'invalidated', 'bytes']
+    )
@@ -0,0 +1,160 @@
+"""Declarative per-entity schemas: column aliases, dtypes, defaults, validators.
+
+Every path that turns source rows into table rows (seed CSVs, the bulk/
+incremental ``sync.py`` CLI) goes through ``apply_schema``, which resolves
+aliases to canonical names with a single rename, adds missing required
+columns in one step and converts only the columns whose dtype differs in
+one ``astype`` call. Columns the schema does not know are passed through
+unchanged. An entity may also list ``derived`` hooks that compute extra
+columns (e.g. structured address parts) from the mapped frame.
+"""
+import numpy as np
+import pandas as pd
+
+from addresses import address_parts
+
+
+def row_number(df):
+    """Default for a missing primary key: 1..n"""
+    return pd.RangeIndex(1, len(df) + 1)
+
+
+def known_values(series, allowed):
+    """Mask of values that are missing or case-insensitively in `allowed`
+    (checked once per category for categoricals)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        ok = np.append(series.cat.categories.astype('string').str.lower().isin(allowed), True)
+        return pd.Series(ok[series.cat.codes.to_numpy()], index=series.index)
+    return series.isna() | series.astype('string').str.lower().isin(allowed)
+
+
+# entity -> {'key', 'columns': {canonical: spec}, 'derived': (fn(df) -> {column: values}, ...),
+#            'validators': {rule: fn(df) -> valid mask}}
+# Column spec: aliases (source headers, first match wins), dtype, required, default
+ENTITY_SCHEMAS = {
+    'providers': {
+        'key': 'provider_id',
+        'columns': {
+            'provider_id': {'aliases': ('Provider_ID', 'ID'), 'dtype': 'Int64', 'required': True, 'default': row_number},
+            'name': {'aliases': ('Name', 'Provider_Name'), 'dtype': 'string', 'required': True, 'default': 'N/A'},
+            'type': {'aliases': ('Type', 'Provider_Type'), 'dtype': 'category', 'required': True, 'default': 'N/A'},
+            'address': {'aliases': ('Address',), 'dtype': 'string'},
+            'city': {'aliases': ('City', 'Location'), 'dtype': 'category', 'required': True, 'default': 'N/A'},
+            'contact': {'aliases': ('Contact', 'Phone', 'Email'), 'dtype': 'string', 'required': True, 'default': 'N/A'},
+            # Derived from address
+            'street': {'aliases': (), 'dtype': 'string'},
+            'address_city': {'aliases': (), 'dtype': 'category'},
+            'state': {'aliases': (), 'dtype': 'category'},
+            'postal_code': {'aliases': (), 'dtype': 'string'},
+        },
+        'derived': (address_parts,),
+        'validators': {
+            'provider_id_present': lambda df: df['provider_id'].notna(),
+        },
+    },
+    'receivers': {
+        'key': 'receiver_id',
+        'columns': {
+            'receiver_id': {'aliases': ('Receiver_ID', 'ID'), 'dtype': 'Int64', 'required': True, 'default': row_number},
+            'name': {'aliases': ('Name', 'Receiver_Name'), 'dtype': 'string', 'required': True, 'default': 'N/A'},
+            'type': {'aliases': ('Type', 'Receiver_Type'), 'dtype': 'category', 'required': True, 'default': 'N/A'},
+            'city': {'aliases': ('City', 'Location'), 'dtype': 'category', 'required': True, 'default': 'N/A'},
+            'contact': {'aliases': ('Contact', 'Phone', 'Email'), 'dtype': 'string', 'required': True, 'default': 'N/A'},
+        },
+        'validators': {
+            'receiver_id_present': lambda df: df['receiver_id'].notna(),
+        },
+    },
+    'food_listings': {
+        'key': 'food_id',
+        'columns': {
+            'food_id': {'aliases': ('Food_ID', 'ID'), 'dtype': 'Int64', 'required': True, 'default': row_number},
+            'food_name': {'aliases': ('Food_Name', 'Name'), 'dtype': 'category'},
+            'quantity': {'aliases': ('Quantity', 'Amount'), 'dtype': 'Int64'},
+            'expiry_date': {'aliases': ('Expiry_Date', 'Expiration'), 'dtype': 'datetime64[ns]'},
+            'provider_id': {'aliases': ('Provider_ID',), 'dtype': 'Int64'},
+            'provider_type': {'aliases': ('Provider_Type',), 'dtype': 'category'},
+            'location': {'aliases': ('Location', 'City'), 'dtype': 'category'},
+            'food_type': {'aliases': ('Food_Type', 'Type'), 'dtype': 'category'},
+            'meal_type': {'aliases': ('Meal_Type', 'Meal'), 'dtype': 'category'},
+        },
+        'validators': {
+            'food_id_present': lambda df: df['food_id'].notna(),
+            'quantity_non_negative': lambda df: ~(df['quantity'] < 0).fillna(False),
+        },
+    },
+    'claims': {
+        'key': 'claim_id',
+        'columns': {
+            'claim_id': {'aliases': ('Claim_ID', 'ID'), 'dtype': 'Int64', 'required': True, 'default': row_number},
+            'food_id': {'aliases': ('Food_ID',), 'dtype': 'Int64'},
+            'receiver_id': {'aliases': ('Receiver_ID',), 'dtype': 'Int64'},
+            'status': {'aliases': ('Status',), 'dtype': 'category'},
+            'timestamp': {'aliases': ('Timestamp', 'Date', 'Created_At'), 'dtype': 'datetime64[ns]'},
+        },
+        'validators': {
+            'claim_id_present': lambda df: df['claim_id'].notna(),
+            'status_known': lambda df: known_values(df['status'], ['pending', 'completed', 'cancelled']),
+        },
+    },
+}
+
+
+def source_headers(columns, entity):
+    """{canonical name: source header} for the columns this entity's schema finds (first match wins)"""
+    present = set(columns)
+    found, used = {}, set()
+    for canonical, spec in ENTITY_SCHEMAS[entity]['columns'].items():
+        for source in (canonical, *spec['aliases']):
+            if source in present and source not in used:
+                found[canonical] = source
+                used.add(source)
+                break
+    return found
+
+
+def resolve_columns(columns, entity):
+    """{source header: canonical name} for the headers this entity's schema knows"""
+    return {source: canonical for canonical, source in source_headers(columns, entity).items() if source != canonical}
+
+
+def apply_schema(df, entity):
+    """Canonical names, required columns and declared dtypes for one entity.
+
+    Returns (df, report) with report = {'renamed', 'filled', 'converted',
+    'invalid': {rule: failing rows}}. Validators only count here; callers
+    decide what to do with the failing rows.
+    """
+    schema = ENTITY_SCHEMAS[entity]
+    columns = schema['columns']
+    mapping = resolve_columns(df.columns, entity)
+    df = df.rename(columns=mapping)
+
+    missing = [name for name, spec in columns.items() if spec.get('required') and name not in df.columns]
+    if missing:
+        fills = {}
+        for name in missing:
+            default = columns[name].get('default')
+            fills[name] = default(df) if callable(default) else default
+        df = df.assign(**fills)
+
+    for derive in schema.get('derived', ()):
+        derived = derive(df)
+        if derived:
+            df = df.assign(**derived)
+
+    conversions = {
+        name: spec['dtype'] for name, spec in columns.items()
+        if name in df.columns and str(df[name].dtype) != spec['dtype']
+    }
+    if conversions:
+        df = df.astype(conversions)
+
+    invalid = {}
+    for rule, check in schema['validators'].items():
+        try:
+            invalid[rule] = int((~check(df)).sum())
+        except KeyError:
+            continue  # the column this rule checks is not in the source
+    report = {'renamed': mapping, 'filled': missing, 'converted': sorted(conversions), 'invalid': invalid}
+    return df, report
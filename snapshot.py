@@ -0,0 +1,135 @@
+"""Columnar snapshots of the ingested seed tables for fast cold starts.
+
+The first load of a CSV goes through the typed reader in ``ingest.py`` and
+the resulting table is written as an uncompressed Arrow/Feather file named
+after a hash of the source bytes (and the column spec). Later startups find
+the snapshot for the same hash and memory-map it instead of parsing text;
+editing the CSV changes the hash, so a stale snapshot is never read.
+
+    python snapshot.py                 # build/refresh snapshots for all tables
+    python snapshot.py --clear claims  # drop a table's snapshots
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+
+from ingest import CSV_SPECS, format_report, read_csv_typed
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = feather = None
+
+SNAPSHOT_DIR = os.environ.get("FWMS_SNAPSHOT_DIR", ".snapshots")
+SNAPSHOT_VERSION = 2
+REPORT_KEY = b"fwms.report"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def source_hash(path, spec):
+    """Hash of the source file contents plus the spec used to type it"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{SNAPSHOT_VERSION}:{sorted(spec['dtype'].items())}:{sorted(spec['dates'].items())}".encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_path(table, digest, snapshot_dir=None):
+    return os.path.join(snapshot_dir or SNAPSHOT_DIR, f"{table}-{digest}.feather")
+
+
+def _remove_stale(table, keep, snapshot_dir):
+    for path in glob.glob(os.path.join(snapshot_dir, f"{table}-*.feather")):
+        if path != keep:
+            os.remove(path)
+
+
+def write_snapshot(df, report, path):
+    """Write df (with its load report as metadata) atomically to `path`"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+    saved = {k: report[k] for k in ("rows", "rejected", "invalid_by_column") if k in report}
+    metadata = dict(arrow_table.schema.metadata or {})
+    metadata[REPORT_KEY] = json.dumps(saved).encode()
+    arrow_table = arrow_table.replace_schema_metadata(metadata)
+    tmp = f"{path}.tmp"
+    # Uncompressed so the file can be memory-mapped without a decode pass
+    feather.write_feather(arrow_table, tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def read_snapshot(path):
+    """Memory-map a snapshot; returns (DataFrame, saved report)"""
+    arrow_table = feather.read_table(path, memory_map=True)
+    saved = json.loads((arrow_table.schema.metadata or {}).get(REPORT_KEY, b"{}"))
+    return arrow_table.to_pandas(), saved
+
+
+def load_table(table, path=None, snapshot_dir=None):
+    """Typed DataFrame for a seed table, from its snapshot when one matches.
+
+    Returns (df, report) like ``read_csv_typed``; the report also carries
+    'source' ('snapshot' or 'csv') and 'source_hash'.
+    """
+    spec = CSV_SPECS[table]
+    path = path or spec["path"]
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    if feather is None:
+        df, report = read_csv_typed(table, path=path)
+        report["source"] = "csv"
+        return df, report
+
+    start = time.perf_counter()
+    digest = source_hash(path, spec)
+    target = snapshot_path(table, digest, snapshot_dir)
+    if os.path.exists(target):
+        try:
+            df, saved = read_snapshot(target)
+        except (OSError, pa.ArrowInvalid):
+            os.remove(target)
+        else:
+            report = {"table": table, "path": path, "rows": len(df), "rejected": 0, "invalid_by_column": {}}
+            report.update(saved)
+            report["seconds"] = time.perf_counter() - start
+            report["rows_per_second"] = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+            report.update(source="snapshot", source_hash=digest)
+            return df, report
+
+    df, report = read_csv_typed(table, path=path)
+    try:
+        write_snapshot(df, report, target)
+        _remove_stale(table, target, snapshot_dir)
+    except OSError:
+        pass  # read-only checkout: still serve the parsed CSV
+    report["seconds"] = time.perf_counter() - start
+    report.update(source="csv", source_hash=digest)
+    return df, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or clear columnar snapshots of the seed CSVs")
+    parser.add_argument("tables", nargs="*", help=f"Any of {', '.join(sorted(CSV_SPECS))} (default: all)")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="Snapshot directory")
+    parser.add_argument("--clear", action="store_true", help="Delete snapshots instead of building them")
+    args = parser.parse_args()
+    unknown = set(args.tables) - set(CSV_SPECS)
+    if unknown:
+        parser.error(f"unknown table(s): {', '.join(sorted(unknown))}")
+
+    for table in args.tables or sorted(CSV_SPECS):
+        if args.clear:
+            _remove_stale(table, None, args.dir)
+            print(f"🗑 {table}: snapshots removed")
+        elif os.path.exists(CSV_SPECS[table]["path"]):
+            _, report = load_table(table, snapshot_dir=args.dir)
+            print(f"📦 {table}: {format_report(report)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,85 @@
+"""The SQL query layer: every read the pages and precompute jobs make.
+
+``SQLQueries`` takes the engine it reads from, and imports neither Streamlit
+nor Plotly, so batch jobs and process-pool workers can use it headless:
+
+    queries = SQLQueries(create_engine('sqlite:///food_wastage.db'))
+    queries.get_items_expiring_next_3_days()
+
+A failing query raises ``QueryError`` instead of rendering a message; the
+app shows it (see ``views.render_page``). Results are cached per engine
+with ``querycache.cached`` until one of their tables is written.
+"""
 import pandas as pd
-import streamlit as st
-from datetime import datetime
+from sqlalchemy import text
+
+from addresses import location_filter
+from archive import table_source
+from querycache import cached
+from urgency import NOT_EXPIRED, sql_case, sql_condition, sql_date
+
+
+class QueryError(RuntimeError):
+    """A query failed; the message is ready to show to the user"""
+
 
 class SQLQueries:
     """Complete SQL queries covering all project requirements and additional analysis"""
-    
-    @staticmethod
-    def execute_query(query):
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    # Instances over the same engine share cache entries (Streamlit builds one per rerun)
+    def __eq__(self, other):
+        return type(other) is type(self) and other.engine is self.engine
+
+    def __hash__(self):
+        return hash((type(self), id(self.engine)))
+
+    def execute_query(self, query, params=None):
         """Execute SQL query and return results"""
         try:
-            with engine.connect() as conn:
-                result = pd.read_sql(query, conn)
+            with self.engine.connect() as conn:
+                if params:
+                    result = pd.read_sql(text(query), conn, params=params)
+                else:
+                    result = pd.read_sql(query, conn)
                 return result
         except Exception as e:
-            st.error(f"Query execution error: {e}")
-            return pd.DataFrame()
-
+            raise QueryError(f"Query execution error: {e}") from e
 
     @staticmethod
-    def get_items_expiring_next_3_days():
+    def date_range_filter(column, start_date=None, end_date=None):
+        """SQL condition and params limiting `column` to an optional date range"""
+        clauses, params = [], {}
+        if start_date is not None:
+            clauses.append(f"DATE({column}) >= DATE(:start_date)")
+            params['start_date'] = str(start_date)
+        if end_date is not None:
+            clauses.append(f"DATE({column}) <= DATE(:end_date)")
+            params['end_date'] = str(end_date)
+        condition = "".join(f" AND {clause}" for clause in clauses)
+        return condition, params
+
+
+    @cached('providers', 'food_listings')
+    def get_items_expiring_next_3_days(self, as_of=None):
         """14. Items expiring in the next 3 days with provider & city"""
-        query = """
+        due = sql_condition(('Critical', 'Urgent'), 'f.expiry_date', as_of)
+        query = f"""
         SELECT 
             f.food_id, f.food_name, f.quantity, f.expiry_date,
+            {sql_case('f.expiry_date', as_of)} AS urgency,
             p.provider_id, p.name AS provider_name, p.city
         FROM food_listings f
         JOIN providers p ON f.provider_id = p.provider_id
-        WHERE DATE(f.expiry_date) BETWEEN DATE('now') AND DATE('now','+3 days')
+        WHERE {due}
         ORDER BY f.expiry_date
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_provider_reliability_pct():
+    @cached('providers', 'food_listings', 'claims')
+    def get_provider_reliability_pct(self):
         """15. Provider reliability = % completed claims"""
         query = """
         SELECT 
@@ -46,25 +93,26 @@ class SQLQueries:
         GROUP BY p.provider_id
         ORDER BY reliability_pct DESC NULLS LAST, total_claims DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_food_type_wastage_pct():
+    @cached('food_listings')
+    def get_food_type_wastage_pct(self, as_of=None):
         """16. Wastage % by food_type"""
-        query = """
+        expired = sql_condition('Expired', 'f.expiry_date', as_of)
+        query = f"""
         SELECT 
             f.food_type,
             SUM(f.quantity) AS total_quantity,
-            SUM(CASE WHEN DATE(f.expiry_date) < DATE('now') THEN f.quantity ELSE 0 END) AS wasted_quantity,
-            ROUND(100.0 * SUM(CASE WHEN DATE(f.expiry_date) < DATE('now') THEN f.quantity ELSE 0 END) / NULLIF(SUM(f.quantity),0), 2) AS wastage_pct
+            SUM(CASE WHEN {expired} THEN f.quantity ELSE 0 END) AS wasted_quantity,
+            ROUND(100.0 * SUM(CASE WHEN {expired} THEN f.quantity ELSE 0 END) / NULLIF(SUM(f.quantity),0), 2) AS wastage_pct
         FROM food_listings f
         GROUP BY f.food_type
         ORDER BY wastage_pct DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_highest_demand_locations_by_claims():
+    @cached('providers', 'food_listings', 'claims')
+    def get_highest_demand_locations_by_claims(self):
         """20. Highest demand locations by claims (city)"""
         query = """
         SELECT 
@@ -77,10 +125,10 @@ class SQLQueries:
         ORDER BY total_claims DESC
         LIMIT 10
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_most_frequent_providers_contributions():
+    @cached('providers', 'food_listings')
+    def get_most_frequent_providers_contributions(self):
         """19. Most frequent providers & their contributions"""
         query = """
         SELECT 
@@ -93,11 +141,11 @@ class SQLQueries:
         ORDER BY total_listings DESC
         LIMIT 10
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
     # ========== REQUESTED QUERIES 1-15 ==========
-    @staticmethod
-    def get_providers_receivers_per_city():
+    @cached('providers', 'receivers')
+    def get_providers_receivers_per_city(self):
         """1. How many food providers and receivers are there in each city?"""
         query = """
         SELECT 
@@ -122,10 +170,10 @@ class SQLQueries:
         HAVING COUNT(DISTINCT p.provider_id) > 0 OR COUNT(DISTINCT r.receiver_id) > 0
         ORDER BY total_ecosystem_strength DESC, total_providers DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_provider_type_contributions():
+    @cached('providers', 'food_listings', 'claims')
+    def get_provider_type_contributions(self):
         """2. Which type of food provider contributes the most food?"""
         query = """
         SELECT 
@@ -153,16 +201,26 @@ class SQLQueries:
         HAVING COUNT(f.food_id) > 0
         ORDER BY total_quantity_contributed DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_provider_contacts_by_city(city_name=None):
-        """3. What is the contact information of food providers in a specific city?"""
+    @cached('providers', 'food_listings', 'claims')
+    def get_provider_contacts_by_city(self, city_name=None, as_of=None, state=None, postal_prefix=None):
+        """3. What is the contact information of food providers in a specific city?
+
+        `state` / `postal_prefix` filter on the indexed address columns.
+        """
+        conditions, params = [], {}
         if city_name:
-            where_clause = f"WHERE LOWER(p.city) = LOWER('{city_name}')"
-        else:
-            where_clause = ""
+            conditions.append("LOWER(p.city) = LOWER(:city_name)")
+            params['city_name'] = city_name
+        location, location_params = location_filter(state, postal_prefix)
+        if location:
+            conditions.append(location)
+            params.update(location_params)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
+        fresh = sql_condition(NOT_EXPIRED, 'f.expiry_date', as_of)
+        expired = sql_condition('Expired', 'f.expiry_date', as_of)
         query = f"""
         SELECT 
             p.provider_id,
@@ -171,19 +229,21 @@ class SQLQueries:
             p.city,
             p.contact,
             COALESCE(p.address, 'N/A') as address,
+            p.state,
+            p.postal_code,
             -- Activity metrics
             COUNT(f.food_id) as active_food_listings,
             SUM(f.quantity) as total_quantity_available,
             COUNT(DISTINCT f.food_type) as food_types_offered,
             -- Recent activity
-            COUNT(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN 1 END) as fresh_items_available,
-            COUNT(CASE WHEN DATE(f.expiry_date) < DATE('now') THEN 1 END) as expired_items,
+            COUNT(CASE WHEN {fresh} THEN 1 END) as fresh_items_available,
+            COUNT(CASE WHEN {expired} THEN 1 END) as expired_items,
             -- Claims received
             COUNT(c.claim_id) as claims_received,
             COUNT(CASE WHEN LOWER(c.status) = 'completed' THEN 1 END) as successful_claims,
             -- Status indicator
             CASE 
-                WHEN COUNT(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN 1 END) > 0 THEN '🟢 Active'
+                WHEN COUNT(CASE WHEN {fresh} THEN 1 END) > 0 THEN '🟢 Active'
                 WHEN COUNT(f.food_id) > 0 THEN '🟡 Has Listings'
                 ELSE '🔴 Inactive'
             END as status
@@ -191,15 +251,22 @@ class SQLQueries:
         LEFT JOIN food_listings f ON p.provider_id = f.provider_id
         LEFT JOIN claims c ON f.food_id = c.food_id
         {where_clause}
-        GROUP BY p.provider_id, p.name, p.type, p.city, p.contact, p.address
+        GROUP BY p.provider_id, p.name, p.type, p.city, p.contact, p.address, p.state, p.postal_code
         ORDER BY active_food_listings DESC, total_quantity_available DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query, params or None)
 
-    @staticmethod
-    def get_top_claiming_receivers():
+    @cached('providers')
+    def get_provider_states(self):
+        """Distinct provider states (read from the state index)"""
+        query = "SELECT DISTINCT state FROM providers WHERE state IS NOT NULL ORDER BY state"
+        return self.execute_query(query)
+
+    @cached('receivers', 'food_listings', 'claims')
+    def get_top_claiming_receivers(self, as_of=None):
         """4. Which receivers have claimed the most food?"""
-        query = """
+        today = sql_date(as_of)
+        query = f"""
         SELECT 
             r.receiver_id,
             r.name as receiver_name,
@@ -219,7 +286,7 @@ class SQLQueries:
             COUNT(DISTINCT CASE WHEN LOWER(c.status) = 'completed' THEN f.food_type END) as food_types_received,
             COUNT(DISTINCT CASE WHEN LOWER(c.status) = 'completed' THEN f.meal_type END) as meal_types_received,
             -- Recent activity (last 30 days)
-            COUNT(CASE WHEN DATE(c.timestamp) >= DATE('now', '-30 days') THEN 1 END) as recent_claims,
+            COUNT(CASE WHEN DATE(c.timestamp) >= DATE({today}, '-30 days') THEN 1 END) as recent_claims,
             -- Performance rating
             CASE 
                 WHEN COUNT(CASE WHEN LOWER(c.status) = 'completed' THEN 1 END) >= 20 
@@ -240,12 +307,16 @@ class SQLQueries:
         ORDER BY total_food_received DESC, total_claims_made DESC
         LIMIT 25
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_total_food_quantity_available():
+    @cached('providers', 'food_listings', 'claims')
+    def get_total_food_quantity_available(self, as_of=None):
         """5. What is the total quantity of food available from all providers?"""
-        query = """
+        fresh = sql_condition(NOT_EXPIRED, 'f.expiry_date', as_of)
+        expired = sql_condition('Expired', 'f.expiry_date', as_of)
+        critical = sql_condition('Critical', 'f.expiry_date', as_of)
+        soon = sql_condition(('Urgent', 'Soon'), 'f.expiry_date', as_of)
+        query = f"""
         SELECT 
             'System-Wide Food Availability' as metric_category,
             -- Overall availability
@@ -253,15 +324,15 @@ class SQLQueries:
             SUM(f.quantity) as total_quantity_available,
             AVG(f.quantity) as avg_quantity_per_item,
             -- By freshness
-            COUNT(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN 1 END) as fresh_items,
-            SUM(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN f.quantity ELSE 0 END) as fresh_quantity,
-            COUNT(CASE WHEN DATE(f.expiry_date) < DATE('now') THEN 1 END) as expired_items,
-            SUM(CASE WHEN DATE(f.expiry_date) < DATE('now') THEN f.quantity ELSE 0 END) as expired_quantity,
+            COUNT(CASE WHEN {fresh} THEN 1 END) as fresh_items,
+            SUM(CASE WHEN {fresh} THEN f.quantity ELSE 0 END) as fresh_quantity,
+            COUNT(CASE WHEN {expired} THEN 1 END) as expired_items,
+            SUM(CASE WHEN {expired} THEN f.quantity ELSE 0 END) as expired_quantity,
             -- By urgency
-            COUNT(CASE WHEN julianday(f.expiry_date) - julianday('now') <= 1 THEN 1 END) as urgent_items,
-            SUM(CASE WHEN julianday(f.expiry_date) - julianday('now') <= 1 THEN f.quantity ELSE 0 END) as urgent_quantity,
-            COUNT(CASE WHEN julianday(f.expiry_date) - julianday('now') BETWEEN 1 AND 7 THEN 1 END) as soon_expiring_items,
-            SUM(CASE WHEN julianday(f.expiry_date) - julianday('now') BETWEEN 1 AND 7 THEN f.quantity ELSE 0 END) as soon_expiring_quantity,
+            COUNT(CASE WHEN {critical} THEN 1 END) as urgent_items,
+            SUM(CASE WHEN {critical} THEN f.quantity ELSE 0 END) as urgent_quantity,
+            COUNT(CASE WHEN {soon} THEN 1 END) as soon_expiring_items,
+            SUM(CASE WHEN {soon} THEN f.quantity ELSE 0 END) as soon_expiring_quantity,
             -- Distribution metrics
             COUNT(DISTINCT p.provider_id) as contributing_providers,
             COUNT(DISTINCT p.city) as cities_covered,
@@ -278,12 +349,14 @@ class SQLQueries:
         LEFT JOIN providers p ON f.provider_id = p.provider_id
         LEFT JOIN claims c ON f.food_id = c.food_id
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_cities_by_food_listings():
+    @cached('providers', 'food_listings', 'claims')
+    def get_cities_by_food_listings(self, as_of=None):
         """6. Which city has the highest number of food listings?"""
-        query = """
+        fresh = sql_condition(NOT_EXPIRED, 'f.expiry_date', as_of)
+        expired = sql_condition('Expired', 'f.expiry_date', as_of)
+        query = f"""
         SELECT 
             p.city,
             COUNT(f.food_id) as total_food_listings,
@@ -296,9 +369,9 @@ class SQLQueries:
             COUNT(DISTINCT f.food_type) as food_types_available,
             COUNT(DISTINCT f.meal_type) as meal_types_available,
             -- Freshness analysis
-            COUNT(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN 1 END) as fresh_listings,
-            COUNT(CASE WHEN DATE(f.expiry_date) < DATE('now') THEN 1 END) as expired_listings,
-            ROUND(100.0 * COUNT(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN 1 END) / COUNT(f.food_id), 2) as freshness_rate,
+            COUNT(CASE WHEN {fresh} THEN 1 END) as fresh_listings,
+            COUNT(CASE WHEN {expired} THEN 1 END) as expired_listings,
+            ROUND(100.0 * COUNT(CASE WHEN {fresh} THEN 1 END) / COUNT(f.food_id), 2) as freshness_rate,
             -- Claims activity
             COUNT(c.claim_id) as total_claims,
             COUNT(CASE WHEN LOWER(c.status) = 'completed' THEN 1 END) as successful_claims,
@@ -319,20 +392,21 @@ class SQLQueries:
         ORDER BY total_food_listings DESC, total_quantity DESC
         LIMIT 20
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_most_common_food_types():
+    @cached('providers', 'food_listings', 'claims')
+    def get_most_common_food_types(self, as_of=None):
         """7. What are the most commonly available food types?"""
-        query = """
+        fresh = sql_condition(NOT_EXPIRED, 'f.expiry_date', as_of)
+        query = f"""
         SELECT 
             f.food_type,
             COUNT(f.food_id) as total_items,
             SUM(f.quantity) as total_quantity,
             AVG(f.quantity) as avg_quantity_per_item,
             -- Availability metrics
-            COUNT(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN 1 END) as available_items,
-            SUM(CASE WHEN DATE(f.expiry_date) >= DATE('now') THEN f.quantity ELSE 0 END) as available_quantity,
+            COUNT(CASE WHEN {fresh} THEN 1 END) as available_items,
+            SUM(CASE WHEN {fresh} THEN f.quantity ELSE 0 END) as available_quantity,
             -- Provider diversity
             COUNT(DISTINCT p.provider_id) as unique_providers,
             COUNT(DISTINCT p.type) as provider_types,
@@ -356,12 +430,14 @@ class SQLQueries:
         GROUP BY f.food_type
         ORDER BY total_items DESC, total_quantity DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_claims_per_food_item():
+    @cached('providers', 'food_listings', 'claims')
+    def get_claims_per_food_item(self, as_of=None):
         """8. How many food claims have been made for each food item?"""
-        query = """
+        expired = sql_condition('Expired', 'f.expiry_date', as_of)
+        critical = sql_condition('Critical', 'f.expiry_date', as_of)
+        query = f"""
         SELECT 
             f.food_id,
             f.food_name,
@@ -385,10 +461,10 @@ class SQLQueries:
             ROUND(CAST(COUNT(c.claim_id) AS FLOAT) / f.quantity, 2) as claims_per_unit,
             -- Status
             CASE 
-                WHEN DATE(f.expiry_date) < DATE('now') THEN '🔴 Expired'
+                WHEN {expired} THEN '🔴 Expired'
                 WHEN COUNT(CASE WHEN LOWER(c.status) = 'completed' THEN 1 END) > 0 THEN '🟢 Distributed'
                 WHEN COUNT(c.claim_id) > 0 THEN '🟡 Has Claims'
-                WHEN julianday(f.expiry_date) - julianday('now') <= 1 THEN '🟠 Urgent'
+                WHEN {critical} THEN '🟠 Urgent'
                 ELSE '⚪ Available'
             END as item_status
         FROM food_listings f 
@@ -397,12 +473,13 @@ class SQLQueries:
         GROUP BY f.food_id, f.food_name, f.food_type, f.meal_type, f.quantity, f.expiry_date, p.name, p.type, p.city
         ORDER BY total_claims DESC, f.food_id
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_provider_highest_successful_claims():
+    @cached('providers', 'food_listings', 'claims')
+    def get_provider_highest_successful_claims(self, as_of=None):
         """9. Which provider has had the highest number of successful food claims?"""
-        query = """
+        today = sql_date(as_of)
+        query = f"""
         SELECT 
             p.provider_id,
             p.name as provider_name,
@@ -428,7 +505,7 @@ class SQLQueries:
             -- Time efficiency
             ROUND(AVG(CASE WHEN LOWER(c.status) = 'completed' THEN julianday(f.expiry_date) - julianday(c.timestamp) END), 1) as avg_days_before_expiry_distributed,
             -- Recent performance (last 30 days)
-            COUNT(CASE WHEN DATE(c.timestamp) >= DATE('now', '-30 days') AND LOWER(c.status) = 'completed' THEN 1 END) as recent_successful_claims,
+            COUNT(CASE WHEN DATE(c.timestamp) >= DATE({today}, '-30 days') AND LOWER(c.status) = 'completed' THEN 1 END) as recent_successful_claims,
             -- Awards/Recognition
             CASE 
                 WHEN COUNT(CASE WHEN LOWER(c.status) = 'completed' THEN 1 END) >= 50 
@@ -452,12 +529,13 @@ class SQLQueries:
         ORDER BY successful_claims DESC, total_food_distributed DESC
         LIMIT 25
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_claims_completion_percentages():
+    @cached('providers', 'receivers', 'food_listings', 'claims')
+    def get_claims_completion_percentages(self, as_of=None):
         """10. What percentage of food claims are completed vs. pending vs. canceled?"""
-        query = """
+        today = sql_date(as_of)
+        query = f"""
         SELECT 
             c.status,
             COUNT(*) as claim_count,
@@ -473,12 +551,12 @@ class SQLQueries:
             COUNT(DISTINCT f.food_type) as food_types_in_status,
             COUNT(DISTINCT f.meal_type) as meal_types_in_status,
             -- Time analysis
-            ROUND(AVG(julianday('now') - julianday(c.timestamp)), 1) as avg_days_since_claim,
+            ROUND(AVG(julianday({today}) - julianday(c.timestamp)), 1) as avg_days_since_claim,
             ROUND(AVG(CASE WHEN LOWER(c.status) = 'completed' THEN julianday(f.expiry_date) - julianday(c.timestamp) END), 1) as avg_days_before_expiry_when_completed,
             -- Recent trends (last 30 days)
-            COUNT(CASE WHEN DATE(c.timestamp) >= DATE('now', '-30 days') THEN 1 END) as recent_claims,
-            ROUND(100.0 * COUNT(CASE WHEN DATE(c.timestamp) >= DATE('now', '-30 days') THEN 1 END) / 
-                  NULLIF((SELECT COUNT(*) FROM claims WHERE DATE(timestamp) >= DATE('now', '-30 days')), 0), 2) as recent_percentage,
+            COUNT(CASE WHEN DATE(c.timestamp) >= DATE({today}, '-30 days') THEN 1 END) as recent_claims,
+            ROUND(100.0 * COUNT(CASE WHEN DATE(c.timestamp) >= DATE({today}, '-30 days') THEN 1 END) / 
+                  NULLIF((SELECT COUNT(*) FROM claims WHERE DATE(timestamp) >= DATE({today}, '-30 days')), 0), 2) as recent_percentage,
             -- Impact calculation
             CASE c.status 
                 WHEN 'Completed' THEN SUM(f.quantity) 
@@ -498,12 +576,13 @@ class SQLQueries:
         GROUP BY c.status
         ORDER BY claim_count DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_avg_quantity_per_receiver():
+    @cached('providers', 'receivers', 'food_listings', 'claims')
+    def get_avg_quantity_per_receiver(self, as_of=None):
         """11. What is the average quantity of food claimed per receiver?"""
-        query = """
+        today = sql_date(as_of)
+        query = f"""
         SELECT 
             r.receiver_id,
             r.name as receiver_name,
@@ -525,8 +604,8 @@ class SQLQueries:
             -- Time analysis
             ROUND(AVG(CASE WHEN LOWER(c.status) = 'completed' THEN julianday(f.expiry_date) - julianday(c.timestamp) END), 1) as avg_days_before_expiry_received,
             -- Recent activity
-            COUNT(CASE WHEN DATE(c.timestamp) >= DATE('now', '-30 days') THEN 1 END) as recent_claims,
-            SUM(CASE WHEN DATE(c.timestamp) >= DATE('now', '-30 days') AND LOWER(c.status) = 'completed' THEN f.quantity ELSE 0 END) as recent_food_received,
+            COUNT(CASE WHEN DATE(c.timestamp) >= DATE({today}, '-30 days') THEN 1 END) as recent_claims,
+            SUM(CASE WHEN DATE(c.timestamp) >= DATE({today}, '-30 days') AND LOWER(c.status) = 'completed' THEN f.quantity ELSE 0 END) as recent_food_received,
             -- Receiver category based on activity
             CASE 
                 WHEN SUM(CASE WHEN LOWER(c.status) = 'completed' THEN f.quantity ELSE 0 END) >= 500 THEN '🏆 Major Recipient'
@@ -543,12 +622,13 @@ class SQLQueries:
         HAVING COUNT(c.claim_id) > 0
         ORDER BY total_food_received DESC, avg_quantity_per_successful_claim DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_most_claimed_meal_types():
+    @cached('providers', 'receivers', 'food_listings', 'claims')
+    def get_most_claimed_meal_types(self, as_of=None):
         """12. Which meal type is claimed the most?"""
-        query = """
+        today = sql_date(as_of)
+        query = f"""
         SELECT 
             f.meal_type,
             -- Claiming metrics
@@ -570,7 +650,7 @@ class SQLQueries:
             -- Food type diversity within meal type
             COUNT(DISTINCT f.food_type) as food_types_in_meal,
             -- Time analysis
-            ROUND(AVG(julianday(f.expiry_date) - julianday('now')), 1) as avg_shelf_life_days,
+            ROUND(AVG(julianday(f.expiry_date) - julianday({today})), 1) as avg_shelf_life_days,
             ROUND(AVG(CASE WHEN LOWER(c.status) = 'completed' THEN julianday(f.expiry_date) - julianday(c.timestamp) END), 1) as avg_days_before_expiry_claimed,
             -- Market share
             ROUND(100.0 * COUNT(c.claim_id) / (SELECT COUNT(*) FROM claims), 2) as claim_market_share,
@@ -578,7 +658,7 @@ class SQLQueries:
             ROW_NUMBER() OVER (ORDER BY COUNT(c.claim_id) DESC) as demand_rank,
             ROW_NUMBER() OVER (ORDER BY COUNT(CASE WHEN LOWER(c.status) = 'completed' THEN 1 END) DESC) as success_rank,
             -- Recent trends (last 30 days)
-            COUNT(CASE WHEN DATE(c.timestamp) >= DATE('now', '-30 days') THEN 1 END) as recent_claims,
+            COUNT(CASE WHEN DATE(c.timestamp) >= DATE({today}, '-30 days') THEN 1 END) as recent_claims,
             -- Meal time insights
             CASE f.meal_type 
                 WHEN 'Breakfast' THEN '🌅 Morning meals - typically fresh items needed'
@@ -595,12 +675,14 @@ class SQLQueries:
         GROUP BY f.meal_type
         ORDER BY total_claims DESC, successful_claims DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_total_donations_per_provider():
+    @cached('providers', 'receivers', 'food_listings', 'claims')
+    def get_total_donations_per_provider(self, as_of=None):
         """13. What is the total quantity of food donated by each provider?"""
-        query = """
+        expired = sql_condition('Expired', 'f.expiry_date', as_of)
+        today = sql_date(as_of)
+        query = f"""
         SELECT 
             p.provider_id,
             p.name as provider_name,
@@ -616,9 +698,9 @@ class SQLQueries:
             SUM(CASE WHEN LOWER(c.status) = 'completed' THEN f.quantity ELSE 0 END) as quantity_successfully_distributed,
             ROUND(100.0 * SUM(CASE WHEN LOWER(c.status) = 'completed' THEN f.quantity ELSE 0 END) / NULLIF(SUM(f.quantity), 0), 2) as distribution_success_rate,
             -- Wastage analysis
-            COUNT(CASE WHEN julianday('now') - julianday(f.expiry_date) > 0 THEN 1 END) as expired_items,
-            SUM(CASE WHEN julianday('now') - julianday(f.expiry_date) > 0 THEN f.quantity ELSE 0 END) as wasted_quantity,
-            ROUND(100.0 * SUM(CASE WHEN julianday('now') - julianday(f.expiry_date) > 0 THEN f.quantity ELSE 0 END) / NULLIF(SUM(f.quantity), 0), 2) as wastage_rate,
+            COUNT(CASE WHEN {expired} THEN 1 END) as expired_items,
+            SUM(CASE WHEN {expired} THEN f.quantity ELSE 0 END) as wasted_quantity,
+            ROUND(100.0 * SUM(CASE WHEN {expired} THEN f.quantity ELSE 0 END) / NULLIF(SUM(f.quantity), 0), 2) as wastage_rate,
             -- Food diversity
             COUNT(DISTINCT f.food_type) as food_types_donated,
             COUNT(DISTINCT f.meal_type) as meal_types_donated,
@@ -626,11 +708,11 @@ class SQLQueries:
             COUNT(DISTINCT r.receiver_id) as unique_receivers_served,
             COUNT(DISTINCT CASE WHEN LOWER(c.status) = 'completed' THEN r.receiver_id END) as receivers_successfully_served,
             -- Time efficiency
-            ROUND(AVG(julianday(f.expiry_date) - julianday('now')), 1) as avg_donation_shelf_life,
+            ROUND(AVG(julianday(f.expiry_date) - julianday({today})), 1) as avg_donation_shelf_life,
             ROUND(AVG(CASE WHEN LOWER(c.status) = 'completed' THEN julianday(f.expiry_date) - julianday(c.timestamp) END), 1) as avg_days_before_expiry_distributed,
             -- Recent activity (last 30 days)
-            COUNT(CASE WHEN DATE(f.expiry_date) >= DATE('now', '-30 days') THEN 1 END) as recent_donations,
-            SUM(CASE WHEN DATE(f.expiry_date) >= DATE('now', '-30 days') THEN f.quantity ELSE 0 END) as recent_donation_quantity,
+            COUNT(CASE WHEN DATE(f.expiry_date) >= DATE({today}, '-30 days') THEN 1 END) as recent_donations,
+            SUM(CASE WHEN DATE(f.expiry_date) >= DATE({today}, '-30 days') THEN f.quantity ELSE 0 END) as recent_donation_quantity,
             -- Provider impact score
             ROUND(
                 (SUM(CASE WHEN LOWER(c.status) = 'completed' THEN f.quantity ELSE 0 END) * 0.6) +
@@ -660,27 +742,32 @@ class SQLQueries:
         HAVING COUNT(f.food_id) > 0
         ORDER BY total_quantity_donated DESC, quantity_successfully_distributed DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_food_wastage_trends_comprehensive():
+    @cached('providers', 'food_listings', 'claims')
+    def get_food_wastage_trends_comprehensive(self, as_of=None):
         """14. Enhanced food wastage trends with all insights"""
-        query = """
+        expired = sql_condition('Expired', 'expiry_date', as_of)
+        critical = sql_condition('Critical', 'expiry_date', as_of)
+        urgent = sql_condition('Urgent', 'expiry_date', as_of)
+        soon = sql_condition('Soon', 'expiry_date', as_of)
+        safe = sql_condition('Normal', 'expiry_date', as_of)
+        query = f"""
         SELECT 
             food_type,
             COUNT(*) as total_listings,
             SUM(quantity) as total_quantity,
             AVG(quantity) as avg_quantity_per_listing,
             -- Wastage calculations
-            COUNT(CASE WHEN julianday('now') - julianday(expiry_date) > 0 THEN 1 END) as expired_items,
-            SUM(CASE WHEN julianday('now') - julianday(expiry_date) > 0 THEN quantity ELSE 0 END) as wasted_quantity,
-            ROUND(100.0 * COUNT(CASE WHEN julianday('now') - julianday(expiry_date) > 0 THEN 1 END) / COUNT(*), 2) as wastage_percentage,
-            ROUND(100.0 * SUM(CASE WHEN julianday('now') - julianday(expiry_date) > 0 THEN quantity ELSE 0 END) / SUM(quantity), 2) as quantity_wastage_percentage,
+            COUNT(CASE WHEN {expired} THEN 1 END) as expired_items,
+            SUM(CASE WHEN {expired} THEN quantity ELSE 0 END) as wasted_quantity,
+            ROUND(100.0 * COUNT(CASE WHEN {expired} THEN 1 END) / COUNT(*), 2) as wastage_percentage,
+            ROUND(100.0 * SUM(CASE WHEN {expired} THEN quantity ELSE 0 END) / SUM(quantity), 2) as quantity_wastage_percentage,
             -- Urgency analysis
-            COUNT(CASE WHEN julianday(expiry_date) - julianday('now') BETWEEN 0 AND 1 THEN 1 END) as critical_items,
-            COUNT(CASE WHEN julianday(expiry_date) - julianday('now') BETWEEN 1 AND 3 THEN 1 END) as urgent_items,
-            COUNT(CASE WHEN julianday(expiry_date) - julianday('now') BETWEEN 3 AND 7 THEN 1 END) as soon_items,
-            COUNT(CASE WHEN julianday(expiry_date) - julianday('now') > 7 THEN 1 END) as safe_items,
+            COUNT(CASE WHEN {critical} THEN 1 END) as critical_items,
+            COUNT(CASE WHEN {urgent} THEN 1 END) as urgent_items,
+            COUNT(CASE WHEN {soon} THEN 1 END) as soon_items,
+            COUNT(CASE WHEN {safe} THEN 1 END) as safe_items,
             -- Claims impact
             COUNT(c.claim_id) as total_claims,
             COUNT(CASE WHEN LOWER(c.status) = 'completed' THEN 1 END) as successful_distributions,
@@ -695,12 +782,13 @@ class SQLQueries:
         GROUP BY food_type
         ORDER BY wasted_quantity DESC, total_quantity DESC
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
-    @staticmethod
-    def get_comprehensive_system_analysis():
+    @cached('providers', 'receivers', 'food_listings', 'claims')
+    def get_comprehensive_system_analysis(self, as_of=None):
         """15. Comprehensive analysis with all outputs and insights"""
-        query = """
+        expired = sql_condition('Expired', 'f.expiry_date', as_of)
+        query = f"""
         WITH provider_stats AS (
             SELECT 
                 p.type as provider_type,
@@ -730,8 +818,8 @@ class SQLQueries:
                 f.food_type,
                 COUNT(f.food_id) as total_items,
                 SUM(f.quantity) as total_quantity,
-                COUNT(CASE WHEN julianday('now') - julianday(f.expiry_date) > 0 THEN 1 END) as wasted_items,
-                SUM(CASE WHEN julianday('now') - julianday(f.expiry_date) > 0 THEN f.quantity ELSE 0 END) as wasted_quantity
+                COUNT(CASE WHEN {expired} THEN 1 END) as wasted_items,
+                SUM(CASE WHEN {expired} THEN f.quantity ELSE 0 END) as wasted_quantity
             FROM food_listings f 
             GROUP BY f.food_type
         )
@@ -770,13 +858,16 @@ class SQLQueries:
             'Focus on ' || (SELECT food_type FROM food_stats ORDER BY wasted_quantity DESC LIMIT 1) || ' wastage reduction' as primary_action_needed,
             'Expand operations in ' || (SELECT city FROM city_stats ORDER BY (providers + receivers) ASC LIMIT 1) || ' for better coverage' as expansion_recommendation
         """
-        return SQLQueries.execute_query(query)
+        return self.execute_query(query)
 
     # ========== NEW: TIME SERIES ANALYSIS QUERIES ==========
-    @staticmethod
-    def get_time_series_claims_trends():
-        """NEW: Time series analysis of claims trends"""
-        query = """
+    @cached('food_listings', 'claims')
+    def get_time_series_claims_trends(self, start_date=None, end_date=None):
+        """NEW: Time series analysis of claims trends (archive is included when start_date reaches it)"""
+        claims_source = table_source(self.engine, 'claims', start_date)
+        listings_source = table_source(self.engine, 'food_listings', start_date)
+        date_filter, params = self.date_range_filter('c.timestamp', start_date, end_date)
+        query = f"""
         SELECT 
             DATE(c.timestamp) as claim_date,
             COUNT(*) as total_claims,
@@ -798,18 +889,21 @@ class SQLQueries:
             END as day_of_week,
             -- Month analysis
             strftime('%Y-%m', c.timestamp) as year_month
-        FROM claims c 
-        JOIN food_listings f ON c.food_id = f.food_id
-        WHERE c.timestamp IS NOT NULL
+        FROM {claims_source} c 
+        JOIN {listings_source} f ON c.food_id = f.food_id
+        WHERE c.timestamp IS NOT NULL{date_filter}
         GROUP BY DATE(c.timestamp)
         ORDER BY claim_date
         """
-        return SQLQueries.execute_query(query)
-
-    @staticmethod
-    def get_time_series_food_listings_trends():
-        """NEW: Time series analysis of food listings by expiry trends"""
-        query = """
+        return self.execute_query(query, params)
+
+    @cached('providers', 'food_listings', 'claims')
+    def get_time_series_food_listings_trends(self, start_date=None, end_date=None):
+        """NEW: Time series analysis of food listings by expiry trends (archive is included when start_date reaches it)"""
+        claims_source = table_source(self.engine, 'claims', start_date)
+        listings_source = table_source(self.engine, 'food_listings', start_date)
+        date_filter, params = self.date_range_filter('f.expiry_date', start_date, end_date)
+        query = f"""
         SELECT 
             DATE(f.expiry_date) as expiry_date,
             COUNT(*) as items_expiring,
@@ -827,19 +921,22 @@ class SQLQueries:
             -- Week analysis
             strftime('%Y-W%W', f.expiry_date) as year_week,
             strftime('%Y-%m', f.expiry_date) as year_month
-        FROM food_listings f 
+        FROM {listings_source} f 
         LEFT JOIN providers p ON f.provider_id = p.provider_id
-        LEFT JOIN claims c ON f.food_id = c.food_id
-        WHERE f.expiry_date IS NOT NULL
+        LEFT JOIN {claims_source} c ON f.food_id = c.food_id
+        WHERE f.expiry_date IS NOT NULL{date_filter}
         GROUP BY DATE(f.expiry_date)
         ORDER BY expiry_date
         """
-        return SQLQueries.execute_query(query)
-
-    @staticmethod
-    def get_monthly_performance_trends():
-        """NEW: Monthly performance trends analysis"""
-        query = """
+        return self.execute_query(query, params)
+
+    @cached('providers', 'receivers', 'food_listings', 'claims')
+    def get_monthly_performance_trends(self, start_date=None, end_date=None):
+        """NEW: Monthly performance trends analysis (archive is included when start_date reaches it)"""
+        claims_source = table_source(self.engine, 'claims', start_date)
+        listings_source = table_source(self.engine, 'food_listings', start_date)
+        date_filter, params = self.date_range_filter('c.timestamp', start_date, end_date)
+        query = f"""
         SELECT 
             strftime('%Y-%m', c.timestamp) as month,
             COUNT(*) as total_claims,
@@ -855,440 +952,12 @@ class SQLQueries:
             LAG(COUNT(*)) OVER (ORDER BY strftime('%Y-%m', c.timestamp)) as prev_month_claims,
             ROUND(100.0 * (COUNT(*) - LAG(COUNT(*)) OVER (ORDER BY strftime('%Y-%m', c.timestamp))) / 
                   NULLIF(LAG(COUNT(*)) OVER (ORDER BY strftime('%Y-%m', c.timestamp)), 0), 2) as claims_growth_rate
-        FROM claims c 
-        JOIN food_listings f ON c.food_id = f.food_id
+        FROM {claims_source} c 
+        JOIN {listings_source} f ON c.food_id = f.food_id
         JOIN providers p ON f.provider_id = p.provider_id
         LEFT JOIN receivers r ON c.receiver_id = r.receiver_id
-        WHERE c.timestamp IS NOT NULL
+        WHERE c.timestamp IS NOT NULL{date_filter}
         GROUP BY strftime('%Y-%m', c.timestamp)
         ORDER BY month
         """
-        return SQLQueries.execute_query(query)
-
-# ========== ENHANCED CHART STYLING FUNCTION ==========
-def apply_readable_chart_style(fig, title, x_label=None, y_label=None):
-    """Apply consistent readable styling to all charts"""
-    fig.update_layout(
-        # Title styling
-        title={
-            'text': title,
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {
-                'size': 20,
-                'color': '#1f2937',
-                'family': 'Arial, sans-serif'
-            }
-        },
-        
-        # Plot area styling
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        
-        # Font styling
-        font={
-            'size': 12,
-            'color': '#374151',
-            'family': 'Arial, sans-serif'
-        },
-        
-        # Margins
-        margin=dict(l=80, r=80, t=100, b=80),
-        
-        # Grid
-        xaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='#e5e7eb',
-            title=dict(
-                text=x_label if x_label else "",
-                font=dict(size=14, color='#1f2937')
-            ),
-            tickfont=dict(size=11, color='#374151')
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='#e5e7eb',
-            title=dict(
-                text=y_label if y_label else "",
-                font=dict(size=14, color='#1f2937')
-            ),
-            tickfont=dict(size=11, color='#374151')
-        ),
-        
-        # Legend styling
-        legend=dict(
-            bgcolor='rgba(255,255,255,0.8)',
-            bordercolor='#d1d5db',
-            borderwidth=1,
-            font=dict(size=11, color='#374151')
-        ),
-        
-        # Hover styling
-        hoverlabel=dict(
-            bgcolor="white",
-            font_size=12,
-            font_family="Arial",
-            bordercolor='#d1d5db'
-        )
-    )
-    
-    # Update traces for better visibility
-    fig.update_traces(
-        textfont=dict(size=11, color='#1f2937'),
-        hoverlabel=dict(
-            bgcolor="white",
-            font=dict(color='#1f2937')
-        )
-    )
-    
-    return fig
-
-# ========== ENHANCED VISUALIZATION FUNCTIONS ==========
-def create_project_required_charts():
-    """Create all charts required by the project with enhanced readability"""
-    charts = {}
-    try:
-        # 1. Food Wastage Trends by Category - ENHANCED
-        category_data = SQLQueries.get_food_wastage_trends_comprehensive()
-        if not category_data.empty:
-            fig = px.bar(category_data.head(10), 
-                        x='food_type', 
-                        y='total_quantity',
-                        color='wasted_quantity',
-                        hover_data=['total_listings', 'wastage_percentage', 'critical_items', 'wasted_quantity'],
-                        color_continuous_scale='Reds',
-                        labels={
-                            'food_type': 'Food Type',
-                            'total_quantity': 'Total Quantity (kg)',
-                            'wasted_quantity': 'Wasted Quantity (kg)'
-                        })
-            
-            fig = apply_readable_chart_style(fig, 
-                                           "📊 Food Wastage Analysis by Category", 
-                                           "Food Type", 
-                                           "Total Quantity (kg)")
-            charts['category_trends'] = fig
-
-        # 2. Provider Type Contributions - ENHANCED
-        provider_type_data = SQLQueries.get_provider_type_contributions()
-        if not provider_type_data.empty:
-            fig = px.bar(provider_type_data, 
-                        x='provider_type', 
-                        y='total_quantity_contributed',
-                        color='success_rate',
-                        hover_data=['total_providers', 'food_types_offered', 'successful_distributions', 'success_rate'],
-                        color_continuous_scale='Blues',
-                        labels={
-                            'provider_type': 'Provider Type',
-                            'total_quantity_contributed': 'Total Contribution (kg)',
-                            'success_rate': 'Success Rate (%)'
-                        })
-            
-            fig = apply_readable_chart_style(fig, 
-                                           "🏢 Food Contributions by Provider Type", 
-                                           "Provider Type", 
-                                           "Total Contribution (kg)")
-            charts['provider_type_contributions'] = fig
-
-        # 3. Cities by Food Listings - ENHANCED
-        city_data = SQLQueries.get_cities_by_food_listings()
-        if not city_data.empty:
-            fig = px.bar(city_data.head(10), 
-                        x='city', 
-                        y='total_food_listings',
-                        color='city_performance_score',
-                        hover_data=['total_quantity', 'unique_providers', 'claim_success_rate', 'freshness_rate'],
-                        color_continuous_scale='Viridis',
-                        labels={
-                            'city': 'City',
-                            'total_food_listings': 'Number of Food Listings',
-                            'city_performance_score': 'Performance Score'
-                        })
-            
-            fig.update_layout(xaxis={'categoryorder':'total descending'})
-            fig = apply_readable_chart_style(fig, 
-                                           "🌍 Top Cities by Food Availability", 
-                                           "City", 
-                                           "Number of Food Listings")
-            charts['city_listings'] = fig
-
-        # 4. Food Types Distribution - ENHANCED
-        food_type_data = SQLQueries.get_most_common_food_types()
-        if not food_type_data.empty:
-            fig = px.pie(food_type_data.head(8), 
-                        values='total_items', 
-                        names='food_type',
-                        hover_data=['total_quantity', 'claim_success_rate', 'supply_demand_ratio'],
-                        color_discrete_sequence=px.colors.qualitative.Set3)
-            
-            fig.update_traces(
-                textposition='inside', 
-                textinfo='percent+label',
-                textfont_size=12
-            )
-            
-            fig = apply_readable_chart_style(fig, "🍽️ Food Types Distribution")
-            charts['food_type_distribution'] = fig
-
-        # 5. Claims Status Analysis - ENHANCED
-        claims_data = SQLQueries.get_claims_completion_percentages()
-        if not claims_data.empty:
-            colors = {
-                'Completed': '#10b981',    # Green
-                'Pending': '#f59e0b',      # Orange  
-                'Cancelled': '#ef4444'     # Red
-            }
-            
-            fig = px.pie(claims_data, 
-                        values='claim_count', 
-                        names='status',
-                        hover_data=['percentage', 'total_quantity_involved', 'avg_quantity_per_claim'],
-                        color='status',
-                        color_discrete_map=colors)
-            
-            fig.update_traces(
-                textposition='inside', 
-                textinfo='percent+label',
-                textfont_size=14,
-                textfont_color='white'
-            )
-            
-            fig = apply_readable_chart_style(fig, "📈 Food Claims Status Distribution")
-            charts['claims_analysis'] = fig
-
-        # 6. Meal Type Demand - ENHANCED
-        meal_data = SQLQueries.get_most_claimed_meal_types()
-        if not meal_data.empty:
-            fig = px.bar(meal_data.head(8), 
-                        x='meal_type', 
-                        y='total_claims',
-                        color='success_rate',
-                        hover_data=['total_quantity_distributed', 'demand_supply_ratio', 'success_rate'],
-                        color_continuous_scale='Greens',
-                        labels={
-                            'meal_type': 'Meal Type',
-                            'total_claims': 'Total Claims',
-                            'success_rate': 'Success Rate (%)'
-                        })
-            
-            fig = apply_readable_chart_style(fig, 
-                                           "🍴 Most Demanded Meal Types", 
-                                           "Meal Type", 
-                                           "Number of Claims")
-            charts['meal_claims'] = fig
-
-        # 7. System Overview - ENHANCED
-        system_data = SQLQueries.get_comprehensive_system_analysis()
-        if not system_data.empty:
-            metrics = ['total_providers', 'total_receivers', 'total_food_items', 'successful_distributions']
-            values = [system_data.iloc[0][metric] for metric in metrics]
-            labels = ['Food Providers', 'Food Receivers', 'Food Items Listed', 'Successful Distributions']
-            
-            fig = px.bar(x=labels, y=values,
-                        color=values,
-                        color_continuous_scale='RdYlBu_r',
-                        labels={
-                            'x': 'System Components',
-                            'y': 'Count'
-                        })
-            
-            # Add value labels on bars
-            fig.update_traces(
-                text=values,
-                texttemplate='%{text:,}',
-                textposition='outside',
-                textfont=dict(size=14, color='#1f2937')
-            )
-            
-            fig = apply_readable_chart_style(fig, 
-                                           "📊 System Overview Dashboard", 
-                                           "System Components", 
-                                           "Count")
-            charts['system_overview'] = fig
-
-    except Exception as e:
-        st.error(f"Error creating enhanced charts: {e}")
-        charts['error'] = str(e)
-    
-    return charts
-
-# ========== NEW: ENHANCED TIME SERIES CHARTS ==========
-def create_time_series_charts():
-    """Create enhanced time series trend charts with improved readability"""
-    charts = {}
-    try:
-        # 1. Claims Trends Over Time - ENHANCED
-        claims_trends = SQLQueries.get_time_series_claims_trends()
-        if not claims_trends.empty:
-            fig = go.Figure()
-            
-            # Total claims line
-            fig.add_trace(go.Scatter(
-                x=claims_trends['claim_date'],
-                y=claims_trends['total_claims'],
-                mode='lines+markers',
-                name='Total Claims',
-                line=dict(color='#3b82f6', width=3),
-                marker=dict(size=6, color='#3b82f6'),
-                hovertemplate='<b>Date:</b> %{x}<br><b>Total Claims:</b> %{y}<extra></extra>'
-            ))
-            
-            # Completed claims line
-            fig.add_trace(go.Scatter(
-                x=claims_trends['claim_date'],
-                y=claims_trends['completed_claims'],
-                mode='lines+markers',
-                name='Completed Claims',
-                line=dict(color='#10b981', width=3),
-                marker=dict(size=6, color='#10b981'),
-                hovertemplate='<b>Date:</b> %{x}<br><b>Completed:</b> %{y}<extra></extra>'
-            ))
-            
-            fig = apply_readable_chart_style(fig, 
-                                           "📈 Food Claims Trends Over Time", 
-                                           "Date", 
-                                           "Number of Claims")
-            charts['claims_time_series'] = fig
-
-        # 2. Food Wastage vs Savings Timeline - ENHANCED
-        food_trends = SQLQueries.get_time_series_food_listings_trends()
-        if not food_trends.empty:
-            fig = go.Figure()
-            
-            # Quantity saved (positive impact)
-            fig.add_trace(go.Scatter(
-                x=food_trends['expiry_date'],
-                y=food_trends['quantity_saved'],
-                mode='lines+markers',
-                name='Food Saved (kg)',
-                line=dict(color='#10b981', width=3),
-                fill='tozeroy',
-                fillcolor='rgba(16, 185, 129, 0.2)',
-                marker=dict(size=5, color='#10b981'),
-                hovertemplate='<b>Date:</b> %{x}<br><b>Food Saved:</b> %{y} kg<extra></extra>'
-            ))
-            
-            # Quantity wasted (negative impact)
-            fig.add_trace(go.Scatter(
-                x=food_trends['expiry_date'],
-                y=food_trends['quantity_wasted'],
-                mode='lines+markers',
-                name='Food Wasted (kg)',
-                line=dict(color='#ef4444', width=3),
-                marker=dict(size=5, color='#ef4444'),
-                hovertemplate='<b>Date:</b> %{x}<br><b>Food Wasted:</b> %{y} kg<extra></extra>'
-            ))
-            
-            fig = apply_readable_chart_style(fig, 
-                                           "🗑️ Food Wastage vs Savings Timeline", 
-                                           "Expiry Date", 
-                                           "Quantity (kg)")
-            charts['wastage_timeline'] = fig
-
-        # 3. Monthly Performance Dashboard - ENHANCED
-        monthly_data = SQLQueries.get_monthly_performance_trends()
-        if not monthly_data.empty:
-            fig = go.Figure()
-            
-            # Claims bar chart
-            fig.add_trace(go.Bar(
-                x=monthly_data['month'],
-                y=monthly_data['total_claims'],
-                name='Total Claims',
-                marker_color='rgba(59, 130, 246, 0.7)',
-                marker_line=dict(color='#3b82f6', width=1),
-                yaxis='y',
-                hovertemplate='<b>Month:</b> %{x}<br><b>Claims:</b> %{y}<extra></extra>'
-            ))
-            
-            # Success rate line
-            fig.add_trace(go.Scatter(
-                x=monthly_data['month'],
-                y=monthly_data['monthly_success_rate'],
-                mode='lines+markers',
-                name='Success Rate (%)',
-                line=dict(color='#10b981', width=3),
-                marker=dict(size=8, color='#10b981'),
-                yaxis='y2',
-                hovertemplate='<b>Month:</b> %{x}<br><b>Success Rate:</b> %{y}%<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                yaxis=dict(
-                    title='Number of Claims',
-                    side='left',
-                    showgrid=True,
-                    gridcolor='#e5e7eb'
-                ),
-                yaxis2=dict(
-                    title='Success Rate (%)',
-                    side='right',
-                    overlaying='y',
-                    showgrid=False,
-                    range=[0, 100]
-                )
-            )
-            
-            fig = apply_readable_chart_style(fig, 
-                                           "📊 Monthly Performance & Success Trends", 
-                                           "Month", 
-                                           "Claims / Success Rate")
-            charts['monthly_trends'] = fig
-
-    except Exception as e:
-        st.error(f"Error creating time series charts: {e}")
-        charts['error'] = str(e)
-    
-    return charts
-
-# ========== MAIN HEADER ==========
-st.markdown("""
-<div class="main-header">
-    <h1>🌍 Food Wastage Management System</h1>
-    <p>Connecting food providers with those in need • Reducing waste • Building community</p>
-</div>
-""", unsafe_allow_html=True)
-
-# ========== SIDEBAR NAVIGATION (FIXED) ==========
-with st.sidebar:
-    st.title("🧭 Navigation")
-    current_page = st.selectbox(
-        "Choose a page:",
-        ["📊 Dashboard", "🏢 Providers", "🤝 Receivers", "🥗 Food Listings", "📦 Claims", "📈 Analytics", "⏰ Time Series"]
-    )
-
-# ========== MAIN CONTENT ROUTER (FIXED) ==========
-if current_page == "📊 Dashboard":
-    st.header("📊 Dashboard Overview")
-    
-    # Display key metrics with enhanced visibility
-    col1, col2, col3, col4 = st.columns(4)
-    
-    try:
-        system_data = SQLQueries.get_total_food_quantity_available()
-        if not system_data.empty:
-            row = system_data.iloc[0]
-            
-            with col1:
-                st.metric("Total Food Items", f"{row['total_food_items']:,}")
-            with col2:
-                st.metric("Fresh Items", f"{row['fresh_items']:,}")
-            with col3:
-                st.metric("Total Providers", f"{row['contributing_providers']:,}")
-            with col4:
-                st.metric("Cities Covered", f"{row['cities_covered']:,}")
-    except Exception as e:
-        st.warning("Loading dashboard metrics...")
-    
-    # Display enhanced charts
-    st.subheader("📈 Analytics Overview")
-    charts = create_project_required_charts()
-    
-    for chart_name, chart in charts.items():
-        if chart_name != 'error' and chart is not None:
-            try:
-                st.plotly_chart(chart, use_container_width=True, config={'displayModeBar': False})
-            except Exception as e:
-                st.error(f"Error displaying chart {chart_name}: {e}")
\ No newline at end of file
+        return self.execute_query(query, params)
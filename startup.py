@@ -0,0 +1,49 @@
+"""Cold-start timing: where a fresh server process spends its time before the first paint.
+
+The app imports this module before anything else and marks the end of each
+startup phase (imports, CSV load, database sync, page render). Only the
+first script run in the process is recorded; later reruns find the modules
+imported and the caches warm. ``STARTUP_BUDGET`` (``FWMS_STARTUP_BUDGET_S``,
+seconds) is the target for time to first paint that ``startup_report`` and
+benchmarks/bench_startup.py check against.
+"""
+import os
+import time
+
+STARTUP_BUDGET = float(os.environ.get("FWMS_STARTUP_BUDGET_S", "3"))
+
+_started = time.perf_counter()
+_last = _started
+_phases = {}
+_runs = 0
+
+
+def begin_run():
+    """Call at the top of every script run; marks after the first run are ignored"""
+    global _runs
+    _runs += 1
+
+
+def mark(phase):
+    """Record the time since the previous mark as `phase`"""
+    global _last
+    if _runs > 1:
+        return
+    now = time.perf_counter()
+    _phases[phase] = _phases.get(phase, 0.0) + now - _last
+    _last = now
+
+
+def startup_report():
+    """{phase: seconds} for the first run, plus 'first_paint' (their sum) and 'budget'"""
+    report = dict(_phases)
+    report['first_paint'] = sum(_phases.values())
+    report['budget'] = STARTUP_BUDGET
+    return report
+
+
+def format_startup(report):
+    phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in report.items()
+                       if phase not in ('first_paint', 'budget'))
+    verdict = "within" if report['first_paint'] <= report['budget'] else "over"
+    return f"first paint {report['first_paint']:.2f}s ({verdict} the {report['budget']:g}s budget): {phases}"
@@ -0,0 +1,275 @@
+"""Incremental primary-key diff sync from source extracts into the database.
+
+Each incoming chunk is hashed per row and compared by primary key against
+the rows already in the table. Only the inserts, updates and deletes needed
+are applied, in one transaction per table, so the change-log triggers see
+row-level changes instead of a wholesale reload. When the caller passes the
+hash of the source extract, a table already synced from that exact source (by
+the same schema and ``SYNC_VERSION``) is skipped without reading it.
+
+    python sync.py --db food_wastage.db providers=providers_data.csv claims=claims_data.csv
+"""
+import argparse
+import hashlib
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from addresses import ensure_address_columns, ensure_address_indexes
+from archive import archive_table_name
+from changelog import TRACKED_TABLES, install_change_triggers, log_table_reload
+from ingest import file_spec, iter_csv_typed
+from lookup import ensure_lookup_indexes
+from quality import clean_and_validate, quarantine_rows
+from schema import ENTITY_SCHEMAS, apply_schema
+
+SYNC_CHUNKSIZE = 50_000
+SYNC_STATE_TABLE = "sync_state"
+# Part of every recorded source hash: bump when the schema, quality, address or
+# FK code changes what a table synced from the same file contains
+SYNC_VERSION = 2
+
+
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(text(f"PRAGMA table_info('{table}')"))]
+
+
+def _ensure_sync_state(conn):
+    conn.execute(text(f"""
+    CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} (
+        table_name VARCHAR PRIMARY KEY,
+        source_hash VARCHAR NOT NULL,
+        synced_at DATETIME NOT NULL
+    )
+    """))
+
+
+def synced_source_hash(conn, table):
+    """Hash of the source extract `table` was last synced from (None if unknown)"""
+    if not _table_columns(conn, SYNC_STATE_TABLE) or not _table_columns(conn, table):
+        return None
+    return conn.execute(
+        text(f"SELECT source_hash FROM {SYNC_STATE_TABLE} WHERE table_name = :table"),
+        {"table": table},
+    ).scalar()
+
+
+def sync_key(table, source_hash):
+    """The value sync_state records for `table`: the source hash, the entity schema and SYNC_VERSION"""
+    schema = ENTITY_SCHEMAS.get(table, {})
+    layout = [(name, spec['dtype']) for name, spec in schema.get('columns', {}).items()]
+    derived = [derive.__name__ for derive in schema.get('derived', ())]
+    digest = hashlib.blake2b(f"{SYNC_VERSION}:{source_hash}:{layout}:{derived}".encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+def _record_source_hash(conn, table, source_hash):
+    _ensure_sync_state(conn)
+    conn.execute(
+        text(f"""
+        INSERT INTO {SYNC_STATE_TABLE} (table_name, source_hash, synced_at)
+        VALUES (:table, :hash, :now)
+        ON CONFLICT(table_name) DO UPDATE SET
+            source_hash = excluded.source_hash,
+            synced_at = excluded.synced_at
+        """),
+        {"table": table, "hash": source_hash, "now": datetime.now()},
+    )
+
+
+def _canonical(frame, reference):
+    """String form of each value, with types taken from the incoming frame so
+    CSV values and SQLite round-tripped values hash identically"""
+    canon = {}
+    for col in reference.columns:
+        values = frame[col]
+        ref = reference[col]
+        if pd.api.types.is_datetime64_any_dtype(ref):
+            values = pd.to_datetime(values, errors='coerce', format='mixed')
+            canon[col] = values.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
+        elif pd.api.types.is_numeric_dtype(ref) and not pd.api.types.is_bool_dtype(ref):
+            canon[col] = pd.to_numeric(values, errors='coerce').astype('float64').astype(str)
+        else:
+            canon[col] = values.astype(object).where(values.notna(), '').astype(str)
+    return pd.DataFrame(canon, index=frame.index)
+
+
+def _row_hashes(frame, reference, pk):
+    hashes = pd.util.hash_pandas_object(_canonical(frame, reference), index=False)
+    return pd.Series(hashes.to_numpy(), index=frame[pk].to_numpy())
+
+
+def _db_records(frame):
+    """Rows as plain-Python dicts the sqlite3 driver can bind"""
+    out = frame.copy()
+    for col in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict('records')
+
+
+def sync_table(engine, table, chunks, pk=None, delete_missing=True, source_hash=None):
+    """Diff-sync an iterable of DataFrames (or one DataFrame) into `table`.
+
+    Returns {'inserted', 'updated', 'deleted', 'unchanged', 'mode', 'seconds'}.
+    Rebuilds the table in the incoming layout (logged as a reload) when it does
+    not exist yet or the incoming columns are not a subset of the table's; with
+    `delete_missing=False` the rows the extract lacks are carried over, mapped
+    through the entity schema. Keys already moved to the archive are never
+    written back, and a key repeated across chunks is written once (last wins).
+    With `source_hash`, a table last synced from the same source, by the same
+    schema and SYNC_VERSION and with the incoming columns, is left untouched
+    (mode 'current').
+    """
+    start = time.perf_counter()
+    pk = pk or TRACKED_TABLES[table]
+    incoming_columns = set(chunks.columns) if isinstance(chunks, pd.DataFrame) else None
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    chunks = iter(chunks)
+    summary = {"table": table, "inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    if source_hash is not None:
+        source_hash = sync_key(table, source_hash)
+        with engine.connect() as conn:
+            # An older release may have synced the same file into a different layout
+            current = synced_source_hash(conn, table) == source_hash and (
+                incoming_columns is None or incoming_columns <= set(_table_columns(conn, table)))
+        if current:
+            summary.update(mode="current", seconds=round(time.perf_counter() - start, 4))
+            return summary
+
+    first = next(chunks, None)
+    if first is None or first.empty:
+        summary.update(mode="skipped", seconds=round(time.perf_counter() - start, 4))
+        return summary
+
+    with engine.begin() as conn:
+        table_columns = _table_columns(conn, table)
+        archived = set()
+        if _table_columns(conn, archive_table_name(table)):
+            archived = set(pd.read_sql(text(f"SELECT {pk} FROM {archive_table_name(table)}"), conn)[pk])
+
+        carried = None
+        existing_hashes = pd.Series(dtype='uint64')
+        if not table_columns or not set(first.columns) <= set(table_columns):
+            # First load or schema change: no meaningful diff is possible
+            mode = "replace"
+            if table_columns and not delete_missing:
+                carried = apply_schema(pd.read_sql(text(f"SELECT * FROM {table}"), conn), table)[0]
+            first.head(0).to_sql(table, conn, if_exists='replace', index=False)
+        else:
+            mode = "diff"
+            quoted = ", ".join(f'"{c}"' for c in first.columns)
+            existing = pd.read_sql(text(f"SELECT {quoted} FROM {table}"), conn)
+            existing = existing.drop_duplicates(subset=pk, keep='last')
+            if not existing.empty:
+                existing_hashes = _row_hashes(existing, first, pk)
+        # Updates and deletes look rows up by key (a rebuilt table has no index yet)
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{pk} ON {table} ({pk})"))
+
+        columns = list(first.columns)
+        update_sql = text(
+            f"UPDATE {table} SET "
+            + ", ".join(f'"{c}" = :{c}' for c in columns if c != pk)
+            + f" WHERE {pk} = :{pk}"
+        )
+        seen = set()
+        for chunk in [first, *chunks]:
+            chunk = chunk.drop_duplicates(subset=pk, keep='last')
+            if archived:
+                chunk = chunk[~chunk[pk].isin(archived)]
+            # Already written from an earlier chunk of this extract: the later row wins
+            repeated = chunk[pk].isin(seen)
+            if repeated.any():
+                conn.execute(update_sql, _db_records(chunk[repeated]))
+                summary["updated"] += int(repeated.sum())
+                chunk = chunk[~repeated]
+            incoming = _row_hashes(chunk, first, pk)
+            seen.update(incoming.index.tolist())
+            known = incoming.index.isin(existing_hashes.index)
+            inserts = chunk[~known]
+            matched = incoming[known]
+            changed_mask = matched.to_numpy() != existing_hashes.reindex(matched.index).to_numpy()
+            updates = chunk[known][changed_mask]
+
+            if not inserts.empty:
+                inserts.to_sql(table, conn, if_exists='append', index=False)
+            if not updates.empty:
+                conn.execute(update_sql, _db_records(updates))
+            summary["inserted"] += len(inserts)
+            summary["updated"] += len(updates)
+            summary["unchanged"] += int(len(matched) - changed_mask.sum())
+
+        if carried is not None:
+            # Rows the extract lacks (e.g. added in the app) survive the rebuild
+            keep = ~carried[pk].isin(seen) & ~carried[pk].isin(archived)
+            carried = carried[keep].drop_duplicates(subset=pk, keep='last').reindex(columns=columns)
+            if not carried.empty:
+                carried.to_sql(table, conn, if_exists='append', index=False)
+            summary["unchanged"] += len(carried)
+
+        if delete_missing and not existing_hashes.empty:
+            missing = existing_hashes.index[~existing_hashes.index.isin(seen)]
+            if len(missing):
+                conn.execute(
+                    text(f"DELETE FROM {table} WHERE {pk} = :pk"),
+                    [{"pk": int(key)} for key in missing],
+                )
+            summary["deleted"] = len(missing)
+
+        if mode == "replace":
+            log_table_reload(conn, table)
+        if source_hash is not None:
+            _record_source_hash(conn, table, source_hash)
+
+    summary.update(mode=mode, seconds=round(time.perf_counter() - start, 4))
+    return summary
+
+
+def read_csv_chunks(path, table, chunksize=SYNC_CHUNKSIZE, engine=None):
+    """Stream a seed/partner CSV typed, mapped and cleaned like the app's loader.
+
+    Rows failing a quality check are dropped, and stored in the quarantine
+    table when `engine` is given.
+    """
+    for chunk in iter_csv_typed(path, file_spec(path, table), chunksize=chunksize):
+        chunk, rejected, _ = clean_and_validate(apply_schema(chunk, table)[0], table)
+        if engine is not None:
+            quarantine_rows(engine, table, rejected)
+        yield chunk
+
+
+def format_summary(summary):
+    return (f"{summary['table']:<15} {summary['mode']:<8} +{summary['inserted']} "
+            f"~{summary['updated']} -{summary['deleted']} ={summary['unchanged']} "
+            f"({summary['seconds']:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply only the changed rows of full CSV extracts")
+    parser.add_argument("sources", nargs="+", metavar="TABLE=CSV", help="e.g. claims=claims_data.csv")
+    parser.add_argument("--db", default="food_wastage.db", help="SQLite database file")
+    parser.add_argument("--keep-missing", action="store_true", help="Do not delete rows absent from the extract")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}", echo=False)
+    ensure_address_columns(engine)
+    for source in args.sources:
+        table, path = source.split("=", 1)
+        chunks = read_csv_chunks(path, table, engine=engine)
+        summary = sync_table(engine, table, chunks, delete_missing=not args.keep_missing)
+        print(format_summary(summary))
+        if summary["mode"] == "replace":
+            # A rebuild drops the table's change-log triggers and indexes
+            install_change_triggers(engine)
+            ensure_address_indexes(engine)
+            ensure_lookup_indexes(engine)
+
+
+if __name__ == "__main__":
+    main()
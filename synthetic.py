@@ -0,0 +1,333 @@
+"""Seeded synthetic providers, receivers, listings and claims at any scale.
+
+Distributions are configurable (city skew, food/meal types, claim status
+mix, seasonal claim timestamps) and generation is chunked, so 10M rows
+stream without holding every table in memory. The same seed always
+produces the same data, whatever the chunk size.
+
+    python synthetic.py --rows 1000000 --db bench.db
+    python synthetic.py --rows 10000000 --parquet data/ --city-skew 1.2 --status-mix Completed=0.7,Pending=0.2,Cancelled=0.1
+    python synthetic.py --rows 10000 --csv seeds/    # seed-format CSVs the app can load
+"""
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from changelog import install_change_triggers, log_table_reload
+from ingest import CSV_SPECS
+from lookup import ensure_lookup_indexes
+from addresses import ensure_address_indexes
+from schema import ENTITY_SCHEMAS, apply_schema
+
+GENERATOR_CHUNKSIZE = 1_000_000
+# Random streams are keyed per fixed-size block, so output does not depend on chunksize
+RNG_BLOCK = 100_000
+
+DEFAULTS = {
+    'provider_types': {'Supermarket': 1, 'Grocery Store': 1, 'Restaurant': 1, 'Catering Service': 1},
+    'receiver_types': {'NGO': 1, 'Charity': 1, 'Shelter': 1, 'Individual': 1},
+    'food_names': {name: 1 for name in ('Rice', 'Soup', 'Salad', 'Dairy', 'Chicken', 'Pasta', 'Bread', 'Fish',
+                                        'Vegetables', 'Fruits')},
+    'food_types': {'Vegetarian': 1, 'Vegan': 1, 'Non-Vegetarian': 1},
+    'meal_types': {'Breakfast': 1, 'Lunch': 1, 'Dinner': 1, 'Snacks': 1},
+    'status_mix': {'Completed': 0.34, 'Cancelled': 0.33, 'Pending': 0.33},
+}
+
+FIRST_NAMES = np.array(['Donald', 'Laurie', 'Ashley', 'Erika', 'James', 'Maria', 'Kevin', 'Sofia', 'Omar', 'Priya'])
+LAST_NAMES = np.array(['Gomez', 'Ramos', 'Mckee', 'Rose', 'Miller', 'Chen', 'Patel', 'Nguyen', 'Brown', 'Okafor'])
+CITY_PREFIXES = np.array(['', 'North ', 'South ', 'East ', 'West ', 'Lake ', 'Port ', 'New '])
+CITY_ROOTS = np.array(['Kelly', 'James', 'Regina', 'Carl', 'Shane', 'Randall', 'Andrea', 'Jessica', 'Lewis', 'Mason'])
+CITY_SUFFIXES = np.array(['ville', 'town', 'burgh', 'mouth', 'side', ' City'])
+STATES = np.array(['CA', 'NY', 'TX', 'WA', 'OK', 'OR', 'MA', 'IL', 'FL', 'NC', 'AZ', 'CO', 'GA', 'MI', 'PA', 'VA'])
+# Seed files write month, day and hour without zero-padding ('%-m' is glibc-only)
+UNPADDED_FIELDS = {'%m': 'month', '%d': 'day', '%H': 'hour'}
+
+
+def parse_mix(value):
+    """'Completed=0.7,Pending=0.2' -> {'Completed': 0.7, 'Pending': 0.2}"""
+    mix = {}
+    for part in value.split(','):
+        label, _, weight = part.partition('=')
+        mix[label.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def _rng(seed, table, block):
+    """Independent, reproducible stream per (seed, table, block)"""
+    return np.random.default_rng([seed, sorted(ENTITY_SCHEMAS).index(table), block])
+
+
+def _choice(rng, mix, size):
+    labels = np.array(list(mix))
+    weights = np.array(list(mix.values()), dtype=float)
+    return labels[rng.choice(len(labels), size=size, p=weights / weights.sum())]
+
+
+def city_names(n_cities):
+    i = np.arange(n_cities)
+    names = (CITY_PREFIXES[i % len(CITY_PREFIXES)].astype(object)
+             + CITY_ROOTS[(i // len(CITY_PREFIXES)) % len(CITY_ROOTS)]
+             + CITY_SUFFIXES[(i // (len(CITY_PREFIXES) * len(CITY_ROOTS))) % len(CITY_SUFFIXES)])
+    # Disambiguate once the name combinations run out
+    repeat = i // (len(CITY_PREFIXES) * len(CITY_ROOTS) * len(CITY_SUFFIXES))
+    return np.where(repeat > 0, names + ' ' + (repeat + 1).astype(str), names)
+
+
+def city_weights(n_cities, skew):
+    """Zipf-like popularity: city k gets weight 1 / k**skew (skew 0 = uniform)"""
+    weights = 1.0 / np.arange(1, n_cities + 1) ** skew
+    return weights / weights.sum()
+
+
+def _person_names(rng, size):
+    return (FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), size)].astype(object) + ' '
+            + LAST_NAMES[rng.integers(0, len(LAST_NAMES), size)])
+
+
+def _contacts(rng, size):
+    digits = rng.integers(200, 999, size).astype(str).astype(object)
+    return '+1-' + digits + '-' + rng.integers(100, 999, size).astype(str) + '-' + rng.integers(1000, 9999, size).astype(str)
+
+
+def generate_entities(table, count, cfg):
+    """Providers or receivers (small enough to build in one piece)"""
+    rng = _rng(cfg['seed'], table, 0)
+    ids = np.arange(1, count + 1)
+    city_index = rng.choice(len(cfg['cities']), size=count, p=cfg['city_weights'])
+    cities = cfg['cities'][city_index]
+    key = ENTITY_SCHEMAS[table]['key']
+    if table == 'providers':
+        frame = {
+            key: ids,
+            'name': _person_names(rng, count) + ' ' + _choice(rng, {'Market': 1, 'Kitchen': 1, 'Foods': 1}, count),
+            'type': _choice(rng, cfg['provider_types'], count),
+            # Seed-style "street\nCity, ST 12345"; each city sits in one state
+            'address': (rng.integers(10, 99999, count).astype(str).astype(object) + ' Main Street\n' + cities + ', '
+                        + STATES[city_index % len(STATES)] + ' '
+                        + np.char.zfill(rng.integers(501, 99951, count).astype(str), 5)),
+        }
+    else:
+        frame = {key: ids, 'name': _person_names(rng, count), 'type': _choice(rng, cfg['receiver_types'], count)}
+    frame['city'] = cities
+    frame['contact'] = _contacts(rng, count)
+    return pd.DataFrame(frame)
+
+
+def generate_listings(block, start_id, size, providers, cfg):
+    rng = _rng(cfg['seed'], 'food_listings', block)
+    provider_rows = rng.integers(0, len(providers), size)
+    expiry_days = rng.integers(0, cfg['days'] + 14, size)
+    return pd.DataFrame({
+        'food_id': np.arange(start_id, start_id + size),
+        'food_name': _choice(rng, cfg['food_names'], size),
+        'quantity': rng.integers(1, 51, size),
+        'expiry_date': cfg['start'] + pd.to_timedelta(expiry_days, unit='D'),
+        'provider_id': providers['provider_id'].to_numpy()[provider_rows],
+        'provider_type': providers['type'].to_numpy()[provider_rows],
+        'location': providers['city'].to_numpy()[provider_rows],
+        'food_type': _choice(rng, cfg['food_types'], size),
+        'meal_type': _choice(rng, cfg['meal_types'], size),
+    })
+
+
+def seasonal_day_weights(start, days, amplitude, peak_day_of_year):
+    """Claim volume per day: 1 + amplitude * cos(annual phase), peaking on `peak_day_of_year`"""
+    day_of_year = (start + pd.to_timedelta(np.arange(days), unit='D')).dayofyear.to_numpy()
+    weights = 1 + amplitude * np.cos(2 * np.pi * (day_of_year - peak_day_of_year) / 365.25)
+    weights = np.clip(weights, 0, None)
+    return weights / weights.sum()
+
+
+# Claims cluster around lunch and early evening
+HOUR_WEIGHTS = np.array([1, 1, 1, 1, 1, 2, 4, 6, 8, 9, 10, 12, 14, 12, 10, 9, 10, 12, 13, 11, 8, 5, 3, 2], dtype=float)
+HOUR_WEIGHTS /= HOUR_WEIGHTS.sum()
+
+
+def generate_claims(block, start_id, size, n_listings, n_receivers, cfg):
+    rng = _rng(cfg['seed'], 'claims', block)
+    days = rng.choice(cfg['days'], size=size, p=cfg['day_weights'])
+    hours = rng.choice(24, size=size, p=HOUR_WEIGHTS)
+    minutes = days * 1440 + hours * 60 + rng.integers(0, 60, size)
+    return pd.DataFrame({
+        'claim_id': np.arange(start_id, start_id + size),
+        'food_id': rng.integers(1, n_listings + 1, size),
+        'receiver_id': rng.integers(1, n_receivers + 1, size),
+        'status': _choice(rng, cfg['status_mix'], size),
+        'timestamp': cfg['start'] + pd.to_timedelta(minutes, unit='min'),
+    })
+
+
+def _blocks(total, make, chunksize):
+    """Build `total` rows block by block with make(block, start_id, size), yielding ~chunksize-row frames"""
+    per_chunk = max(1, chunksize // RNG_BLOCK)
+    pending = []
+    for block, offset in enumerate(range(0, total, RNG_BLOCK)):
+        pending.append(make(block, offset + 1, min(RNG_BLOCK, total - offset)))
+        if len(pending) == per_chunk:
+            yield pd.concat(pending, ignore_index=True)
+            pending = []
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def generate(rows, seed=42, entity_ratio=0.1, n_cities=500, city_skew=1.0, start='2025-01-01', days=365,
+             seasonality=0.3, peak_day_of_year=355, chunksize=GENERATOR_CHUNKSIZE, **mixes):
+    """Yield (table, chunk DataFrame) in foreign-key order; `rows` listings and claims"""
+    cfg = dict(DEFAULTS, **{k: v for k, v in mixes.items() if v})
+    cfg.update(seed=seed, start=pd.Timestamp(start), days=days)
+    cfg['cities'] = city_names(n_cities)
+    cfg['city_weights'] = city_weights(n_cities, city_skew)
+    cfg['day_weights'] = seasonal_day_weights(cfg['start'], days, seasonality, peak_day_of_year)
+    n_entities = max(10, int(rows * entity_ratio))
+
+    providers = generate_entities('providers', n_entities, cfg)
+    yield 'providers', providers
+    yield 'receivers', generate_entities('receivers', n_entities, cfg)
+    for df in _blocks(rows, lambda block, start_id, size: generate_listings(block, start_id, size, providers, cfg),
+                      chunksize):
+        yield 'food_listings', df
+    for df in _blocks(rows, lambda block, start_id, size: generate_claims(block, start_id, size, rows, n_entities, cfg),
+                      chunksize):
+        yield 'claims', df
+
+
+# ========== WRITERS ==========
+class DatabaseWriter:
+    """Bulk-load into SQLite, replacing each table on its first chunk"""
+
+    def __init__(self, path):
+        self.engine = create_engine(f"sqlite:///{path}", echo=False)
+        self.started = set()
+
+    def write(self, table, df):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+            first = table not in self.started
+            # Same derived columns and dtypes as the app's loader
+            df, _ = apply_schema(df, table)
+            df.to_sql(table, conn, if_exists='replace' if first else 'append', index=False, chunksize=100_000)
+            if first:
+                log_table_reload(conn, table)
+                self.started.add(table)
+
+    def close(self):
+        # Replacing a table drops its change-log triggers
+        install_change_triggers(self.engine)
+        ensure_address_indexes(self.engine)
+        ensure_lookup_indexes(self.engine)
+        with self.engine.begin() as conn:
+            for table, key in ((t, ENTITY_SCHEMAS[t]['key']) for t in self.started):
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{key} ON {table} ({key})"))
+
+
+class ParquetWriter:
+    """One Parquet file per table, written a row group per chunk"""
+
+    def __init__(self, directory):
+        import pyarrow.parquet as pq
+        self.pq = pq
+        self.directory = directory
+        self.writers = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, table, df):
+        import pyarrow as pa
+        if table not in self.writers:
+            schema = pa.Table.from_pandas(df, preserve_index=False).schema
+            self.writers[table] = self.pq.ParquetWriter(os.path.join(self.directory, f"{table}.parquet"), schema)
+        writer = self.writers[table]
+        writer.write_table(pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False))
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+
+def format_dates(values, fmt):
+    """strftime with the UNPADDED_FIELDS written as plain numbers, e.g. '3/7/2025 9:05'"""
+    out = pd.Series('', index=values.index, dtype=object)
+    for part in re.split('(' + '|'.join(UNPADDED_FIELDS) + ')', fmt):
+        if part in UNPADDED_FIELDS:
+            out = out + getattr(values.dt, UNPADDED_FIELDS[part]).astype(str)
+        elif '%' in part:
+            out = out + values.dt.strftime(part)
+        elif part:
+            out = out + part
+    return out
+
+
+class CsvWriter:
+    """Seed-format CSVs (original headers and date formats) for the app's loader"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.started = set()
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, table, df):
+        spec = CSV_SPECS[table]
+        headers = {name: col['aliases'][0] for name, col in ENTITY_SCHEMAS[table]['columns'].items() if col['aliases']}
+        out = df.rename(columns=headers)
+        for col, fmt in spec['dates'].items():
+            out[col] = format_dates(out[col], fmt)
+        first = table not in self.started
+        self.started.add(table)
+        out.to_csv(os.path.join(self.directory, spec['path']), mode='w' if first else 'a', header=first, index=False)
+
+    def close(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic data for benchmarking")
+    parser.add_argument("--rows", type=int, default=10_000, help="Food listings and claims to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--entity-ratio", type=float, default=0.1, help="Providers/receivers per listing")
+    parser.add_argument("--cities", type=int, default=500)
+    parser.add_argument("--city-skew", type=float, default=1.0, help="Zipf exponent for city popularity (0 = uniform)")
+    parser.add_argument("--food-names", type=parse_mix, help="e.g. Rice=2,Soup=1")
+    parser.add_argument("--food-types", type=parse_mix, help="e.g. Vegan=1,Vegetarian=2,Non-Vegetarian=2")
+    parser.add_argument("--meal-types", type=parse_mix, help="e.g. Lunch=2,Dinner=2,Breakfast=1,Snacks=1")
+    parser.add_argument("--status-mix", type=parse_mix, help="e.g. Completed=0.65,Pending=0.2,Cancelled=0.15")
+    parser.add_argument("--start", default="2025-01-01", help="First day of the generated history")
+    parser.add_argument("--days", type=int, default=365, help="Days of history")
+    parser.add_argument("--seasonality", type=float, default=0.3, help="Annual claim-volume amplitude (0-1)")
+    parser.add_argument("--peak-day", type=int, default=355, help="Day of year with the most claims")
+    parser.add_argument("--chunksize", type=int, default=GENERATOR_CHUNKSIZE)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--db", help="SQLite database to bulk-load (tables are replaced)")
+    target.add_argument("--parquet", help="Directory for <table>.parquet files")
+    target.add_argument("--csv", help="Directory for seed-format CSV files")
+    args = parser.parse_args()
+
+    if args.db:
+        writer = DatabaseWriter(args.db)
+    elif args.parquet:
+        writer = ParquetWriter(args.parquet)
+    else:
+        writer = CsvWriter(args.csv)
+
+    start = time.perf_counter()
+    counts = {}
+    for table, df in generate(
+        args.rows, seed=args.seed, entity_ratio=args.entity_ratio, n_cities=args.cities, city_skew=args.city_skew,
+        start=args.start, days=args.days, seasonality=args.seasonality, peak_day_of_year=args.peak_day,
+        chunksize=args.chunksize, food_names=args.food_names, food_types=args.food_types,
+        meal_types=args.meal_types, status_mix=args.status_mix,
+    ):
+        writer.write(table, df)
+        counts[table] = counts.get(table, 0) + len(df)
+        print(f"  {table:<15} {counts[table]:>12,} rows  ({time.perf_counter() - start:.1f}s)")
+    writer.close()
+    total = sum(counts.values())
+    seconds = time.perf_counter() - start
+    print(f"🧪 {total:,} rows in {seconds:.1f}s ({total / seconds:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
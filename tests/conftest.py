@@ -0,0 +1,24 @@
+"""Shared fixtures. The app's modules live at the repository root."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Precomputed results are computed in the page instead, so a test sees each render's own queries
+os.environ.setdefault("FWMS_PRECOMPUTE", "0")
+
+from synthetic import DatabaseWriter, generate  # noqa: E402
+
+ROWS = 2_000
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A small synthetic database with the change-log triggers installed"""
+    writer = DatabaseWriter(str(tmp_path / "test.db"))
+    for table, df in generate(ROWS):
+        writer.write(table, df)
+    writer.close()
+    return writer.engine
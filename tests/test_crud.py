@@ -0,0 +1,21 @@
+"""Form writes take the next id and store parsed addresses."""
+import pandas as pd
+
+from crud import CRUDOperations
+
+
+def test_add_provider_and_receiver(engine):
+    crud = CRUDOperations(engine)
+    before = pd.read_sql("SELECT MAX(provider_id) AS id FROM providers", engine)['id'][0]
+    assert crud.add_provider("Test Market", "Restaurant", "Lake Kellyville", "+1-555-010-0001",
+                             "1 Main Street\nLake Kellyville, WA 98101")[0]
+    assert crud.add_provider("Test Kitchen", "Restaurant", "Lake Kellyville", "+1-555-010-0002")[0]
+    added = pd.read_sql(f"SELECT provider_id, state, postal_code FROM providers WHERE provider_id > {before}"
+                        " ORDER BY provider_id", engine)
+    assert added['provider_id'].tolist() == [before + 1, before + 2]
+    assert added.loc[0, ['state', 'postal_code']].tolist() == ['WA', '98101']
+
+    before = pd.read_sql("SELECT MAX(receiver_id) AS id FROM receivers", engine)['id'][0]
+    assert crud.add_receiver("Test Shelter", "Shelter", "Lake Kellyville", "+1-555-010-0003") == (
+        True, "Receiver added successfully!")
+    assert pd.read_sql("SELECT MAX(receiver_id) AS id FROM receivers", engine)['id'][0] == before + 1
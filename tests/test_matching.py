@@ -0,0 +1,30 @@
+"""Matching proposes claims for the open listings in the database, including ones added in the app."""
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import text
+
+from crud import CRUDOperations
+from matching import propose_claims
+from querycache import refresh_from_change_log
+
+
+def test_listing_added_in_the_app_is_matched_in_its_providers_city(engine):
+    refresh_from_change_log(engine)
+    with engine.connect() as conn:
+        provider_id, city = conn.execute(text("""
+        SELECT p.provider_id, p.city FROM providers p JOIN receivers r ON r.city = p.city
+        GROUP BY p.provider_id ORDER BY COUNT(*) DESC LIMIT 1
+        """)).first()
+    expiry = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+    success, message = CRUDOperations(engine).add_food_listing('Fresh Bread', 10, expiry, provider_id,
+                                                               'Vegetarian', 'Breakfast')
+    assert success, message
+    with engine.connect() as conn:
+        food_id = conn.execute(text("SELECT MAX(food_id) FROM food_listings")).scalar()
+
+    proposals = propose_claims(engine)
+    proposal = proposals[proposals['food_id'] == food_id]
+    assert len(proposal) == 1
+    assert proposal['city'].iat[0] == city
+    assert proposal['pickup_date'].iat[0] <= pd.Timestamp(expiry)
@@ -0,0 +1,81 @@
+"""The Analytics and Time Series pages run only the open tab's queries."""
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from changelog import TRACKED_TABLES
+from conftest import ROOT, ROWS
+from querycache import cache_stats
+from synthetic import CsvWriter, generate
+
+APP = os.path.join(ROOT, "app (10).py")
+
+# page -> (tab widget key, {tab label: SQLQueries methods only that tab reads})
+TABS = {
+    "📈 Analytics": ("analytics_tab", {
+        "🏢 Provider Analytics": ["get_provider_highest_successful_claims", "get_total_donations_per_provider",
+                                 "get_provider_reliability_pct", "get_most_frequent_providers_contributions"],
+        "🤝 Receiver Analytics": ["get_avg_quantity_per_receiver", "get_top_claiming_receivers"],
+        "🍽️ Food Analytics": ["get_most_common_food_types", "get_most_claimed_meal_types",
+                              "get_food_type_wastage_pct"],
+        "🌍 City Analytics": ["get_providers_receivers_per_city", "get_highest_demand_locations_by_claims"],
+    }),
+    # The trend tables reuse the queries of the charts above the tabs, which always run
+    "⏰ Time Series": ("time_series_tab", {
+        "📈 Claims Trends": ["get_provider_reliability_pct", "get_most_frequent_providers_contributions"],
+        "🗑️ Wastage Trends": [],
+        "📅 Monthly Performance": [],
+    }),
+}
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    """The app, run once on seed-format CSVs in a fresh working directory"""
+    from streamlit.testing.v1 import AppTest
+
+    directory = tmp_path_factory.mktemp("app")
+    writer = CsvWriter(str(directory))
+    for table, df in generate(ROWS):
+        writer.write(table, df)
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        at = AppTest.from_file(APP, default_timeout=600)
+        at.run()
+        assert not at.exception
+        at.engine = create_engine(f"sqlite:///{directory / 'food_wastage.db'}")
+        yield at
+    finally:
+        os.chdir(cwd)
+
+
+def touch_every_table(engine):
+    """A no-op update per entity table: its change-log entry makes every cached and precomputed result stale"""
+    with engine.begin() as conn:
+        for table, key in TRACKED_TABLES.items():
+            conn.execute(text(f"UPDATE {table} SET {key} = {key} WHERE rowid = (SELECT MIN(rowid) FROM {table})"))
+
+
+def misses():
+    stats = cache_stats().set_index('function')['misses']
+    return {name.split('.')[-1]: count for name, count in stats.items() if name.startswith('SQLQueries.')}
+
+
+@pytest.mark.parametrize("page,label", [(page, label) for page, (_, tabs) in TABS.items() for label in tabs])
+def test_only_the_open_tab_queries(app, page, label):
+    key, tabs = TABS[page]
+    app.sidebar.selectbox[0].select(page)
+    app.run()
+    app.session_state[key] = label
+    # Cold: every query the render needs is a miss
+    touch_every_table(app.engine)
+    before = misses()
+    app.run()
+    assert not app.exception, app.exception[0].value if app.exception else None
+    ran = {name for name, count in misses().items() if count > before.get(name, 0)}
+
+    assert set(tabs[label]) <= ran
+    others = {name for other, names in tabs.items() if other != label for name in names} - set(tabs[label])
+    assert not others & ran, f"closed tabs ran {sorted(others & ran)}"
@@ -0,0 +1,86 @@
+"""Per-table invalidation: a write recomputes only the cached reads of the written table."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+import urgency
+from crud import CRUDOperations
+from querycache import invalidate, refresh_from_change_log
+from sql_queries import SQLQueries
+
+
+@pytest.fixture
+def queries(engine):
+    queries = SQLQueries(engine)
+    refresh_from_change_log(engine)
+    invalidate('providers', 'receivers', 'food_listings', 'claims')
+    return queries
+
+
+def misses(*reads):
+    return {read.__name__: read.cache.misses for read in reads}
+
+
+def recomputed(reads, write):
+    """Run `reads`, then `write`, then `reads` again; returns the misses the second round added"""
+    for read in reads:
+        read()
+    before = misses(*reads)
+    write()
+    for read in reads:
+        read()
+    return {name: count - before[name] for name, count in misses(*reads).items()}
+
+
+def test_warm_reads_hit_the_cache(queries):
+    read = queries.get_food_type_wastage_pct
+    first = read()
+    hits = read.cache.hits
+    assert read().equals(first)
+    assert read.cache.hits == hits + 1
+
+
+def test_receiver_insert_keeps_listing_analytics_cached(engine, queries):
+    def write():
+        success, message = CRUDOperations(engine).add_receiver('New Shelter', 'Shelter', 'Springfield', '555-0100')
+        assert success, message
+
+    counts = recomputed((queries.get_food_type_wastage_pct, queries.get_claims_per_food_item,
+                         queries.get_top_claiming_receivers), write)
+    assert counts == {'get_food_type_wastage_pct': 0, 'get_claims_per_food_item': 0,
+                      'get_top_claiming_receivers': 1}
+
+
+def test_write_from_another_process_is_picked_up_from_the_change_log(engine, queries):
+    def write():
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE food_listings SET quantity = quantity + 1 WHERE food_id = 1"))
+        assert refresh_from_change_log(engine) == ['food_listings']
+
+    counts = recomputed((queries.get_food_type_wastage_pct, queries.get_provider_states), write)
+    assert counts == {'get_food_type_wastage_pct': 1, 'get_provider_states': 0}
+
+
+class _Tomorrow(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz) + timedelta(days=1)
+
+
+def test_a_new_day_reruns_queries_on_the_current_date(queries, monkeypatch):
+    read = queries.get_top_claiming_receivers
+    read()
+    read()
+    misses = read.cache.misses
+    monkeypatch.setattr(urgency, 'datetime', _Tomorrow)
+    read()
+    assert read.cache.misses == misses + 1
+
+
+def test_recent_columns_follow_as_of(queries):
+    read = queries.get_top_claiming_receivers
+    during = read(as_of='2025-06-15')['recent_claims'].sum()
+    after = read(as_of='2027-01-01')['recent_claims'].sum()
+    assert during > 0
+    assert after == 0
@@ -0,0 +1,33 @@
+"""Incremental sync: a re-run applies only the changed rows, looked up by key."""
+import pytest
+from sqlalchemy import text
+
+from sync import sync_table
+from synthetic import generate
+
+
+def claims_extract():
+    return next(df for table, df in generate(2_000) if table == 'claims')
+
+
+def test_resync_applies_only_the_changes(engine):
+    claims = claims_extract()
+    changed = claims.index[5:15]
+    claims.loc[changed, 'status'] = claims.loc[changed, 'status'].map(
+        {'Completed': 'Cancelled', 'Cancelled': 'Pending', 'Pending': 'Completed'})
+    summary = sync_table(engine, 'claims', claims.iloc[5:])
+    assert summary['mode'] == 'diff'
+    assert (summary['inserted'], summary['updated'], summary['deleted']) == (0, 10, 5)
+
+
+@pytest.mark.parametrize("drop", ["INDEX IF EXISTS ix_claims_claim_id", "TABLE claims"])
+def test_claims_updates_and_deletes_use_the_key_index(engine, drop):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP {drop}"))
+    summary = sync_table(engine, 'claims', claims_extract())
+    assert summary['mode'] == ('replace' if drop.startswith('TABLE') else 'diff')
+    with engine.connect() as conn:
+        for statement in ("UPDATE claims SET status = 'Completed' WHERE claim_id = 1",
+                          "DELETE FROM claims WHERE claim_id = 1"):
+            plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {statement}")))
+            assert "INDEX ix_claims_claim_id (claim_id=?)" in plan, plan
@@ -0,0 +1,27 @@
+"""The pandas and SQL urgency classifiers agree, and date-based queries follow as_of."""
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from sql_queries import SQLQueries
+from urgency import classify_days, days_until_expiry, sql_case
+
+AS_OF = pd.Timestamp('2025-03-10 15:30')
+
+
+def test_pandas_and_sql_buckets_agree():
+    expiry = pd.Series(AS_OF.normalize() + pd.to_timedelta(range(-3 * 24, 12 * 24, 5), unit='h'))
+    engine = create_engine("sqlite://")
+    pd.DataFrame({'expiry_date': expiry.dt.strftime('%Y-%m-%d %H:%M:%S')}).to_sql('listings', engine, index=False)
+    with engine.connect() as conn:
+        in_sql = [row[0] for row in conn.execute(text(f"SELECT {sql_case('expiry_date', AS_OF)} FROM listings"))]
+    in_pandas = classify_days(days_until_expiry(expiry, AS_OF)).astype(str).tolist()
+    assert in_pandas == in_sql
+
+
+def test_donation_recency_follows_as_of(engine):
+    read = SQLQueries(engine).get_total_donations_per_provider
+    during = read(as_of='2025-06-15')
+    after = read(as_of='2027-01-01')
+    assert during['recent_donations'].sum() > 0
+    assert after['recent_donations'].sum() == 0
+    assert (after['avg_donation_shelf_life'] < during['avg_donation_shelf_life']).all()
@@ -0,0 +1,107 @@
+"""Expiry urgency buckets shared by pandas and SQL.
+
+One definition drives both the vectorized pandas classifier
+(``classify_days``, used by the expiry index) and the SQL CASE expressions
+used by the queries, so the app never disagrees with itself about what
+"Critical" means. Days are whole calendar days between the as-of date and
+the expiry date (0 = expires today), and buckets are computed at read time
+against an explicit ``as_of`` clock instead of being cached at load time.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# (label, last day included), checked in order; anything later is NORMAL
+URGENCY_BUCKETS = (
+    ('Expired', -1),
+    ('Critical', 1),
+    ('Urgent', 3),
+    ('Soon', 7),
+)
+NORMAL = 'Normal'
+URGENCY_LABELS = tuple(label for label, _ in URGENCY_BUCKETS) + (NORMAL,)
+NOT_EXPIRED = URGENCY_LABELS[1:]
+
+_UPPER_BOUNDS = np.array([last_day for _, last_day in URGENCY_BUCKETS])
+
+
+def as_of_date(as_of=None):
+    """Normalize an as-of clock to a midnight Timestamp (defaults to today)"""
+    return pd.Timestamp(as_of if as_of is not None else datetime.now()).normalize()
+
+
+def days_until_expiry(expiry, as_of=None):
+    """Whole days from as_of to each expiry date (float, NaN where unknown)"""
+    expiry = pd.to_datetime(pd.Series(expiry), errors='coerce')
+    start = np.datetime64(as_of_date(as_of).date(), 'D')
+    days = (expiry.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]') - start).astype('float64')
+    days[expiry.isna().to_numpy()] = np.nan
+    return pd.Series(days, index=expiry.index, name='days_until_expiry')
+
+
+def classify_days(days):
+    """Bucket day counts into an ordered categorical (pd.cut's searchsorted kernel)"""
+    days = pd.Series(days)
+    values = days.to_numpy(dtype='float64')
+    codes = np.searchsorted(_UPPER_BOUNDS, values, side='left')
+    codes[np.isnan(values)] = -1
+    categories = pd.CategoricalDtype(URGENCY_LABELS, ordered=True)
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=categories), index=days.index, name='urgency')
+
+
+# ========== SQL ==========
+def sql_date(as_of=None):
+    """SQLite date literal for the as_of day, used in place of 'now'"""
+    return f"'{as_of_date(as_of):%Y-%m-%d}'"
+
+
+def sql_days_until(column, as_of=None):
+    """SQLite expression for whole days from as_of to `column`"""
+    return f"(julianday(DATE({column})) - julianday({sql_date(as_of)}))"
+
+
+def _bounds(label):
+    """(first_day, last_day) of a bucket, None meaning unbounded"""
+    first = None
+    for name, last in URGENCY_BUCKETS:
+        if name == label:
+            return first, last
+        first = last + 1
+    if label == NORMAL:
+        return first, None
+    raise ValueError(f"Unknown urgency bucket: {label}")
+
+
+def sql_condition(labels, column, as_of=None):
+    """SQL predicate true when `column` falls in the given bucket(s)"""
+    if isinstance(labels, str):
+        labels = (labels,)
+    days = sql_days_until(column, as_of)
+    parts = []
+    for label in labels:
+        first, last = _bounds(label)
+        clauses = []
+        if first is not None:
+            clauses.append(f"{days} >= {first}")
+        if last is not None:
+            clauses.append(f"{days} <= {last}")
+        parts.append("(" + " AND ".join(clauses) + ")")
+    return "(" + " OR ".join(parts) + ")"
+
+
+def sql_case(column, as_of=None, labels=None):
+    """SQL CASE expression mapping `column` to its urgency label.
+
+    `labels` optionally renames buckets for display (e.g. {'Critical': '🔴 Critical'}).
+    """
+    labels = labels or {}
+    days = sql_days_until(column, as_of)
+    whens = "\n".join(
+        f"        WHEN {days} <= {last} THEN '{labels.get(name, name)}'"
+        for name, last in URGENCY_BUCKETS
+    )
+    return (
+        f"CASE\n        WHEN {column} IS NULL THEN NULL\n{whens}\n"
+        f"        ELSE '{labels.get(NORMAL, NORMAL)}'\n    END"
+    )
@@ -0,0 +1,56 @@
+"""Page registry: each page's code lives in its own module under views/.
+
+A page module is imported the first time that page is selected, so a cold
+start pays only for the landing page (the Analytics and Time Series pages
+pull in plotly.express; the Providers page does not). Every module exposes
+``render(app)``, where ``app`` carries what the page needs from the script:
+the engine, ``SQLQueries`` and ``CRUDOperations`` (instances bound to the
+engine), the chart builders, ``form_idempotency_key`` / ``form_submitted``
+and the precompute ``scheduler``. A ``QueryError`` escaping a page is shown
+as an error.
+"""
+import importlib
+
+import streamlit as st
+
+from precompute import format_staleness
+from sql_queries import QueryError
+
+# Sidebar label -> module under views/ (also the ?page= value)
+PAGES = {
+    "📊 Dashboard": "dashboard",
+    "🏢 Providers": "providers",
+    "🤝 Receivers": "receivers",
+    "🥗 Food Listings": "food_listings",
+    "📦 Claims": "claims",
+    "📈 Analytics": "analytics",
+    "⏰ Time Series": "time_series",
+}
+
+
+def page_index(slug):
+    """Position of the page named `slug` (a ?page= value) in PAGES, defaulting to the Dashboard"""
+    slugs = list(PAGES.values())
+    return slugs.index(slug) if slug in slugs else 0
+
+
+def render_page(page, app):
+    """Import the page's module (first time only) and render it"""
+    try:
+        importlib.import_module(f"views.{PAGES[page]}").render(app)
+    except QueryError as e:
+        st.error(str(e))
+
+
+def precomputed(app, name, *args):
+    """Latest snapshot of the precomputed result `name`, captioned with its age.
+
+    With any non-None argument (e.g. a date range) the job's function is
+    called directly, since only the default arguments are precomputed.
+    """
+    scheduler = app.scheduler
+    if any(arg is not None for arg in args):
+        return scheduler.jobs[name].func(*args)
+    snapshot = scheduler.read(name)
+    st.caption(f"🕒 {format_staleness(scheduler, name)}")
+    return snapshot.value
@@ -0,0 +1,129 @@
+"""Analytics page: provider, receiver, food and city tabs; only the open tab runs."""
+import plotly.express as px
+import streamlit as st
+
+from views import precomputed
+
+
+def render(app):
+    st.header("📈 Advanced Analytics")
+    
+    # Only the open tab runs its queries; switching tabs reruns just this fragment
+    @st.fragment
+    def analytics_tabs():
+        tab1, tab2, tab3, tab4 = st.tabs(
+            ["🏢 Provider Analytics", "🤝 Receiver Analytics", "🍽️ Food Analytics", "🌍 City Analytics"],
+            key="analytics_tab", on_change="rerun"
+        )
+    
+        if tab1.open:
+            with tab1:
+                st.subheader("Provider Performance Analysis")
+        
+                # Top providers by successful claims
+                top_providers = precomputed(app, 'provider_leaderboard')
+                if not top_providers.empty:
+                    st.dataframe(top_providers.head(10), use_container_width=True)
+        
+                # Total donations per provider
+                donations_data = precomputed(app, 'provider_donations')
+                if not donations_data.empty:
+                    st.subheader("Provider Donation Analysis")
+                    st.dataframe(donations_data.head(10), use_container_width=True)
+    
+
+                    # NEW: Provider Reliability (bar)
+                    reliability = app.SQLQueries.get_provider_reliability_pct()
+                    if not reliability.empty:
+                        st.subheader("✅ Provider Reliability (Completed % )")
+                        fig_rel = px.bar(reliability.head(20), x='provider_name', y='reliability_pct',
+                                         color='reliability_pct', color_continuous_scale='Teal',
+                                         title="Provider Reliability (%)")
+                        fig_rel.update_layout(xaxis_title='Provider', yaxis_title='Reliability %')
+                        st.plotly_chart(fig_rel, use_container_width=True)
+
+                    # NEW: Most Frequent Providers & Contributions
+                    freq = app.SQLQueries.get_most_frequent_providers_contributions()
+                    if not freq.empty:
+                        st.subheader("🏆 Most Frequent Providers & Their Contributions")
+                        fig_freq = px.bar(freq, x='provider_name', y='total_listings', 
+                                          hover_data=['total_quantity'],
+                                          color='total_listings', color_continuous_scale='Blues')
+                        fig_freq.update_layout(xaxis_title='Provider', yaxis_title='Total Listings')
+                        st.plotly_chart(fig_freq, use_container_width=True)
+
+        if tab2.open:
+            with tab2:
+                st.subheader("Receiver Performance Analysis")
+        
+                # Average quantity per receiver
+                avg_quantity_data = app.SQLQueries.get_avg_quantity_per_receiver()
+                if not avg_quantity_data.empty:
+                    st.dataframe(avg_quantity_data.head(10), use_container_width=True)
+        
+                # Top claiming receivers
+                top_receivers = precomputed(app, 'receiver_leaderboard')
+                if not top_receivers.empty:
+                    st.subheader("Top Claiming Receivers")
+                    st.dataframe(top_receivers.head(10), use_container_width=True)
+    
+        if tab3.open:
+            with tab3:
+                st.subheader("Food Type Analysis")
+        
+                # Most common food types
+                food_types = app.SQLQueries.get_most_common_food_types()
+                if not food_types.empty:
+                    st.dataframe(food_types, use_container_width=True)
+        
+                # Most claimed meal types
+                meal_types = app.SQLQueries.get_most_claimed_meal_types()
+                if not meal_types.empty:
+                    st.subheader("Meal Type Demand Analysis")
+                    st.dataframe(meal_types, use_container_width=True)
+    
+
+                # NEW: Wastage % by Food Type
+                wastage_pct = app.SQLQueries.get_food_type_wastage_pct()
+                if not wastage_pct.empty:
+                    st.subheader("🗑️ Wastage % by Food Type")
+                    fig_wp = px.bar(wastage_pct, x='food_type', y='wastage_pct', 
+                                    color='wastage_pct', color_continuous_scale='Reds')
+                    fig_wp.update_layout(xaxis_title='Food Type', yaxis_title='Wastage %')
+                    st.plotly_chart(fig_wp, use_container_width=True)
+
+                # NEW: Items expiring in next 3 days (table + small bar by city)
+                exp3 = app.expiring.items_expiring_next_3_days()
+                if not exp3.empty:
+                    st.subheader("⏳ Items Expiring in Next 3 Days")
+                    st.dataframe(exp3, use_container_width=True)
+                    by_city = exp3.groupby('city', as_index=False)['food_id'].count().rename(columns={'food_id':'items'})
+                    fig_exp3 = px.bar(by_city, x='city', y='items', title='Urgent Items by City (≤3 days)')
+                    st.plotly_chart(fig_exp3, use_container_width=True)
+
+        if tab4.open:
+            with tab4:
+                st.subheader("City-wise Analysis")
+        
+                # Providers and receivers per city
+                city_data = precomputed(app, 'city_leaderboard')
+                if not city_data.empty:
+                    st.dataframe(city_data, use_container_width=True)
+        
+
+                # NEW: Highest Demand Locations by Claims
+                demand_locs = precomputed(app, 'city_demand')
+                if not demand_locs.empty:
+                    st.subheader("📍 Highest Demand Locations by Claims")
+                    fig_dem = px.bar(demand_locs, x='location', y='total_claims',
+                                     color='total_claims', color_continuous_scale='Viridis')
+                    fig_dem.update_layout(xaxis_title='City', yaxis_title='Total Claims')
+                    st.plotly_chart(fig_dem, use_container_width=True)
+
+                # Cities by food listings
+                city_listings = precomputed(app, 'city_listings')
+                if not city_listings.empty:
+                    st.subheader("Cities by Food Availability")
+                    st.dataframe(city_listings, use_container_width=True)
+
+    analytics_tabs()
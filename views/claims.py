@@ -0,0 +1,150 @@
+"""Claims page: add form (with food / receiver typeahead), suggested matches and claim statistics."""
+import pandas as pd
+import streamlit as st
+
+from lookup import typeahead
+from matching import MATCH_HORIZON_DAYS, propose_claims
+
+
+def render(app):
+    st.header("📦 Food Claims Management")
+    
+    # Add new claim section (form + fragment, as on the Providers page)
+    @st.fragment
+    def add_claim_form():
+        with st.expander("➕ Add New Claim"):
+            # Outside the form so typing narrows each list (one indexed prefix lookup)
+            search_col1, search_col2 = st.columns(2)
+            with search_col1:
+                food_search = st.text_input("Search food items (name or ID)", key="food_search")
+            with search_col2:
+                receiver_search = st.text_input("Search receivers (name or ID)", key="receiver_search")
+            with st.form("add_claim_form"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    # Top matches for the search instead of every listing
+                    try:
+                        food_options = typeahead(app.engine, 'food_listings', food_search)
+                        if food_options:
+                            selected_food = st.selectbox("Food Item", options=list(food_options.keys()))
+                            food_id = food_options[selected_food] if selected_food else None
+                        else:
+                            st.warning("No matching food items.")
+                            food_id = None
+                    except:
+                        st.error("Error loading food items")
+                        food_id = None
+        
+                with col2:
+                    # Top matches for the search instead of every receiver
+                    try:
+                        receiver_options = typeahead(app.engine, 'receivers', receiver_search)
+                        if receiver_options:
+                            selected_receiver = st.selectbox("Receiver", options=list(receiver_options.keys()))
+                            receiver_id = receiver_options[selected_receiver] if selected_receiver else None
+                        else:
+                            st.warning("No matching receivers.")
+                            receiver_id = None
+                    except:
+                        st.error("Error loading receivers")
+                        receiver_id = None
+        
+                claim_status = st.selectbox("Status", ["Pending", "Completed", "Cancelled"])
+                submitted = st.form_submit_button("Add Claim")
+
+            if submitted:
+                if food_id and receiver_id:
+                    key = app.form_idempotency_key('add_claim', food_id, receiver_id, claim_status)
+                    success, message = app.CRUDOperations.add_claim(food_id, receiver_id, claim_status,
+                                                                idempotency_key=key)
+                    if success:
+                        app.form_submitted('add_claim')
+                        st.success(message)
+                        st.rerun()
+                    else:
+                        st.error(message)
+                else:
+                    st.error("Please select both food item and receiver")
+
+    add_claim_form()
+
+    # Proposed receivers for the listings about to expire (matching.py)
+    @st.fragment
+    def suggested_matches():
+        with st.expander("🤖 Suggested Matches"):
+            # Matching reads every open listing and claim: only on request, not on every render
+            if st.button("Find Matches"):
+                st.session_state['match_proposals'] = propose_claims(app.engine)
+            proposals = st.session_state.get('match_proposals')
+            if proposals is None:
+                st.caption(f"Proposes a receiver for each unclaimed listing expiring in the next "
+                           f"{MATCH_HORIZON_DAYS} days.")
+                return
+            if proposals.empty:
+                st.info(f"No unclaimed listings expire in the next {MATCH_HORIZON_DAYS} days.")
+                return
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Listings Matched", f"{len(proposals):,}")
+            with col2:
+                st.metric("Receivers", f"{proposals['receiver_id'].nunique():,}")
+            with col3:
+                st.metric("Expected Quantity Saved", f"{proposals['expected_quantity'].sum():,.0f} kg")
+            st.dataframe(proposals.head(500), use_container_width=True, hide_index=True)
+            if st.button(f"Create {len(proposals):,} Pending Claims"):
+                # Same proposals, same key: a double click adds them once
+                key = app.form_idempotency_key(
+                    'add_proposed_claims', int(pd.util.hash_pandas_object(proposals[['food_id', 'receiver_id']]).sum()))
+                success, message = app.CRUDOperations.add_proposed_claims(proposals, idempotency_key=key)
+                if success:
+                    app.form_submitted('add_proposed_claims')
+                    st.session_state.pop('match_proposals', None)
+                    st.success(message)
+                    st.rerun()
+                else:
+                    st.error(message)
+
+    suggested_matches()
+    
+    # Display claims table
+    st.subheader("📋 Current Claims")
+    try:
+        claims_query = """
+        SELECT 
+            c.claim_id,
+            f.food_name,
+            f.food_type,
+            f.quantity,
+            p.name as provider_name,
+            r.name as receiver_name,
+            c.status,
+            c.timestamp
+        FROM claims c
+        JOIN food_listings f ON c.food_id = f.food_id
+        JOIN providers p ON f.provider_id = p.provider_id
+        LEFT JOIN receivers r ON c.receiver_id = r.receiver_id
+        ORDER BY c.timestamp DESC
+        """
+        claims_df = app.SQLQueries.execute_query(claims_query)
+        
+        if not claims_df.empty:
+            st.dataframe(claims_df, use_container_width=True)
+            
+            # Display claims statistics
+            st.subheader("📊 Claims Statistics")
+            claims_stats = app.SQLQueries.get_claims_completion_percentages()
+            if not claims_stats.empty:
+                col1, col2, col3, col4 = st.columns(4)
+                for i, (_, row) in enumerate(claims_stats.iterrows()):
+                    if i < 4:  # Only show first 4 statuses
+                        with [col1, col2, col3, col4][i]:
+                            st.metric(f"{row['status']} Claims", 
+                                    f"{row['claim_count']} ({row['percentage']:.1f}%)")
+                
+                # Show detailed claims analysis
+                st.subheader("📈 Detailed Claims Analysis")
+                st.dataframe(claims_stats, use_container_width=True)
+        else:
+            st.info("No claims data available.")
+    except Exception as e:
+        st.error(f"Error loading claims: {e}")
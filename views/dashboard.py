@@ -0,0 +1,40 @@
+"""Dashboard page: headline metrics and the project charts."""
+import streamlit as st
+
+from views import precomputed
+
+
+def render(app):
+    st.header("📊 Dashboard Overview")
+    
+    # Display key metrics with enhanced visibility
+    col1, col2, col3, col4 = st.columns(4)
+    
+    try:
+        system_data = precomputed(app, 'dashboard_kpis')
+        if not system_data.empty:
+            row = system_data.iloc[0]
+            
+            with col1:
+                st.metric("Total Food Items", f"{row['total_food_items']:,}")
+            with col2:
+                st.metric("Fresh Items", f"{row['fresh_items']:,}")
+            with col3:
+                st.metric("Total Providers", f"{row['contributing_providers']:,}")
+            with col4:
+                st.metric("Cities Covered", f"{row['cities_covered']:,}")
+    except Exception as e:
+        st.warning("Loading dashboard metrics...")
+    
+    # Display enhanced charts
+    st.subheader("📈 Analytics Overview")
+    charts = precomputed(app, 'dashboard_charts')
+    
+    if 'error' in charts:
+        st.error(f"Error creating enhanced charts: {charts['error']}")
+    for chart_name, chart in charts.items():
+        if chart_name != 'error' and chart is not None:
+            try:
+                st.plotly_chart(chart, use_container_width=True, config={'displayModeBar': False})
+            except Exception as e:
+                st.error(f"Error displaying chart {chart_name}: {e}")
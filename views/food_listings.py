@@ -0,0 +1,86 @@
+"""Food Listings page: add form (with provider typeahead) and listing statistics."""
+from datetime import datetime
+
+import streamlit as st
+
+from lookup import typeahead
+
+
+def render(app):
+    st.header("🥗 Food Listings Management")
+    
+    # Add new food listing section (form + fragment, as on the Providers page)
+    @st.fragment
+    def add_food_listing_form():
+        with st.expander("➕ Add New Food Listing"):
+            # Outside the form so typing narrows the provider list (one indexed prefix lookup)
+            provider_search = st.text_input("Search providers (name or ID)", key="provider_search")
+            with st.form("add_food_listing_form"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    food_name = st.text_input("Food Name")
+                    quantity = st.number_input("Quantity (kg)", min_value=0.1, step=0.1)
+                    expiry_date = st.date_input("Expiry Date", min_value=datetime.now().date())
+                with col2:
+                    # Top matches for the search instead of every provider
+                    try:
+                        provider_options = typeahead(app.engine, 'providers', provider_search)
+                        if provider_options:
+                            selected_provider = st.selectbox("Provider", options=list(provider_options.keys()))
+                            provider_id = provider_options[selected_provider] if selected_provider else None
+                        else:
+                            st.warning("No matching providers. Add providers first or change the search.")
+                            provider_id = None
+                    except:
+                        st.error("Error loading providers")
+                        provider_id = None
+            
+                    food_type = st.selectbox("Food Type", 
+                                           ["Vegetables", "Fruits", "Dairy", "Meat", "Grains", "Bakery", "Prepared Meals", "Other"])
+                    meal_type = st.selectbox("Meal Type", 
+                                           ["Breakfast", "Lunch", "Dinner", "Snacks", "Beverages", "Other"])
+                submitted = st.form_submit_button("Add Food Listing")
+
+            if submitted:
+                if food_name and quantity and expiry_date and provider_id and food_type and meal_type:
+                    key = app.form_idempotency_key('add_food_listing', food_name, quantity, expiry_date,
+                                               provider_id, food_type, meal_type)
+                    success, message = app.CRUDOperations.add_food_listing(food_name, quantity, expiry_date, 
+                                                                     provider_id, food_type, meal_type,
+                                                                     idempotency_key=key)
+                    if success:
+                        app.form_submitted('add_food_listing')
+                        st.success(message)
+                        st.rerun()
+                    else:
+                        st.error(message)
+                else:
+                    st.error("Please fill in all required fields")
+
+    add_food_listing_form()
+    
+    # Display food listings
+    st.subheader("📋 Current Food Listings")
+    try:
+        food_listings = app.SQLQueries.get_claims_per_food_item()
+        if not food_listings.empty:
+            st.dataframe(food_listings, use_container_width=True)
+            
+            # Display food statistics
+            st.subheader("📊 Food Listing Statistics")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Total Listings", len(food_listings))
+            with col2:
+                total_quantity = food_listings['quantity'].sum()
+                st.metric("Total Quantity (kg)", f"{total_quantity:,.1f}")
+            with col3:
+                food_types = food_listings['food_type'].nunique()
+                st.metric("Food Types", food_types)
+            with col4:
+                urgent_items = len(food_listings[food_listings['item_status'] == '🟠 Urgent'])
+                st.metric("Urgent Items", urgent_items)
+        else:
+            st.info("No food listings available. Add some food listings to get started!")
+    except Exception as e:
+        st.error(f"Error loading food listings: {e}")
@@ -0,0 +1,70 @@
+"""Providers page: add form and the provider directory with state / postal-code filters."""
+import streamlit as st
+
+
+def render(app):
+    st.header("🏢 Food Providers Management")
+    
+    # Add new provider section: the form sends its values only on submit, and the
+    # fragment reruns just this section until the provider is saved
+    @st.fragment
+    def add_provider_form():
+        with st.expander("➕ Add New Provider"):
+            with st.form("add_provider_form"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    provider_name = st.text_input("Provider Name")
+                    provider_type = st.selectbox("Provider Type", 
+                                               ["Restaurant", "Grocery Store", "Hotel", "Supermarket", "Bakery", "Other"])
+                    city = st.text_input("City")
+                with col2:
+                    contact = st.text_input("Contact Information")
+                    address = st.text_area("Address (Optional)")
+                submitted = st.form_submit_button("Add Provider")
+
+            if submitted:
+                if provider_name and provider_type and city and contact:
+                    success, message = app.CRUDOperations.add_provider(provider_name, provider_type, city, contact, address)
+                    if success:
+                        st.success(message)
+                        st.rerun()
+                    else:
+                        st.error(message)
+                else:
+                    st.error("Please fill in all required fields")
+
+    add_provider_form()
+    
+    # Display providers table
+    st.subheader("📋 Current Providers")
+    try:
+        col1, col2 = st.columns(2)
+        with col1:
+            states_df = app.SQLQueries.get_provider_states()
+            states = states_df['state'].tolist() if not states_df.empty else []
+            state = st.selectbox("State", ["All"] + states)
+        with col2:
+            postal_prefix = st.text_input("Postal code starts with")
+        
+        providers_df = app.SQLQueries.get_provider_contacts_by_city(
+            state=None if state == "All" else state,
+            postal_prefix=postal_prefix
+        )
+        if not providers_df.empty:
+            st.dataframe(providers_df, use_container_width=True)
+            
+            # Display provider statistics
+            st.subheader("📊 Provider Statistics")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Providers", len(providers_df))
+            with col2:
+                active_providers = len(providers_df[providers_df['status'] == '🟢 Active'])
+                st.metric("Active Providers", active_providers)
+            with col3:
+                total_listings = providers_df['active_food_listings'].sum()
+                st.metric("Total Food Listings", total_listings)
+        else:
+            st.info("No provider data available. Add some providers to get started!")
+    except Exception as e:
+        st.error(f"Error loading providers: {e}")
@@ -0,0 +1,66 @@
+"""Receivers page: add form, receiver directory and top claimers."""
+import streamlit as st
+
+from views import precomputed
+
+
+def render(app):
+    st.header("🤝 Food Receivers Management")
+    
+    # Add new receiver section (form + fragment, as on the Providers page)
+    @st.fragment
+    def add_receiver_form():
+        with st.expander("➕ Add New Receiver"):
+            with st.form("add_receiver_form"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    receiver_name = st.text_input("Receiver Name")
+                    receiver_type = st.selectbox("Receiver Type", 
+                                               ["NGO", "Food Bank", "Shelter", "Charity", "Community Center", "Other"])
+                with col2:
+                    city = st.text_input("City")
+                    contact = st.text_input("Contact Information")
+                submitted = st.form_submit_button("Add Receiver")
+
+            if submitted:
+                if receiver_name and receiver_type and city and contact:
+                    success, message = app.CRUDOperations.add_receiver(receiver_name, receiver_type, city, contact)
+                    if success:
+                        st.success(message)
+                        st.rerun()
+                    else:
+                        st.error(message)
+                else:
+                    st.error("Please fill in all required fields")
+
+    add_receiver_form()
+    
+    # Display receivers table
+    st.subheader("📋 Current Receivers")
+    try:
+        receivers_query = "SELECT * FROM receivers ORDER BY receiver_id"
+        receivers_df = app.SQLQueries.execute_query(receivers_query)
+        if not receivers_df.empty:
+            st.dataframe(receivers_df, use_container_width=True)
+            
+            # Display receiver statistics
+            st.subheader("📊 Receiver Statistics")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Receivers", len(receivers_df))
+            with col2:
+                receiver_types = receivers_df['type'].nunique()
+                st.metric("Receiver Types", receiver_types)
+            with col3:
+                cities = receivers_df['city'].nunique()
+                st.metric("Cities Served", cities)
+                
+            # Show top receivers
+            st.subheader("🏆 Top Performing Receivers")
+            top_receivers = precomputed(app, 'receiver_leaderboard')
+            if not top_receivers.empty:
+                st.dataframe(top_receivers.head(10), use_container_width=True)
+        else:
+            st.info("No receiver data available. Add some receivers to get started!")
+    except Exception as e:
+        st.error(f"Error loading receivers: {e}")
@@ -0,0 +1,80 @@
+"""Time Series page: trend charts for a date range and the trend tables."""
+import plotly.express as px
+import streamlit as st
+
+from views import precomputed
+
+
+def render(app):
+    st.header("⏰ Time Series Analysis")
+    
+    # Optional date range; ranges reaching archived history include the archive tables
+    col1, col2 = st.columns(2)
+    with col1:
+        ts_start = st.date_input("From date", value=None)
+    with col2:
+        ts_end = st.date_input("To date", value=None)
+    
+    # Enhanced time series charts
+    time_charts = precomputed(app, 'time_series_charts', ts_start, ts_end)
+    
+    if 'error' in time_charts:
+        st.error(f"Error creating time series charts: {time_charts['error']}")
+    for chart_name, chart in time_charts.items():
+        if chart_name != 'error' and chart is not None:
+            try:
+                st.plotly_chart(chart, use_container_width=True, config={'displayModeBar': False})
+            except Exception as e:
+                st.error(f"Error displaying chart {chart_name}: {e}")
+    
+    # Time series data tables
+    st.subheader("📊 Time Series Data")
+    
+    # Only the open tab runs its queries; switching tabs reruns just this fragment
+    @st.fragment
+    def time_series_tabs():
+        tab1, tab2, tab3 = st.tabs(
+            ["📈 Claims Trends", "🗑️ Wastage Trends", "📅 Monthly Performance"],
+            key="time_series_tab", on_change="rerun"
+        )
+    
+        if tab1.open:
+            with tab1:
+                claims_trends = precomputed(app, 'claims_trends', ts_start, ts_end)
+                if not claims_trends.empty:
+                    st.dataframe(claims_trends, use_container_width=True)
+    
+
+                    # NEW: Provider Reliability (bar)
+                    reliability = app.SQLQueries.get_provider_reliability_pct()
+                    if not reliability.empty:
+                        st.subheader("✅ Provider Reliability (Completed % )")
+                        fig_rel = px.bar(reliability.head(20), x='provider_name', y='reliability_pct',
+                                         color='reliability_pct', color_continuous_scale='Teal',
+                                         title="Provider Reliability (%)")
+                        fig_rel.update_layout(xaxis_title='Provider', yaxis_title='Reliability %')
+                        st.plotly_chart(fig_rel, use_container_width=True)
+
+                    # NEW: Most Frequent Providers & Contributions
+                    freq = app.SQLQueries.get_most_frequent_providers_contributions()
+                    if not freq.empty:
+                        st.subheader("🏆 Most Frequent Providers & Their Contributions")
+                        fig_freq = px.bar(freq, x='provider_name', y='total_listings', 
+                                          hover_data=['total_quantity'],
+                                          color='total_listings', color_continuous_scale='Blues')
+                        fig_freq.update_layout(xaxis_title='Provider', yaxis_title='Total Listings')
+                        st.plotly_chart(fig_freq, use_container_width=True)
+
+        if tab2.open:
+            with tab2:
+                food_trends = precomputed(app, 'listing_trends', ts_start, ts_end)
+                if not food_trends.empty:
+                    st.dataframe(food_trends, use_container_width=True)
+    
+        if tab3.open:
+            with tab3:
+                monthly_trends = precomputed(app, 'monthly_trends', ts_start, ts_end)
+                if not monthly_trends.empty:
+                    st.dataframe(monthly_trends, use_container_width=True)
+
+    time_series_tabs()
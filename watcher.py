@@ -0,0 +1,310 @@
+"""Watch-folder ingestion for partner CSV drops.
+
+Files dropped into the inbox are picked up once their size stops changing,
+routed to a table by file name (``claims_*.csv``, ``food_listings_*.csv``,
+``listings_*.csv``, ``providers_*.csv``, ``receivers_*.csv``) and applied
+through the incremental sync path (typed read, schema, quality stage,
+primary-key diff). Each table has a FIFO queue of its settled files (oldest
+first); a bounded pool works through different tables' queues in parallel,
+one file at a time per table, so a table's files apply in arrival order.
+A file left for retry holds up the files queued behind it. Finished files
+move to ``processed/``, failures to ``failed/`` with an ``.error.txt`` next
+to them. Every file is recorded in ``watch_files``; ``watch_metrics`` turns
+that into throughput, lag and backlog.
+
+    python watcher.py --db food_wastage.db --inbox inbox          # run until Ctrl-C
+    python watcher.py --db food_wastage.db --inbox inbox --once   # drain and exit
+    python watcher.py --db food_wastage.db --status               # print metrics
+"""
+import argparse
+import os
+import shutil
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from addresses import ensure_address_indexes
+from changelog import install_change_triggers
+from lookup import ensure_lookup_indexes
+from sync import read_csv_chunks, sync_table
+
+INBOX_DIR = os.environ.get("FWMS_INBOX_DIR")
+WATCH_INTERVAL = float(os.environ.get("FWMS_WATCH_INTERVAL", "5"))
+WATCH_WORKERS = int(os.environ.get("FWMS_WATCH_WORKERS", "2"))
+WATCH_TABLE = "watch_files"
+
+# file name prefix -> table; longest prefix wins
+FILE_PREFIXES = {
+    'food_listings': 'food_listings',
+    'listings': 'food_listings',
+    'claims': 'claims',
+    'providers': 'providers',
+    'receivers': 'receivers',
+}
+
+
+def table_for(filename):
+    name = os.path.basename(filename).lower()
+    for prefix in sorted(FILE_PREFIXES, key=len, reverse=True):
+        if name.startswith(prefix):
+            return FILE_PREFIXES[prefix]
+    return None
+
+
+def ensure_watch_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {WATCH_TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_name VARCHAR NOT NULL,
+            table_name VARCHAR,
+            status VARCHAR NOT NULL,
+            rows INTEGER,
+            inserted INTEGER,
+            updated INTEGER,
+            seconds FLOAT,
+            lag_seconds FLOAT,
+            error VARCHAR,
+            dropped_at DATETIME,
+            finished_at DATETIME NOT NULL
+        )
+        """))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{WATCH_TABLE}_finished ON {WATCH_TABLE} (finished_at)"))
+
+
+def _move(path, directory):
+    """Move into `directory`, never overwriting an earlier file of the same name"""
+    os.makedirs(directory, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    target = os.path.join(directory, f"{stem}{ext}")
+    if os.path.exists(target):
+        target = os.path.join(directory, f"{stem}-{datetime.now():%Y%m%d%H%M%S%f}{ext}")
+    shutil.move(path, target)
+    return target
+
+
+class FolderWatcher:
+    """Polls an inbox and ingests settled CSV files with bounded concurrency"""
+
+    def __init__(self, engine, inbox, workers=WATCH_WORKERS, interval=WATCH_INTERVAL):
+        self.engine = engine
+        self.inbox = inbox
+        self.processed = os.path.join(inbox, "processed")
+        self.failed = os.path.join(inbox, "failed")
+        self.interval = interval
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fwms-watch")
+        # table -> settled files in arrival order (None: files no table matches)
+        self.queues = {table: deque() for table in {*FILE_PREFIXES.values(), None}}
+        self.running = set()
+        self.lock = threading.Lock()
+        self.sizes = {}
+        self.in_flight = set()
+        self.stopped = threading.Event()
+        os.makedirs(inbox, exist_ok=True)
+        ensure_watch_table(engine)
+
+    def settled_files(self):
+        """CSV files whose size did not change since the previous poll, oldest first"""
+        ready, sizes = [], {}
+        for entry in os.scandir(self.inbox):
+            if not entry.is_file() or not entry.name.lower().endswith('.csv') or entry.path in self.in_flight:
+                continue
+            stat = entry.stat()
+            sizes[entry.path] = stat.st_size
+            if self.sizes.get(entry.path) == stat.st_size:
+                ready.append((stat.st_mtime, entry.path))
+        self.sizes = sizes
+        return [path for _, path in sorted(ready)]
+
+    def ingest(self, path):
+        """Apply one file; returns its watch_files record (None when left for retry)"""
+        table = table_for(path)
+        dropped_at = datetime.fromtimestamp(os.path.getmtime(path))
+        start = time.perf_counter()
+        record = {"file_name": os.path.basename(path), "table_name": table, "dropped_at": dropped_at,
+                  "rows": None, "inserted": None, "updated": None, "error": None}
+        try:
+            if table is None:
+                raise ValueError(f"Cannot tell which table {record['file_name']} is for "
+                                 f"(expected a name starting with {', '.join(sorted(FILE_PREFIXES))})")
+            summary = sync_table(self.engine, table, read_csv_chunks(path, table, engine=self.engine),
+                                 delete_missing=False)
+            if summary["mode"] == "replace":
+                # A first load replaces the table and drops its triggers and indexes
+                install_change_triggers(self.engine)
+                ensure_address_indexes(self.engine)
+                ensure_lookup_indexes(self.engine)
+            record.update(status="processed", rows=summary["inserted"] + summary["updated"] + summary["unchanged"],
+                          inserted=summary["inserted"], updated=summary["updated"])
+            _move(path, self.processed)
+        except Exception as e:
+            if isinstance(e, OperationalError) and "locked" in str(e):
+                # Another writer held the database too long; leave the file for a later poll
+                return None
+            record.update(status="failed", error=str(e))
+            target = _move(path, self.failed)
+            with open(f"{target}.error.txt", "w") as f:
+                f.write(traceback.format_exc())
+        finished_at = datetime.now()
+        record.update(seconds=time.perf_counter() - start, finished_at=finished_at,
+                      lag_seconds=(finished_at - dropped_at).total_seconds())
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+            INSERT INTO {WATCH_TABLE}
+                (file_name, table_name, status, rows, inserted, updated, seconds, lag_seconds, error,
+                 dropped_at, finished_at)
+            VALUES (:file_name, :table_name, :status, :rows, :inserted, :updated, :seconds, :lag_seconds, :error,
+                    :dropped_at, :finished_at)
+            """), record)
+        return record
+
+    def _run(self, table):
+        """Ingest `table`'s queued files in order; returns their records"""
+        records = []
+        while True:
+            with self.lock:
+                queue = self.queues[table]
+                if not queue:
+                    self.running.discard(table)
+                    return records
+                path = queue[0]
+            try:
+                record = self.ingest(path)
+            except BaseException:
+                with self.lock:
+                    self.running.discard(table)
+                raise
+            with self.lock:
+                if record is None:
+                    # Left for retry at the head of the queue: the next poll resumes the table
+                    self.running.discard(table)
+                    return records
+                queue.popleft()
+                self.in_flight.discard(path)
+            records.append(record)
+
+    def poll(self):
+        """Queue every settled file and start each idle table with queued files; returns the futures"""
+        futures = []
+        with self.lock:
+            for path in self.settled_files():
+                self.in_flight.add(path)
+                self.queues[table_for(path)].append(path)
+            for table, queue in self.queues.items():
+                if queue and table not in self.running:
+                    self.running.add(table)
+                    futures.append(self.pool.submit(self._run, table))
+        return futures
+
+    def drain(self):
+        """Process everything currently in the inbox, then return the records"""
+        records = []
+        self.poll()  # the first poll only records sizes
+        while True:
+            futures = self.poll()
+            if not futures:
+                if not self.sizes:
+                    return records
+                time.sleep(self.interval)  # a file is still being written
+            for future in futures:
+                records.extend(future.result())
+
+    def run_forever(self):
+        while not self.stopped.is_set():
+            self.poll()
+            self.stopped.wait(self.interval)
+        self.pool.shutdown(wait=True)
+
+    def stop(self):
+        self.stopped.set()
+
+
+def start_background_watcher(engine, inbox=None):
+    """Run a FolderWatcher on a daemon thread (no-op unless an inbox is configured)"""
+    inbox = inbox or INBOX_DIR
+    if not inbox:
+        return None
+    watcher = FolderWatcher(engine, inbox)
+    threading.Thread(target=watcher.run_forever, name="fwms-watcher", daemon=True).start()
+    return watcher
+
+
+def watch_metrics(engine, inbox=None, window_minutes=60):
+    """Throughput, lag and backlog over the last `window_minutes`"""
+    ensure_watch_table(engine)
+    since = datetime.now() - timedelta(minutes=window_minutes)
+    with engine.connect() as conn:
+        row = conn.execute(text(f"""
+        SELECT
+            COUNT(*) AS files,
+            SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) AS failed,
+            COALESCE(SUM(rows), 0) AS rows,
+            COALESCE((MAX(julianday(finished_at)) - MIN(julianday(finished_at) - seconds / 86400.0)) * 86400.0, 0)
+                AS active_seconds,
+            AVG(lag_seconds) AS avg_lag_seconds,
+            MAX(lag_seconds) AS max_lag_seconds,
+            MAX(finished_at) AS last_finished_at
+        FROM {WATCH_TABLE}
+        WHERE finished_at >= :since
+        """), {"since": since}).mappings().first()
+    metrics = dict(row)
+    metrics['window_minutes'] = window_minutes
+    # Rows over the span files were being worked on, so concurrent files are not double-counted
+    metrics['rows_per_second'] = metrics['rows'] / metrics['active_seconds'] if metrics['active_seconds'] else 0.0
+    inbox = inbox or INBOX_DIR
+    if inbox and os.path.isdir(inbox):
+        pending = [e for e in os.scandir(inbox) if e.is_file() and e.name.lower().endswith('.csv')]
+        metrics['backlog_files'] = len(pending)
+        metrics['oldest_pending_seconds'] = (
+            time.time() - min(e.stat().st_mtime for e in pending) if pending else 0.0
+        )
+    return metrics
+
+
+def format_metrics(metrics):
+    message = f"{metrics['files']} file(s) in the last {metrics['window_minutes']} min"
+    if metrics['files']:
+        message += (f", {metrics['failed']} failed, {metrics['rows']:,} rows at "
+                    f"{metrics['rows_per_second']:,.0f} rows/s, avg lag {metrics['avg_lag_seconds']:.1f}s")
+    if 'backlog_files' in metrics:
+        message += f", backlog {metrics['backlog_files']} (oldest {metrics['oldest_pending_seconds']:.0f}s)"
+    return message
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest partner CSV drops from a watch folder")
+    parser.add_argument("--db", default="food_wastage.db", help="SQLite database file")
+    parser.add_argument("--inbox", default=INBOX_DIR or "inbox", help="Directory partners drop CSV files into")
+    parser.add_argument("--workers", type=int, default=WATCH_WORKERS, help="Files ingested concurrently")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="Seconds between polls")
+    parser.add_argument("--once", action="store_true", help="Process the current inbox and exit")
+    parser.add_argument("--status", action="store_true", help="Print throughput/lag metrics and exit")
+    args = parser.parse_args()
+
+    # Longer busy timeout: files for different tables write concurrently
+    engine = create_engine(f"sqlite:///{args.db}", echo=False, connect_args={"timeout": 60})
+    if args.status:
+        print(f"📥 {format_metrics(watch_metrics(engine, args.inbox))}")
+        return
+    watcher = FolderWatcher(engine, args.inbox, workers=args.workers, interval=args.interval)
+    if args.once:
+        for record in watcher.drain():
+            print(f"  {record['status']:<9} {record['file_name']:<40} {record['rows'] or 0:>9,} rows "
+                  f"{record['seconds']:.2f}s  {record['error'] or ''}")
+        print(f"📥 {format_metrics(watch_metrics(engine, args.inbox))}")
+        return
+    print(f"👀 watching {args.inbox} every {args.interval:g}s with {args.workers} worker(s); Ctrl-C to stop")
+    try:
+        watcher.run_forever()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+
+if __name__ == "__main__":
+    main()